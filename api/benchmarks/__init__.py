@@ -0,0 +1,4 @@
+# API benchmarks, kept out of the regular test run.
+#
+# Run them explicitly with:
+#   python manage.py test benchmarks --pattern="bench_*.py"
@@ -0,0 +1,57 @@
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from data_loader.lib.__tests__.stub_server import StubServer
+from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.async_client import AsyncFetcher
+from data_loader.lib.http_cache import reset_http_cache
+from data_loader.lib.rate_limiter import reset_rate_limiters
+
+RACES = 24
+LATENCY = 0.05
+PAYLOAD = {'response': [{'position': i, 'driver': {'id': i}} for i in range(1, 21)]}
+
+
+@override_settings(DATA_LOADER_HTTP_CACHE={'enabled': False, 'directory': '', 'ttl': 0, 'offline': False})
+class ConcurrentFetchBenchmark(SimpleTestCase):
+    """A season of race rankings fetched against a stub with 50ms latency, serially and concurrently"""
+
+    def setUp(self):
+        self.addCleanup(reset_rate_limiters)
+        self.addCleanup(reset_http_cache)
+
+    def fetch_season(self, server, concurrency):
+        reset_rate_limiters()
+        reset_http_cache()
+        client = APISportsClient()
+        client.BASE_URL = server.url
+        fetcher = AsyncFetcher(client, concurrency)
+
+        started = time.perf_counter()
+        results = fetcher.run(('get_race_rankings', race_id) for race_id in range(RACES))
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue(all(isinstance(result, list) for result in results))
+        return elapsed
+
+    def run_variants(self, title, rate_limits):
+        results = {}
+        with override_settings(DATA_LOADER_RATE_LIMITS=rate_limits), StubServer(PAYLOAD, latency=LATENCY) as server:
+            for concurrency in (1, 4, 8):
+                results[concurrency] = self.fetch_season(server, concurrency)
+
+        print(f'\n{title}: {RACES} race rankings, {LATENCY * 1000:.0f}ms latency')
+        print(f'  {"concurrency":<12} {"seconds":>10} {"speedup":>10}')
+        for concurrency, elapsed in results.items():
+            print(f'  {concurrency:<12} {elapsed:>10.2f} {results[1] / elapsed:>9.1f}x')
+        return results
+
+    def test_unlimited(self):
+        results = self.run_variants('No rate limit', {'default': {'rate': 1e6, 'burst': 1000, 'max_wait': 300.0}})
+        self.assertLess(results[8], results[1] / 3)
+
+    def test_rate_limited(self):
+        # 40 requests per second, bursts of 5: concurrency helps until the budget is the bottleneck
+        results = self.run_variants('40 requests/s', {'default': {'rate': 40.0, 'burst': 5, 'max_wait': 300.0}})
+        self.assertGreaterEqual(results[8], (RACES - 5) / 40.0)
@@ -0,0 +1,63 @@
+import time
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from data_loader.lib.__tests__.stub_server import StubServer
+from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.http_cache import reset_http_cache
+from data_loader.lib.rate_limiter import reset_rate_limiters
+
+REQUESTS = 200
+PAYLOAD = {'response': [{'id': i, 'name': f'Driver {i}', 'points': i * 1.5} for i in range(100)]}
+
+
+def previous_make_request(client, endpoint):
+    """APISportsClient._make_request as it was: a new connection and three parses per request"""
+    response = requests.get(f'{client.BASE_URL}{endpoint}', headers=client.headers, timeout=client.timeout)
+    response.raise_for_status()
+    len(response.json())
+    (response.json())
+    return response.json()['response'] or []
+
+
+def time_requests(make_request):
+    """Mean wall and CPU milliseconds per request"""
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    for _ in range(REQUESTS):
+        make_request()
+    wall = (time.perf_counter() - wall_started) * 1000 / REQUESTS
+    cpu = (time.process_time() - cpu_started) * 1000 / REQUESTS
+    return wall, cpu
+
+
+@override_settings(
+    DATA_LOADER_RATE_LIMITS={'default': {'rate': 1e6, 'burst': 1000, 'max_wait': 300.0}},
+    DATA_LOADER_HTTP_CACHE={'enabled': False, 'directory': '', 'ttl': 0, 'offline': False}
+)
+class HTTPClientBenchmark(SimpleTestCase):
+    """APISportsClient requests against a local stub server, before and after pooling"""
+
+    def setUp(self):
+        reset_rate_limiters()
+        reset_http_cache()
+        self.addCleanup(reset_rate_limiters)
+        self.addCleanup(reset_http_cache)
+
+    def test_requests(self):
+        with StubServer(PAYLOAD) as server:
+            client = APISportsClient()
+            client.BASE_URL = server.url
+
+            results = {
+                'requests.get, 3 parses (previous)': time_requests(lambda: previous_make_request(client, '/teams')),
+                'pooled session, 1 parse': time_requests(client.get_teams),
+            }
+            pooled_connections = server.connections - REQUESTS
+
+        print(f'\nAPISportsClient, {REQUESTS} requests of {len(PAYLOAD["response"])} records against a local stub')
+        print(f'  {"variant":<36} {"wall ms":>10} {"cpu ms":>10}')
+        for name, (wall, cpu) in results.items():
+            print(f'  {name:<36} {wall:>10.2f} {cpu:>10.2f}')
+
+        self.assertEqual(pooled_connections, 1)
@@ -0,0 +1,109 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase
+
+from interactions.models import InteractionStats, Like
+from interactions.services.likes.like_service import LikeService
+from interactions.services.stats.stats_service import InteractionStatsService
+from teams.models import Team, TeamStatus
+
+USERS = 8
+RECORDS = 25
+
+
+def previous_create_like(user, obj):
+    """create_like as it was: a read, then an INSERT that can still race into an IntegrityError"""
+    content_type = ContentType.objects.get_for_model(obj)
+    if Like.objects.filter(user=user, record_type=content_type, record_id=obj.id).exists():
+        return {'success': False, 'error': 'already liked'}
+    try:
+        with transaction.atomic():
+            Like.objects.create(user=user, record_type=content_type, record_id=obj.id)
+            InteractionStatsService.record_like(content_type, obj.id, 1)
+        return {'success': True}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+def previous_remove_like(user, obj):
+    """remove_like as it was: a get(), then a delete()"""
+    content_type = ContentType.objects.get_for_model(obj)
+    try:
+        like = Like.objects.get(user=user, record_type=content_type, record_id=obj.id)
+    except Like.DoesNotExist:
+        return {'success': False, 'error': 'not found'}
+    with transaction.atomic():
+        like.delete()
+        InteractionStatsService.record_like(content_type, obj.id, -1)
+    return {'success': True}
+
+
+EXPECTED_ERRORS = ('already liked', 'not found', 'You have already liked this team', 'Like not found')
+
+
+class LikeWritesBenchmark(TransactionTestCase):
+    """
+    Like/unlike throughput with concurrent clients
+
+    Two clients per user like and unlike every record at the same time, like
+    a double click. Run against PostgreSQL to see the check-then-insert race:
+    the test database on SQLite is a shared in-memory database that locks
+    whole tables, so there each write takes a global lock and runs alone.
+    """
+
+    def setUp(self):
+        self.users = [User.objects.create(username=f'fan{i}') for i in range(USERS)]
+        self.teams = [Team.objects.create(name=f'Team {i}', status=TeamStatus.ACTIVE) for i in range(RECORDS)]
+
+    def run_clients(self, create, remove):
+        """Return writes per second and any errors other than an expected duplicate or missing like"""
+        errors = []
+        errors_lock = threading.Lock()
+        write_lock = threading.Lock() if connection.vendor == 'sqlite' else None
+
+        def write(action, user, team):
+            if write_lock is None:
+                return action(user, team)
+            with write_lock:
+                return action(user, team)
+
+        def client(user):
+            try:
+                for team in self.teams:
+                    for action in (create, remove):
+                        result = write(action, user, team)
+                        if not result['success'] and result['error'] not in EXPECTED_ERRORS:
+                            with errors_lock:
+                                errors.append(result['error'])
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=client, args=(user,)) for user in self.users for _ in range(2)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return len(threads) * RECORDS * 2 / elapsed, errors
+
+    def test_like_writes(self):
+        results = {
+            'read then write (previous)': self.run_clients(previous_create_like, previous_remove_like),
+            'single statement': self.run_clients(LikeService.create_like, LikeService.remove_like),
+        }
+
+        print(f'\nLike/unlike, {USERS} users x 2 clients x {RECORDS} records ({connection.vendor})')
+        print(f'  {"variant":<32} {"ops/s":>10} {"errors":>8}')
+        for name, (throughput, errors) in results.items():
+            print(f'  {name:<32} {throughput:>10.0f} {len(errors):>8}')
+
+        self.assertEqual(results['single statement'][1], [])
+        # Every client ends with an unlike, so likes and their counters are back to zero
+        self.assertFalse(Like.objects.exists())
+        self.assertFalse(InteractionStats.objects.exclude(like_count=0).exists())
@@ -0,0 +1,22 @@
+from rest_framework.test import APITestCase
+
+from benchmarks.utils import create_season, measure, report
+
+
+class MembersBenchmark(APITestCase):
+    """Ways of embedding the team in /api/members/ for a full grid"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_season(races=1, drivers=20)
+
+    def test_members_team(self):
+        results = {
+            'full team + roster (previous)': measure(self.client, '/api/members/?expand=team,team.members'),
+            'full team': measure(self.client, '/api/members/?expand=team'),
+            'team summary': measure(self.client, '/api/members/?expand=team_summary'),
+            'team url only (default)': measure(self.client, '/api/members/'),
+        }
+        report('Members, 10 teams x 2 drivers', results)
+
+        self.assertLess(results['team summary']['bytes'], results['full team + roster (previous)']['bytes'])
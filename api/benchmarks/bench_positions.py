@@ -0,0 +1,23 @@
+from rest_framework.test import APITestCase
+
+from benchmarks.utils import create_season, measure, report
+
+
+class PositionsBenchmark(APITestCase):
+    """Fully nested /api/positions/ against the flat representation for a full season"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_season(races=24, drivers=20)
+
+    def test_positions_season(self):
+        results = {
+            'nested (previous default)': measure(
+                self.client,
+                '/api/positions/?season=2024&expand=race,race.circuit,race.circuit.races,race.positions'
+            ),
+            'flat': measure(self.client, '/api/positions/?season=2024&flat=true'),
+        }
+        report('Positions, 24 races x 20 drivers', results)
+
+        self.assertLess(results['flat']['bytes'], results['nested (previous default)']['bytes'])
@@ -0,0 +1,45 @@
+import time
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from benchmarks.utils import create_season
+from formulated.lib.renderers import FastJSONRenderer, orjson
+
+ENDPOINTS = [
+    '/api/races/?season=2024&expand=circuit,positions',
+    '/api/positions/?season=2024&expand=race,race.circuit',
+    '/api/positions/?season=2024&flat=true',
+]
+
+
+def time_render(renderer_class, data, repeat=20):
+    """Best wall time in milliseconds to render data, and the payload size"""
+    renderer = renderer_class()
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        content = renderer.render(data)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(content)
+
+
+class RendererBenchmark(APITestCase):
+    """Rendering time of the heaviest payloads with JSONRenderer and FastJSONRenderer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_season(races=24, drivers=20)
+
+    def test_render(self):
+        print(f'\nJSON rendering, 24 races x 20 drivers (orjson {"installed" if orjson else "missing"})')
+        print(f'  {"endpoint":<56} {"stdlib ms":>10} {"fast ms":>10} {"bytes":>10}')
+
+        for url in ENDPOINTS:
+            data = self.client.get(url).data
+            stdlib_ms, size = time_render(JSONRenderer, data)
+            fast_ms, _ = time_render(FastJSONRenderer, data)
+            print(f'  {url:<56} {stdlib_ms:>10.2f} {fast_ms:>10.2f} {size:>10}')
+
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
@@ -0,0 +1,82 @@
+"""
+Shared fixtures and measurement helpers for the API benchmarks
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from races.models import Circuit, Race, Position, RaceStatus
+from teams.models import Team, Member, MemberRole, TeamStatus
+
+
+def create_season(races=24, drivers=20, year=2024):
+    """Create a full season of races, each with a result for every driver"""
+    teams = [
+        Team.objects.create(name=f'Team {i}', status=TeamStatus.ACTIVE)
+        for i in range(drivers // 2)
+    ]
+    members = [
+        Member.objects.create(
+            name=f'Driver {i}',
+            role=MemberRole.DRIVER,
+            team=teams[i % len(teams)],
+            driver_number=i + 1,
+            name_acronym=f'D{i:02d}'[:3]
+        )
+        for i in range(drivers)
+    ]
+
+    start = timezone.now().replace(year=year, month=3, day=1)
+    for i in range(races):
+        circuit = Circuit.objects.create(name=f'Circuit {i}', location=f'Location {i}')
+        race = Race.objects.create(
+            circuit=circuit,
+            name=f'Grand Prix {i}',
+            description='Benchmark race',
+            start_at=start + timedelta(days=14 * i),
+            status=RaceStatus.COMPLETED
+        )
+        Position.objects.bulk_create([
+            Position(race=race, driver=member, position=p + 1, points=max(0, 25 - p))
+            for p, member in enumerate(members)
+        ])
+
+
+def measure(client, url, repeat=5, follow_pages=True):
+    """
+    Fetch a URL (and every following page) several times
+
+    Returns the best wall time in milliseconds, the number of queries and
+    the total payload size in bytes of one full pass. The response cache is
+    cleared before every pass.
+    """
+    best = None
+    for _ in range(repeat):
+        cache.clear()
+        queries = 0
+        size = 0
+        started = time.perf_counter()
+        next_url = url
+        while next_url:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(next_url)
+            queries += len(context.captured_queries)
+            size += len(response.content)
+            next_url = response.data.get('next') if follow_pages and isinstance(response.data, dict) else None
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {'ms': best, 'queries': queries, 'bytes': size}
+
+
+def report(title, results):
+    """Print a small comparison table of measure() results"""
+    print(f'\n{title}')
+    print(f'  {"variant":<32} {"ms":>10} {"queries":>8} {"bytes":>10}')
+    for name, result in results.items():
+        print(f'  {name:<32} {result["ms"]:>10.1f} {result["queries"]:>8} {result["bytes"]:>10}')
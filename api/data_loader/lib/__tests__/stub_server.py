@@ -0,0 +1,112 @@
+"""
+A local stand-in for the upstream APIs, for client tests and benchmarks
+"""
+
+import gzip
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            queued = self.server.queued.pop(0) if self.server.queued else None
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            self.respond(queued)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def respond(self, queued):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        status, headers, payload = queued or (200, {}, self.server.payload)
+        if self.server.etag and status == 200:
+            headers = {**headers, 'ETag': self.server.etag}
+            if self.headers.get('If-None-Match') == self.server.etag:
+                self.send_response(304)
+                self.send_header('ETag', self.server.etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        body = json.dumps(payload).encode()
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            headers = {**headers, 'Content-Encoding': 'gzip'}
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer:
+    """
+    Serves ``payload`` as JSON on localhost, after ``latency`` seconds
+
+    ``queue(status, headers, payload)`` makes the next request get that
+    response instead. With an ``etag``, matching If-None-Match requests get a
+    304. ``requests`` and ``connections`` count what came in, and
+    ``max_in_flight`` the most requests served at once.
+    """
+
+    def __init__(self, payload=None, latency=0.0, etag=None):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.payload = payload if payload is not None else {'response': []}
+        self.httpd.latency = latency
+        self.httpd.etag = etag
+        self.httpd.queued = []
+        self.httpd.requests = []
+        self.httpd.connections = 0
+        self.httpd.in_flight = 0
+        self.httpd.max_in_flight = 0
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def queue(self, status, headers=None, payload=None):
+        self.httpd.queued.append((status, headers or {}, payload if payload is not None else {}))
+
+    @property
+    def requests(self):
+        return [urlparse(path).path for path in self.httpd.requests]
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    @property
+    def max_in_flight(self):
+        return self.httpd.max_in_flight
@@ -0,0 +1,89 @@
+import time
+
+from django.test import TestCase, override_settings
+
+from data_loader.lib.__tests__.stub_server import StubServer
+from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.async_client import AsyncFetcher
+from data_loader.lib.http_cache import reset_http_cache
+from data_loader.lib.openf1_client import OpenF1Client
+from data_loader.lib.rate_limiter import reset_rate_limiters
+
+UNLIMITED = {'default': {'rate': 1000.0, 'burst': 100, 'max_wait': 300.0}}
+NO_CACHE = {'enabled': False, 'directory': '', 'ttl': 0, 'offline': False}
+
+
+@override_settings(DATA_LOADER_RATE_LIMITS=UNLIMITED, DATA_LOADER_HTTP_CACHE=NO_CACHE)
+class AsyncFetcherTest(TestCase):
+    """Test cases for concurrent fetching through the API clients"""
+
+    def setUp(self):
+        reset_rate_limiters()
+        reset_http_cache()
+        self.addCleanup(reset_rate_limiters)
+        self.addCleanup(reset_http_cache)
+
+    def fetcher(self, server, concurrency):
+        client = APISportsClient()
+        client.BASE_URL = server.url
+        return AsyncFetcher(client, concurrency)
+
+    def test_results_come_back_in_order(self):
+        """Test every call is made and its result returned in the order given"""
+        with StubServer({'response': [{'id': 1}]}) as server:
+            results = self.fetcher(server, 4).run(('get_race_rankings', race_id) for race_id in range(10))
+
+        self.assertEqual(results, [[{'id': 1}]] * 10)
+        self.assertEqual(len(server.requests), 10)
+
+    def test_failures_are_returned_in_place(self):
+        """Test a failed call returns its exception without failing the others"""
+        with StubServer({'response': [{'id': 1}]}) as server:
+            server.queue(404)
+            results = self.fetcher(server, 1).run([('get_teams',), ('get_teams',)])
+
+        self.assertIsInstance(results[0], Exception)
+        self.assertEqual(results[1], [{'id': 1}])
+
+    def test_concurrency_is_bounded(self):
+        """Test requests overlap, but never more than the concurrency"""
+        with StubServer(latency=0.1) as server:
+            started = time.perf_counter()
+            self.fetcher(server, 3).run([('get_teams',)] * 9)
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(server.max_in_flight, 3)
+        self.assertLess(elapsed, 0.6)
+
+    @override_settings(DATA_LOADER_RATE_LIMITS={'default': {'rate': 20.0, 'burst': 2, 'max_wait': 300.0}})
+    def test_rate_limit_is_kept(self):
+        """Test concurrent requests still take their tokens from the host's bucket"""
+        reset_rate_limiters()
+        with StubServer() as server:
+            started = time.perf_counter()
+            self.fetcher(server, 8).run([('get_teams',)] * 8)
+            elapsed = time.perf_counter() - started
+
+        # 2 from the burst, then 6 more at 20 per second
+        self.assertGreaterEqual(elapsed, 0.29)
+
+    def test_openf1_client(self):
+        """Test OpenF1 calls run concurrently on the client's own session, headers included"""
+        client = OpenF1Client()
+        session = client.session
+        with StubServer([{'driver_number': 1}], latency=0.1) as server:
+            client.BASE_URL = server.url
+            results = AsyncFetcher(client, 4).run([('get_drivers',)] * 8)
+
+        self.assertEqual(results, [[{'driver_number': 1}]] * 8)
+        self.assertEqual(server.max_in_flight, 4)
+        self.assertIs(client.session, session)
+        self.assertEqual(client.session.headers['User-Agent'], 'Formulated-F1-App/1.0')
+        self.assertGreaterEqual(client.session.get_adapter(server.url)._pool_maxsize, 4)
+
+    @override_settings(DATA_LOADER_CONCURRENCY=5)
+    def test_default_concurrency(self):
+        """Test the concurrency defaults to DATA_LOADER_CONCURRENCY"""
+        self.assertEqual(AsyncFetcher(APISportsClient()).concurrency, 5)
+        self.assertEqual(AsyncFetcher(APISportsClient(), 0).concurrency, 5)
+        self.assertEqual(AsyncFetcher(APISportsClient(), 1).run([]), [])
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import requests
+from django.test import TestCase, override_settings
+
+from data_loader.lib.__tests__.stub_server import StubServer
+from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.http_cache import reset_http_cache
+from data_loader.lib.openf1_client import OpenF1Client
+from data_loader.lib.rate_limiter import reset_rate_limiters
+
+UNLIMITED = {'default': {'rate': 1000.0, 'burst': 100, 'max_wait': 300.0}}
+NO_CACHE = {'enabled': False, 'directory': '', 'ttl': 0, 'offline': False}
+
+
+@override_settings(DATA_LOADER_RATE_LIMITS=UNLIMITED, DATA_LOADER_HTTP_CACHE=NO_CACHE)
+class ClientSessionTest(TestCase):
+    """Test cases for the pooled sessions of the API clients"""
+
+    def setUp(self):
+        reset_rate_limiters()
+        reset_http_cache()
+        self.addCleanup(reset_rate_limiters)
+        self.addCleanup(reset_http_cache)
+
+    def apisports_client(self, server):
+        client = APISportsClient()
+        client.BASE_URL = server.url
+        return client
+
+    def test_connections_are_reused(self):
+        """Test consecutive requests share one keep-alive connection"""
+        payload = {'response': [{'id': i} for i in range(50)]}
+        with StubServer(payload) as server:
+            client = self.apisports_client(server)
+            for _ in range(5):
+                self.assertEqual(client.get_teams(), payload['response'])
+
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_gzip_responses_are_decoded(self):
+        """Test gzip bodies (requested by default) are decoded transparently"""
+        with StubServer([{'driver_number': 1}]) as server:
+            client = OpenF1Client()
+            client.BASE_URL = server.url
+            self.assertEqual(client.get_drivers(), [{'driver_number': 1}])
+
+        self.assertIn('gzip', client.session.headers['Accept-Encoding'])
+
+    def test_server_errors_are_retried(self):
+        """Test a transient 503 is retried by the session"""
+        with StubServer({'response': [{'id': 1}]}) as server:
+            server.queue(503)
+            client = self.apisports_client(server)
+            self.assertEqual(client.get_teams(), [{'id': 1}])
+
+        self.assertEqual(server.requests, ['/teams', '/teams'])
+
+    def test_server_error_retries_go_through_the_rate_limiter(self):
+        """Test every retry of a 5xx takes a token and reports its headers, up to MAX_ATTEMPTS"""
+        with StubServer({'response': []}) as server:
+            for _ in range(5):
+                server.queue(503)
+            client = self.apisports_client(server)
+            client.RETRY_BACKOFF = 0
+            with patch.object(client.rate_limiter, 'acquire') as acquire, \
+                    patch.object(client.rate_limiter, 'update_from_headers') as update_from_headers:
+                with self.assertRaises(requests.HTTPError):
+                    client.get_teams()
+
+        self.assertEqual(len(server.requests), APISportsClient.MAX_ATTEMPTS)
+        self.assertEqual(acquire.call_count, APISportsClient.MAX_ATTEMPTS)
+        self.assertEqual(update_from_headers.call_count, APISportsClient.MAX_ATTEMPTS)
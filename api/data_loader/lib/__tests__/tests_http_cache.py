@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+from datetime import datetime
+from django.test import TestCase, override_settings
+
+from data_loader.lib.__tests__.stub_server import StubServer
+from data_loader.lib.apisports_client import APISportsClient, APISportsError
+from data_loader.lib.http_cache import OfflineCacheMiss, get_http_cache, is_completed_season, reset_http_cache
+from data_loader.lib.rate_limiter import reset_rate_limiters
+
+UNLIMITED = {'default': {'rate': 1000.0, 'burst': 100, 'max_wait': 300.0}}
+PAYLOAD = {'response': [{'id': 1, 'name': 'Red Bull Racing'}]}
+
+
+@override_settings(DATA_LOADER_RATE_LIMITS=UNLIMITED)
+class HTTPCacheTest(TestCase):
+    """Test cases for the data loader's on-disk response cache"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        reset_rate_limiters()
+        self.addCleanup(reset_rate_limiters)
+        self.addCleanup(reset_http_cache)
+
+    def client_for(self, server, ttl=3600, offline=False):
+        reset_http_cache()
+        cache_settings = {'enabled': True, 'directory': self.directory, 'ttl': ttl, 'offline': offline}
+        with override_settings(DATA_LOADER_HTTP_CACHE=cache_settings):
+            client = APISportsClient()
+        client.BASE_URL = server.url
+        return client
+
+    def test_fresh_responses_are_served_from_disk(self):
+        """Test a second identical request within the TTL does not reach the upstream"""
+        with StubServer(PAYLOAD) as server:
+            self.assertEqual(self.client_for(server).get_teams(), PAYLOAD['response'])
+            # A new process (and cache object) reads the same files
+            self.assertEqual(self.client_for(server).get_teams(), PAYLOAD['response'])
+
+        self.assertEqual(server.requests, ['/teams'])
+
+    def test_params_are_part_of_the_key(self):
+        """Test different params are cached separately"""
+        with StubServer(PAYLOAD) as server:
+            client = self.client_for(server)
+            client.get_race_rankings(1)
+            client.get_race_rankings(2)
+            client.get_race_rankings(1)
+
+        self.assertEqual(len(server.requests), 2)
+
+    def test_stale_responses_are_revalidated(self):
+        """Test a stale entry is revalidated with If-None-Match and kept on a 304"""
+        with StubServer(PAYLOAD, etag='"v1"') as server:
+            client = self.client_for(server, ttl=0)
+            client.get_teams()
+            self.assertEqual(client.get_teams(), PAYLOAD['response'])
+
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(client.http_cache.stats(), {'hits': 0, 'revalidated': 1, 'misses': 1})
+
+    def test_completed_seasons_are_permanent(self):
+        """Test responses about a finished season are never requested again"""
+        with StubServer(PAYLOAD) as server:
+            client = self.client_for(server, ttl=0)
+            client.get_races(2023)
+            client.get_races(2023)
+            client.get_races(datetime.now().year)
+            client.get_races(datetime.now().year)
+            client.get_race_rankings(7, final=True)
+            client.get_race_rankings(7, final=True)
+
+        self.assertEqual(len(server.requests), 4)
+        self.assertTrue(is_completed_season(2023))
+        self.assertFalse(is_completed_season(datetime.now().year))
+
+    def test_offline_mode(self):
+        """Test offline mode serves whatever is cached, however old, and never makes requests"""
+        with StubServer(PAYLOAD) as server:
+            self.client_for(server, ttl=0).get_teams()
+
+            client = self.client_for(server, ttl=0, offline=True)
+            self.assertEqual(client.get_teams(), PAYLOAD['response'])
+            with self.assertRaises(OfflineCacheMiss):
+                client.get_races(2024)
+
+        self.assertEqual(server.requests, ['/teams'])
+
+    def test_errors_are_not_cached(self):
+        """Test failed requests are not stored"""
+        with StubServer(PAYLOAD) as server:
+            server.queue(404)
+            client = self.client_for(server)
+            with self.assertRaises(Exception):
+                client.get_teams()
+            self.assertEqual(client.get_teams(), PAYLOAD['response'])
+
+        self.assertEqual(len(server.requests), 2)
+        self.assertIs(get_http_cache(), client.http_cache)
+
+    def test_error_bodies_are_not_cached(self):
+        """Test a 200 whose body reports errors raises and is not stored, even for a completed season"""
+        with StubServer(PAYLOAD) as server:
+            server.queue(200, payload={'errors': {'requests': 'You have reached the request limit'}, 'response': []})
+            client = self.client_for(server)
+            with self.assertRaises(APISportsError):
+                client.get_races(2023)
+            self.assertEqual(client.get_races(2023), PAYLOAD['response'])
+            client.get_races(2023)
+
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(client.http_cache.stats(), {'hits': 1, 'revalidated': 0, 'misses': 2})
+
+    def test_cached_error_bodies_are_ignored(self):
+        """Test an error body stored by an older client is fetched again rather than served"""
+        with StubServer(PAYLOAD) as server:
+            client = self.client_for(server)
+            client.http_cache._write({
+                'key': client.http_cache.key(f'{server.url}/teams', None),
+                'url': f'{server.url}/teams',
+                'params': {},
+                'data': {'errors': {'token': 'Invalid key'}, 'response': []},
+                'stored_at': 0,
+                'permanent': True,
+            })
+            self.assertEqual(client.get_teams(), PAYLOAD['response'])
+
+        self.assertEqual(server.requests, ['/teams'])
@@ -0,0 +1,137 @@
+from unittest.mock import Mock, patch
+from django.test import TestCase, override_settings
+
+from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.http_cache import reset_http_cache
+from data_loader.lib.openf1_client import OpenF1Client
+from data_loader.lib.rate_limiter import (
+    RateLimitExceeded, TokenBucket, get_rate_limiter, parse_retry_after, reset_rate_limiters
+)
+
+NO_CACHE = {'enabled': False, 'directory': '', 'ttl': 0, 'offline': False}
+
+
+class FakeClock:
+    """A clock that only moves when something sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(TestCase):
+    """Test cases for the token bucket"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def bucket(self, rate=1.0, burst=2, max_wait=300.0):
+        return TokenBucket(rate, burst, max_wait, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_then_rate(self):
+        """Test the first burst goes through without waiting, then one request per 1/rate seconds"""
+        bucket = self.bucket(rate=0.5, burst=2)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        self.assertEqual(waits, [0, 0, 2.0, 2.0])
+
+    def test_tokens_refill_while_idle(self):
+        """Test time without requests refills the bucket up to the burst"""
+        bucket = self.bucket(rate=1.0, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        self.clock.now += 10
+
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0, 0, 1.0])
+
+    def test_retry_after_pauses(self):
+        """Test Retry-After holds every request until it has passed"""
+        bucket = self.bucket()
+        bucket.update_from_headers({'Retry-After': '30'})
+
+        self.assertEqual(bucket.acquire(), 30.0)
+
+    def test_exhausted_quota_pauses_until_reset(self):
+        """Test a zero remaining quota waits for the advertised reset"""
+        bucket = self.bucket()
+        bucket.update_from_headers({'X-RateLimit-Requests-Remaining': '0', 'X-RateLimit-Requests-Reset': '45'})
+
+        self.assertEqual(bucket.acquire(), 45.0)
+
+    def test_low_remaining_quota_caps_tokens(self):
+        """Test the remaining quota caps the burst"""
+        bucket = self.bucket(rate=1.0, burst=5)
+        bucket.update_from_headers({'X-RateLimit-Remaining': '1'})
+
+        self.assertEqual([bucket.acquire() for _ in range(2)], [0, 1.0])
+
+    def test_long_wait_raises(self):
+        """Test a wait beyond max_wait raises instead of blocking"""
+        bucket = self.bucket(max_wait=60)
+        bucket.update_from_headers({'X-RateLimit-Requests-Remaining': '0', 'X-RateLimit-Requests-Reset': '86400'})
+
+        with self.assertRaises(RateLimitExceeded):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_parse_retry_after(self):
+        """Test Retry-After as seconds and as an HTTP date"""
+        self.assertEqual(parse_retry_after('12'), 12.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+
+@override_settings(DATA_LOADER_HTTP_CACHE=NO_CACHE)
+class ClientRateLimitTest(TestCase):
+    """Test cases for rate limiting in the API clients"""
+
+    def setUp(self):
+        reset_rate_limiters()
+        reset_http_cache()
+        self.addCleanup(reset_rate_limiters)
+        self.addCleanup(reset_http_cache)
+
+    def response(self, status_code=200, headers=None, data=None):
+        response = Mock(status_code=status_code, headers=headers or {})
+        response.json.return_value = data if data is not None else {'response': []}
+        return response
+
+    def test_buckets_are_shared_per_host(self):
+        """Test every client of a host, in any puller, takes from the same bucket"""
+        self.assertIs(APISportsClient().rate_limiter, APISportsClient().rate_limiter)
+        self.assertIs(APISportsClient().rate_limiter, get_rate_limiter('api-formula-1.p.rapidapi.com'))
+        self.assertIsNot(APISportsClient().rate_limiter, OpenF1Client().rate_limiter)
+
+    @override_settings(DATA_LOADER_RATE_LIMITS={'default': {'rate': 100.0, 'burst': 1, 'max_wait': 300.0}})
+    def test_too_many_requests_is_retried(self):
+        """Test a 429 waits for Retry-After and retries"""
+        client = APISportsClient()
+        client.rate_limiter.sleep = Mock()
+        mock_get = client.session.get = Mock(side_effect=[
+            self.response(429, {'Retry-After': '2'}),
+            self.response(200, data={'response': [{'id': 1}]}),
+        ])
+
+        self.assertEqual(client.get_teams(), [{'id': 1}])
+        self.assertEqual(mock_get.call_count, 2)
+        waited = client.rate_limiter.sleep.call_args[0][0]
+        self.assertAlmostEqual(waited, 2.0, places=1)
+
+    @override_settings(DATA_LOADER_RATE_LIMITS={'default': {'rate': 100.0, 'burst': 1, 'max_wait': 300.0}})
+    def test_openf1_follows_headers(self):
+        """Test the OpenF1 client feeds response headers to its bucket"""
+        client = OpenF1Client()
+        with patch.object(client.session, 'get', return_value=self.response(200, {'Retry-After': '5'}, [])):
+            client.get_drivers()
+
+        self.assertGreater(client.rate_limiter.paused_until, client.rate_limiter.clock())
@@ -6,38 +6,81 @@ A simple client for fetching data from the APISports F1 API.
 
 import requests
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
 import logging
 import os
+import time
+
+from data_loader.lib.http import RETRY_STATUSES, backoff_delay, build_session
+from data_loader.lib.http_cache import get_http_cache, is_completed_season
+from data_loader.lib.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
+class APISportsError(Exception):
+    """Raised for a response whose body reports errors, e.g. a bad key or an exhausted plan"""
+
+
 class APISportsClient:
     """Client for interacting with the APISports F1 API"""
     
     BASE_URL = "https://api-formula-1.p.rapidapi.com"
     
+    # Attempts for a request answered with 429 Too Many Requests or a transient 5xx
+    MAX_ATTEMPTS = 3
+    # Base of the exponential wait between 5xx retries, in seconds
+    RETRY_BACKOFF = 0.5
+    
     def __init__(self, timeout: int = 30):
         self.timeout = timeout
         self.headers = {
             "X-RapidAPI-Key": os.getenv("APISPORTS_API_KEY"),
             "X-RapidAPI-Host": "api-formula-1.p.rapidapi.com"
         }
+        # Keep-alive connections, gzip and retries of failed connects
+        self.session = build_session(self.headers)
+        # Shared with every other client of this host in the process
+        self.rate_limiter = get_rate_limiter(urlparse(self.BASE_URL).hostname)
+        self.http_cache = get_http_cache()
         
-    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a request to the APISports F1 API"""
+    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                      permanent: bool = False) -> Dict[str, Any]:
+        """Make a request to the APISports F1 API, through the response cache"""
         url = f"{self.BASE_URL}{endpoint}"
         try:
-            logger.info(f"Making request to APISports F1 API: {url}")
-            response = requests.get(url, headers=self.headers, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            logger.info(f"Successfully fetched {len(response.json())} records from {endpoint}")
-            (response.json())
-            return response.json()['response'] or []
+            data = self.http_cache.fetch(
+                url, params, lambda headers: self._send(url, params, headers), permanent, validate=self._validate
+            )
+            records = data['response'] or []
+            logger.info(f"Successfully fetched {len(records)} records from {endpoint}")
+            return records
         except requests.exceptions.RequestException as e:
             logger.error(f"Error making request to {url}: {e}")
             raise
         
+    @staticmethod
+    def _validate(data: Dict[str, Any]) -> None:
+        """Raise if the body reports errors; APISports answers them with a 200"""
+        errors = data.get('errors')
+        if errors:
+            raise APISportsError(f"APISports F1 API returned errors: {errors}")
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> requests.Response:
+        """GET url within the rate limit, retrying 429s and transient 5xx"""
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            self.rate_limiter.acquire()
+            logger.info(f"Making request to APISports F1 API: {url}")
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            self.rate_limiter.update_from_headers(response.headers)
+            if response.status_code not in (429, *RETRY_STATUSES) or attempt == self.MAX_ATTEMPTS:
+                return response
+            if response.status_code == 429:
+                logger.warning(f"Rate limited by APISports F1 API, retrying {url} ({attempt}/{self.MAX_ATTEMPTS})")
+            else:
+                logger.warning(f"APISports F1 API answered {response.status_code}, retrying {url} ({attempt}/{self.MAX_ATTEMPTS})")
+                time.sleep(backoff_delay(attempt, self.RETRY_BACKOFF))
+        
     def get_driver(self, driver_id: str) -> Dict[str, Any]:
         """Get a driver from the APISports F1 API"""
         endpoint = f"/drivers?id={driver_id}"
@@ -51,7 +94,7 @@ class APISportsClient:
     def get_drivers_rankings(self, season: int) -> List[Dict[str, Any]]:
         """Get the drivers rankings from the APISports F1 API"""
         endpoint = f"/rankings/drivers?season={season}"
-        return self._make_request(endpoint)
+        return self._make_request(endpoint, permanent=is_completed_season(season))
     
     def get_races(self, season: int, race_type: str = "race") -> List[Dict[str, Any]]:
         """Get races from the APISports F1 API"""
@@ -60,16 +103,16 @@ class APISportsClient:
             "season": season,
             "type": race_type
         }
-        return self._make_request(endpoint, params)
+        return self._make_request(endpoint, params, permanent=is_completed_season(season))
     
     def get_competitions(self, season: int) -> List[Dict[str, Any]]:
         """Get competitions (race weekends) from the APISports F1 API"""
         endpoint = "/competitions"
         params = {"season": season}
-        return self._make_request(endpoint, params)
+        return self._make_request(endpoint, params, permanent=is_completed_season(season))
     
-    def get_race_rankings(self, race_id: int) -> List[Dict[str, Any]]:
-        """Get race rankings (positions) from the APISports F1 API"""
+    def get_race_rankings(self, race_id: int, final: bool = False) -> List[Dict[str, Any]]:
+        """Get race rankings (positions) from the APISports F1 API; final results are cached for good"""
         endpoint = "/rankings/races"
         params = {"race": race_id}
-        return self._make_request(endpoint, params)
\ No newline at end of file
+        return self._make_request(endpoint, params, permanent=final)
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Concurrent fetching for the data loader's API clients
+
+``AsyncFetcher(client, concurrency).fetch_many(endpoints)`` runs many client
+calls at once, e.g. ``[('get_driver', 1), ('get_driver', 2)]``, and returns
+their results in order, with the exception in place of any call that failed.
+At most ``concurrency`` requests are in flight. Each call still goes through
+the client's response cache and waits on the host's shared rate limiter, so
+concurrency hides latency but never exceeds the request budget.
+
+The clients are built on requests, so the calls run in a thread pool driven
+by asyncio rather than on an async HTTP library.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, List, Sequence
+
+from django.conf import settings
+
+from data_loader.lib.http import ensure_pool_size
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetcher:
+    """Run a client's get_* methods concurrently, with bounded concurrency"""
+
+    def __init__(self, client, concurrency: int = None):
+        self.client = client
+        self.concurrency = max(1, concurrency or settings.DATA_LOADER_CONCURRENCY)
+        if self.concurrency > 1:
+            # Enough pooled connections for every request in flight, on the client's own session
+            ensure_pool_size(client.session, self.concurrency)
+
+    async def fetch(self, endpoint: Sequence[Any], semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor) -> Any:
+        """Run one ``(method_name, *args)`` call once a slot is free"""
+        method, *args = endpoint
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, lambda: getattr(self.client, method)(*args))
+
+    async def fetch_many(self, endpoints: Iterable[Sequence[Any]]) -> List[Any]:
+        """Run every ``(method_name, *args)`` call; results (or exceptions) come back in order"""
+        endpoints = list(endpoints)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='data-loader') as executor:
+            return await asyncio.gather(
+                *(self.fetch(endpoint, semaphore, executor) for endpoint in endpoints),
+                return_exceptions=True
+            )
+
+    def run(self, endpoints: Iterable[Sequence[Any]]) -> List[Any]:
+        """fetch_many for synchronous callers such as the pullers"""
+        endpoints = list(endpoints)
+        if not endpoints:
+            return []
+        logger.info(f"Fetching {len(endpoints)} endpoints, {self.concurrency} at a time")
+        return asyncio.run(self.fetch_many(endpoints))
@@ -0,0 +1,66 @@
+"""
+HTTP sessions for the data loader's API clients
+
+A pooled ``requests.Session`` keeps connections (and TLS sessions) alive
+between requests, asks for gzip responses, and retries failed connection
+attempts with exponential backoff; those never reached the upstream, so they
+cost no quota. Anything that did reach it, 429s and transient 5xx answers
+included, is retried by the clients, which take a token from their rate
+limiter before every attempt.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transient server errors the clients retry, within their rate limit
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def backoff_delay(attempt, backoff_factor=0.5):
+    """Seconds to wait before retrying after the given (1-based) failed attempt"""
+    return backoff_factor * 2 ** (attempt - 1)
+
+
+def build_session(headers=None, retries=3, backoff_factor=0.5, pool_maxsize=10):
+    """Return a keep-alive session with pooled adapters that retry failed connects"""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        # Requests that reached the upstream may have spent quota: the clients
+        # retry those themselves, through the rate limiter
+        read=0,
+        status=0,
+        other=0,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        backoff_factor=backoff_factor,
+        # Hand the last response back instead of raising, so callers see the status
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=pool_maxsize)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def ensure_pool_size(session, pool_maxsize):
+    """
+    Let the session keep at least pool_maxsize connections per host open
+
+    The session itself (headers, auth, cookies) is kept; only its HTTP
+    adapters are replaced, with the same retry policy.
+    """
+    for prefix, adapter in list(session.adapters.items()):
+        if not isinstance(adapter, HTTPAdapter) or adapter._pool_maxsize >= pool_maxsize:
+            continue
+        session.mount(prefix, HTTPAdapter(
+            max_retries=adapter.max_retries,
+            pool_connections=adapter._pool_connections,
+            pool_maxsize=pool_maxsize,
+        ))
+        adapter.close()
@@ -0,0 +1,181 @@
+"""
+On-disk cache of upstream API responses for the data loader's clients
+
+Entries are keyed by URL and query params and kept as JSON files under
+DATA_LOADER_HTTP_CACHE['directory']. A fresh entry (younger than the TTL) is
+served without a request. A stale one is revalidated with If-None-Match /
+If-Modified-Since when the upstream sent an ETag or Last-Modified, so an
+unchanged answer costs a 304 instead of a full download. Responses about
+completed seasons never change and are kept for good. In offline mode only
+the cache answers, however old its entries are.
+
+Clients can pass a ``validate`` callback that raises on a body that reports
+an error despite its 200 status; such bodies are never stored, and entries
+that fail it are ignored.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode for a request that is not in the cache"""
+
+
+def is_completed_season(season) -> bool:
+    """Whether a season is over, so that responses about it are final"""
+    try:
+        return int(season) < datetime.now().year
+    except (TypeError, ValueError):
+        return False
+
+
+class HTTPCache:
+    """Cache of parsed JSON response bodies, revalidated with conditional requests"""
+
+    def __init__(self, directory, ttl: float = 3600, offline: bool = False, enabled: bool = True):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.offline = offline
+        self.enabled = enabled
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        # Fetches run concurrently from AsyncFetcher's threads
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, params: Optional[Mapping[str, Any]], send: Callable[[Dict[str, str]], Any],
+              permanent: bool = False, validate: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Return the JSON body for url and params, from the cache when possible
+
+        ``send(headers)`` makes the request with the given extra headers and
+        returns the response. ``permanent`` keeps the answer for good.
+        ``validate(data)`` raises on a body that must not be cached.
+        """
+        if not self.enabled:
+            response = send({})
+            response.raise_for_status()
+            data = response.json()
+            if validate is not None:
+                validate(data)
+            return data
+
+        entry = self.get(url, params)
+        if entry is not None and validate is not None and not self._is_valid(entry, validate):
+            entry = None
+        if entry is not None and (self.offline or self.is_fresh(entry)):
+            self._count('hits')
+            return entry['data']
+        if self.offline:
+            raise OfflineCacheMiss(f'{url} {dict(params or {})} is not cached')
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = send(headers)
+        if response.status_code == 304 and entry is not None:
+            self._count('revalidated')
+            logger.info(f'Cached response for {url} is still valid')
+            entry['stored_at'] = time.time()
+            entry['permanent'] = entry.get('permanent') or permanent
+            self._write(entry)
+            return entry['data']
+
+        response.raise_for_status()
+        self._count('misses')
+        data = response.json()
+        if validate is not None:
+            validate(data)
+        self._write({
+            'key': self.key(url, params),
+            'url': url,
+            'params': dict(params or {}),
+            'data': data,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': time.time(),
+            'permanent': permanent,
+        })
+        return data
+
+    @staticmethod
+    def _is_valid(entry: Dict[str, Any], validate: Callable[[Any], None]) -> bool:
+        # Entries written before the client validated its bodies may hold errors
+        try:
+            validate(entry['data'])
+        except Exception as e:
+            logger.warning(f"Ignoring cached response for {entry.get('url')}: {e}")
+            return False
+        return True
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]]) -> str:
+        query = '&'.join(f'{name}={value}' for name, value in sorted((params or {}).items()))
+        return hashlib.sha256(f'{url}?{query}'.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.json'
+
+    def get(self, url: str, params: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for url and params, fresh or not"""
+        try:
+            with open(self.path(self.key(url, params))) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return entry.get('permanent') or time.time() - entry['stored_at'] < self.ttl
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        path = self.path(entry['key'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write aside and rename, so that readers never see half an entry
+        temporary = path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        with open(temporary, 'w') as file:
+            json.dump(entry, file)
+        os.replace(temporary, path)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    """Return the process wide cache, configured from DATA_LOADER_HTTP_CACHE"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache(**settings.DATA_LOADER_HTTP_CACHE)
+        return _cache
+
+
+def reset_http_cache() -> None:
+    """Forget the process wide cache, e.g. after changing DATA_LOADER_HTTP_CACHE"""
+    global _cache
+    with _cache_lock:
+        _cache = None
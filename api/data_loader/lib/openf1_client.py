@@ -7,7 +7,13 @@ Focuses on data retrieval without business logic or data storage.
 
 import requests
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
 import logging
+import time
+
+from data_loader.lib.http import RETRY_STATUSES, backoff_delay, build_session
+from data_loader.lib.http_cache import get_http_cache, is_completed_season
+from data_loader.lib.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +23,11 @@ class OpenF1Client:
     
     BASE_URL = "https://api.openf1.org/v1"
     
+    # Attempts for a request answered with 429 Too Many Requests or a transient 5xx
+    MAX_ATTEMPTS = 3
+    # Base of the exponential wait between 5xx retries, in seconds
+    RETRY_BACKOFF = 0.5
+    
     def __init__(self, timeout: int = 30):
         """
         Initialize the OpenF1 client
@@ -25,33 +36,36 @@ class OpenF1Client:
             timeout: Request timeout in seconds
         """
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Keep-alive connections, gzip and retries of failed connects
+        self.session = build_session({
             'User-Agent': 'Formulated-F1-App/1.0'
         })
+        # Shared with every other client of this host in the process
+        self.rate_limiter = get_rate_limiter(urlparse(self.BASE_URL).hostname)
+        self.http_cache = get_http_cache()
     
-    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                      permanent: bool = False) -> List[Dict[str, Any]]:
         """
-        Make a request to the OpenF1 API
+        Make a request to the OpenF1 API, through the response cache
         
         Args:
             endpoint: API endpoint (without base URL)
             params: Query parameters
+            permanent: Cache the response for good (it can no longer change)
             
         Returns:
             List of data from the API response
             
         Raises:
             requests.RequestException: If the request fails
+            RateLimitExceeded: If the quota is exhausted for longer than the limiter waits
+            OfflineCacheMiss: If offline and the response is not cached
         """
         url = f"{self.BASE_URL}/{endpoint}"
         
         try:
-            logger.info(f"Making request to OpenF1: {url}")
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.http_cache.fetch(url, params, lambda headers: self._send(url, params, headers), permanent)
             logger.info(f"Successfully fetched {len(data)} records from {endpoint}")
             return data
             
@@ -59,6 +73,21 @@ class OpenF1Client:
             logger.error(f"Error fetching data from OpenF1 {endpoint}: {str(e)}")
             raise
     
+    def _send(self, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> requests.Response:
+        """GET url within the rate limit, retrying 429s and transient 5xx"""
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            self.rate_limiter.acquire()
+            logger.info(f"Making request to OpenF1: {url}")
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            self.rate_limiter.update_from_headers(response.headers)
+            if response.status_code not in (429, *RETRY_STATUSES) or attempt == self.MAX_ATTEMPTS:
+                return response
+            if response.status_code == 429:
+                logger.warning(f"Rate limited by OpenF1, retrying {url} ({attempt}/{self.MAX_ATTEMPTS})")
+            else:
+                logger.warning(f"OpenF1 answered {response.status_code}, retrying {url} ({attempt}/{self.MAX_ATTEMPTS})")
+                time.sleep(backoff_delay(attempt, self.RETRY_BACKOFF))
+    
     # Driver Data Methods
     
     def get_drivers(self, 
@@ -130,7 +159,7 @@ class OpenF1Client:
         if country_name:
             params['country_name'] = country_name
             
-        return self._make_request("meetings", params)
+        return self._make_request("meetings", params, permanent=is_completed_season(year))
     
     def get_sessions(self,
                     meeting_key: Optional[str] = None,
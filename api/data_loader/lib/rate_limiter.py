@@ -0,0 +1,145 @@
+"""
+Token bucket rate limiting for the data loader's API clients
+
+One bucket per upstream host, shared by every client (and so every puller)
+in the process. Requests take a token and wait only when the bucket is
+empty. Responses adjust the bucket: ``Retry-After`` and an exhausted
+``X-RateLimit-*-Remaining`` pause the host until the advertised reset, and a
+low remaining quota caps the tokens left.
+"""
+
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Reset headers above this are epoch timestamps rather than seconds from now
+EPOCH_THRESHOLD = 10 ** 9
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the quota would only come back after more than max_wait seconds"""
+
+
+class TokenBucket:
+    """
+    Allow ``rate`` requests per second on average, in bursts of up to ``burst``
+
+    ``clock`` and ``sleep`` can be swapped out in tests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_wait: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(burst)
+        self.updated_at = clock()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token now and return how long to wait before using it"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate if self.tokens < 0 else 0.0, self.paused_until - now)
+            if wait > self.max_wait:
+                # Give the token back, the request is not going to be made
+                self.tokens += 1
+                raise RateLimitExceeded(f'Rate limit quota exhausted for another {wait:.0f}s')
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a request may be made; return the seconds waited"""
+        wait = self.reserve()
+        if wait > 0:
+            logger.info(f'Rate limited, waiting {wait:.1f}s')
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Make no request for the next ``seconds``"""
+        with self._lock:
+            now = self.clock()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self._refill(now)
+            self.tokens = min(self.tokens, 0.0)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Follow the upstream's Retry-After and X-RateLimit-* headers"""
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        # APISports sends per minute (X-RateLimit-*) and per day (X-RateLimit-Requests-*) quotas
+        for prefix in ('X-RateLimit', 'X-RateLimit-Requests'):
+            remaining = _parse_number(headers.get(f'{prefix}-Remaining'))
+            if remaining is None:
+                continue
+            if remaining <= 0:
+                reset = _parse_reset(headers.get(f'{prefix}-Reset'))
+                self.pause(reset if reset is not None else 60.0)
+            else:
+                with self._lock:
+                    self.tokens = min(self.tokens, remaining)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay seconds or an HTTP date)"""
+    if not value:
+        return None
+    seconds = _parse_number(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    seconds = _parse_number(value)
+    if seconds is None:
+        return None
+    if seconds > EPOCH_THRESHOLD:
+        seconds -= time.time()
+    return max(seconds, 0.0)
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(host: str) -> TokenBucket:
+    """Return the process wide bucket for a host, configured from DATA_LOADER_RATE_LIMITS"""
+    with _buckets_lock:
+        if host not in _buckets:
+            config = {**settings.DATA_LOADER_RATE_LIMITS['default'], **settings.DATA_LOADER_RATE_LIMITS.get(host, {})}
+            _buckets[host] = TokenBucket(**config)
+        return _buckets[host]
+
+
+def reset_rate_limiters() -> None:
+    """Forget every bucket, e.g. after changing DATA_LOADER_RATE_LIMITS"""
+    with _buckets_lock:
+        _buckets.clear()
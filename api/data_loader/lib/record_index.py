@@ -0,0 +1,58 @@
+"""
+Batched lookups of existing records for the pullers
+
+The pullers match an incoming API row to a stored record by any of several
+fields (API id, name, number...). ``RecordIndex`` loads every candidate for a
+whole API response in one query and answers those lookups from memory, the
+way ``filter(Q(a=...) | Q(b=...)).first()`` would, one row at a time.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from django.db.models import Model, Q, QuerySet
+
+
+def _usable(value: Any) -> bool:
+    # A missing key matches nothing, rather than every record without one
+    return value is not None and value != ''
+
+
+class RecordIndex:
+    """Records of a queryset indexed by each of ``fields``"""
+
+    def __init__(self, queryset: QuerySet, fields: Sequence[str], rows: Iterable[Dict[str, Any]]):
+        """Load the records matching any of ``fields`` in any of ``rows`` ({field: value} dicts)"""
+        self.fields = list(fields)
+        self._index = {field: {} for field in self.fields}
+
+        values = {field: set() for field in self.fields}
+        for row in rows:
+            for field in self.fields:
+                if _usable(row.get(field)):
+                    values[field].add(row[field])
+
+        query = Q()
+        for field, field_values in values.items():
+            if field_values:
+                query |= Q(**{f'{field}__in': field_values})
+        if query:
+            for record in queryset.filter(query).order_by('pk'):
+                self.add(record)
+
+    def add(self, record: Model) -> None:
+        """Index a record, e.g. one created earlier in the same batch"""
+        for field in self.fields:
+            value = getattr(record, field)
+            if _usable(value):
+                self._index[field].setdefault(value, record)
+
+    def find(self, **values: Any) -> Optional[Model]:
+        """The record matching any of the given field values, stored records first, then lowest pk"""
+        matches = [
+            self._index[field][value]
+            for field, value in values.items()
+            if _usable(value) and value in self._index[field]
+        ]
+        if not matches:
+            return None
+        return min(matches, key=lambda record: (record._state.adding, record.pk))
@@ -46,9 +46,8 @@ class DriversPullerTest(TestCase):
         
         self.mock_drivers = [self.mock_driver_data]
 
-    @patch('data_loader.services.drivers_puller.time.sleep')
-    @patch.object(DriversPuller, '_process_driver')
-    def test_pull_and_sync_drivers_success(self, mock_process_driver, mock_sleep):
+    @patch.object(DriversPuller, '_sync_drivers')
+    def test_pull_and_sync_drivers_success(self, mock_sync_drivers):
         """Test successful drivers pulling and syncing"""
         with patch.object(self.drivers_puller.client, 'get_drivers_rankings') as mock_get_rankings, \
              patch.object(self.drivers_puller.client, 'get_driver') as mock_get_driver:
@@ -67,11 +66,10 @@ class DriversPullerTest(TestCase):
             mock_get_rankings.assert_called_once()
             self.assertEqual(mock_get_driver.call_count, 2)
             
-            # Verify process_driver was called for each driver
-            self.assertEqual(mock_process_driver.call_count, 2)
+            # Verify every fetched driver was synced in one batch
+            mock_sync_drivers.assert_called_once_with([(1, self.mock_driver_data), (2, self.mock_driver_data)])
 
-    @patch('data_loader.services.drivers_puller.time.sleep')
-    def test_pull_and_sync_drivers_no_rankings(self, mock_sleep):
+    def test_pull_and_sync_drivers_no_rankings(self):
         """Test drivers pulling when no rankings are returned"""
         with patch.object(self.drivers_puller.client, 'get_drivers_rankings') as mock_get_rankings:
             mock_get_rankings.return_value = []
@@ -83,8 +81,7 @@ class DriversPullerTest(TestCase):
             self.assertEqual(result['drivers_fetched'], 0)
             self.assertIn('No drivers found in APISports F1 API', result['errors'])
 
-    @patch('data_loader.services.drivers_puller.time.sleep')
-    def test_pull_and_sync_drivers_api_error(self, mock_sleep):
+    def test_pull_and_sync_drivers_api_error(self):
         """Test drivers pulling when API call fails"""
         with patch.object(self.drivers_puller.client, 'get_drivers_rankings') as mock_get_rankings:
             mock_get_rankings.side_effect = Exception('API connection failed')
@@ -96,8 +93,7 @@ class DriversPullerTest(TestCase):
             self.assertEqual(result['drivers_fetched'], 0)
             self.assertIn('API connection failed', result['errors'])
 
-    @patch('data_loader.services.drivers_puller.time.sleep')
-    def test_pull_and_sync_drivers_driver_not_found(self, mock_sleep):
+    def test_pull_and_sync_drivers_driver_not_found(self):
         """Test drivers pulling when individual driver is not found"""
         with patch.object(self.drivers_puller.client, 'get_drivers_rankings') as mock_get_rankings, \
              patch.object(self.drivers_puller.client, 'get_driver') as mock_get_driver:
@@ -112,11 +108,10 @@ class DriversPullerTest(TestCase):
             self.assertEqual(result['drivers_fetched'], 2)
             self.assertEqual(len(result['errors']), 2)  # Two driver not found errors
 
-    @patch('data_loader.services.drivers_puller.time.sleep')
-    @patch.object(DriversPuller, '_process_driver')
-    def test_pull_and_sync_drivers_process_error(self, mock_process_driver, mock_sleep):
+    @patch.object(DriversPuller, '_driver_params')
+    def test_pull_and_sync_drivers_process_error(self, mock_driver_params):
         """Test drivers pulling when processing individual driver fails"""
-        mock_process_driver.side_effect = Exception('Processing error')
+        mock_driver_params.side_effect = Exception('Processing error')
         
         with patch.object(self.drivers_puller.client, 'get_drivers_rankings') as mock_get_rankings, \
              patch.object(self.drivers_puller.client, 'get_driver') as mock_get_driver:
@@ -131,93 +126,62 @@ class DriversPullerTest(TestCase):
             self.assertEqual(result['drivers_fetched'], 1)
             self.assertIn('Error processing driver (1): Processing error', result['errors'])
 
-    def test_process_driver_new_driver(self):
-        """Test processing a new driver (creation)"""
-        with patch.object(self.drivers_puller, '_find_driver') as mock_find_driver, \
-             patch.object(self.drivers_puller, '_create_driver') as mock_create_driver:
-            
-            mock_find_driver.return_value = None  # Driver doesn't exist
-            
-            self.drivers_puller._process_driver(self.mock_driver_data)
-            
-            # Verify find_driver and create_driver were called
-            mock_find_driver.assert_called_once_with(self.mock_driver_data)
-            mock_create_driver.assert_called_once_with(self.mock_driver_data)
-            
-            # Verify result counters
-            self.assertEqual(self.drivers_puller.result['drivers_created'], 1)
-            self.assertEqual(self.drivers_puller.result['drivers_updated'], 0)
-
-    def test_process_driver_existing_driver(self):
-        """Test processing an existing driver (update)"""
+    def test_sync_drivers_creates_and_updates(self):
+        """Test new drivers are created and known ones updated, each counted once"""
         existing_driver = Member.objects.create(
             apisports_id=1,
-            name='Max Verstappen',
+            name='Old Name',
             role=MemberRole.DRIVER,
-            team=self.test_team
         )
+        new_driver = {
+            **self.mock_driver_data,
+            'id': 2, 'name': 'Sergio Perez', 'number': 11, 'abbr': 'PER', 'country': {'code': 'MEX'}
+        }
         
-        with patch.object(self.drivers_puller, '_find_driver') as mock_find_driver, \
-             patch.object(self.drivers_puller, '_update_driver') as mock_update_driver:
-            
-            mock_find_driver.return_value = existing_driver
-            
-            self.drivers_puller._process_driver(self.mock_driver_data)
-            
-            # Verify find_driver and update_driver were called
-            mock_find_driver.assert_called_once_with(self.mock_driver_data)
-            mock_update_driver.assert_called_once_with(self.mock_driver_data, existing_driver)
-            
-            # Verify result counters
-            self.assertEqual(self.drivers_puller.result['drivers_created'], 0)
-            self.assertEqual(self.drivers_puller.result['drivers_updated'], 1)
-
-    def test_create_driver(self):
-        """Test driver creation"""
-        with patch.object(self.drivers_puller, '_driver_params') as mock_driver_params:
-            mock_params = {
-                'name': 'Max Verstappen',
-                'role': MemberRole.DRIVER,
-                'team': self.test_team,
-                'apisports_id': 1
-            }
-            mock_driver_params.return_value = mock_params
-            
-            self.drivers_puller._create_driver(self.mock_driver_data)
-            
-            # Verify driver_params was called
-            mock_driver_params.assert_called_once_with(self.mock_driver_data)
-            
-            # Verify driver was created in database
-            self.assertTrue(Member.objects.filter(name='Max Verstappen').exists())
+        self.drivers_puller._sync_drivers([(1, self.mock_driver_data), (2, new_driver)])
+        
+        self.assertEqual(self.drivers_puller.result['drivers_created'], 1)
+        self.assertEqual(self.drivers_puller.result['drivers_updated'], 1)
+        self.assertEqual(self.drivers_puller.result['errors'], [])
+        
+        existing_driver.refresh_from_db()
+        self.assertEqual(existing_driver.name, 'Max Verstappen')
+        self.assertEqual(existing_driver.driver_number, 1)
+        self.assertEqual(existing_driver.team, self.test_team)
+        self.assertGreater(existing_driver.updated_at, existing_driver.created_at)
+        self.assertEqual(Member.objects.get(apisports_id=2).team, self.test_team)
 
-    def test_update_driver(self):
-        """Test driver update"""
-        existing_driver = Member.objects.create(
-            apisports_id=1,
-            name='Old Name',
-            role=MemberRole.DRIVER,
-            team=self.test_team
+    def test_sync_drivers_skips_drivers_without_team(self):
+        """Test a driver whose team is unknown is reported and the others still written"""
+        unknown_team_driver = {
+            **self.mock_driver_data,
+            'id': 2, 'name': 'Sergio Perez', 'number': 11,
+            'teams': [{'team': {'id': 99, 'name': 'Unknown Team'}}]
+        }
+        
+        self.drivers_puller._sync_drivers([(1, self.mock_driver_data), (2, unknown_team_driver)])
+        
+        self.assertEqual(self.drivers_puller.result['drivers_created'], 1)
+        self.assertEqual(
+            self.drivers_puller.result['errors'],
+            ['Error processing driver (2): Could not find team for driver Sergio Perez']
         )
+        self.assertFalse(Member.objects.filter(apisports_id=2).exists())
+
+    def test_sync_drivers_query_count(self):
+        """Test a batch costs two lookups and one write per kind, however many drivers it has"""
+        Member.objects.create(apisports_id=1, name='Max Verstappen', role=MemberRole.DRIVER)
+        drivers = [(1, self.mock_driver_data)] + [
+            (driver_id, {**self.mock_driver_data, 'id': driver_id, 'name': f'Driver {driver_id}', 'number': driver_id})
+            for driver_id in range(2, 21)
+        ]
         
-        with patch.object(self.drivers_puller, '_driver_params') as mock_driver_params:
-            mock_params = {
-                'name': 'Max Verstappen',
-                'role': MemberRole.DRIVER,
-                'team': self.test_team,
-                'driver_number': 1
-            }
-            mock_driver_params.return_value = mock_params
-            
-            self.drivers_puller._update_driver(self.mock_driver_data, existing_driver)
-            
-            # Verify driver_params was called
-            mock_driver_params.assert_called_once_with(self.mock_driver_data)
-            
-            # Verify driver was updated
-            existing_driver.refresh_from_db()
-            self.assertEqual(existing_driver.name, 'Max Verstappen')
-            self.assertEqual(existing_driver.driver_number, 1)
+        # Teams and members SELECTs, then SAVEPOINT, INSERT, UPDATE, RELEASE
+        with self.assertNumQueries(6):
+            self.drivers_puller._sync_drivers(drivers)
+        
+        self.assertEqual(self.drivers_puller.result['drivers_created'], 19)
+        self.assertEqual(self.drivers_puller.result['drivers_updated'], 1)
 
     def test_driver_params(self):
         """Test driver parameters extraction from API data"""
@@ -76,8 +76,10 @@ class RacesPullerTest(TestCase):
         """Test successful races pulling and syncing"""
         mock_races = [self.mock_race_data]
         
-        with patch.object(self.races_puller.client, 'get_races') as mock_get_races:
+        with patch.object(self.races_puller.client, 'get_races') as mock_get_races, \
+             patch.object(self.races_puller.client, 'get_race_rankings') as mock_get_positions:
             mock_get_races.return_value = mock_races
+            mock_get_positions.return_value = [self.mock_position_data]
             
             result = self.races_puller.pull_and_sync_races(2024)
             
@@ -87,9 +89,10 @@ class RacesPullerTest(TestCase):
             
             # Verify API client was called with correct season
             mock_get_races.assert_called_once_with(2024)
+            mock_get_positions.assert_called_once_with(1, True)
             
-            # Verify process_race was called for each race
-            mock_process_race.assert_called_once_with(self.mock_race_data)
+            # Verify process_race was called for each race, with its prefetched positions
+            mock_process_race.assert_called_once_with(self.mock_race_data, [self.mock_position_data])
 
     @patch.object(RacesPuller, '_process_race')
     def test_pull_and_sync_races_default_season(self, mock_process_race):
@@ -97,6 +100,7 @@ class RacesPullerTest(TestCase):
         mock_races = [self.mock_race_data]
         
         with patch.object(self.races_puller.client, 'get_races') as mock_get_races, \
+             patch.object(self.races_puller.client, 'get_race_rankings'), \
              patch('data_loader.services.races_puller.datetime') as mock_datetime:
             
             mock_datetime.now.return_value.year = 2024
@@ -127,7 +131,8 @@ class RacesPullerTest(TestCase):
         mock_process_race.side_effect = Exception('Processing error')
         mock_races = [self.mock_race_data]
         
-        with patch.object(self.races_puller.client, 'get_races') as mock_get_races:
+        with patch.object(self.races_puller.client, 'get_races') as mock_get_races, \
+             patch.object(self.races_puller.client, 'get_race_rankings'):
             mock_get_races.return_value = mock_races
             
             result = self.races_puller.pull_and_sync_races(2024)
@@ -356,6 +361,7 @@ class RacesPullerTest(TestCase):
             self.assertEqual(params['name'], 'Monaco Grand Prix')
             self.assertEqual(params['description'], expected_description)
             self.assertEqual(params['status'], RaceStatus.COMPLETED)
+            self.assertNotIn('season', params)
 
     def test_race_params_status_mapping(self):
         """Test race status mapping from API data"""
@@ -380,9 +386,8 @@ class RacesPullerTest(TestCase):
                 params = self.races_puller._race_params(race_data, self.test_circuit)
                 self.assertEqual(params['status'], expected_status)
 
-    @patch('data_loader.services.races_puller.time.sleep')
-    @patch.object(RacesPuller, '_process_position')
-    def test_process_race_positions_success(self, mock_process_position, mock_sleep):
+    @patch.object(RacesPuller, '_sync_positions')
+    def test_process_race_positions_success(self, mock_sync_positions):
         """Test processing race positions successfully"""
         mock_positions = [self.mock_position_data]
         
@@ -400,13 +405,11 @@ class RacesPullerTest(TestCase):
             
             self.races_puller._process_race_positions(race, 1)
             
-            mock_get_positions.assert_called_once_with(1)
-            mock_process_position.assert_called_once_with(race, self.mock_position_data)
-            mock_sleep.assert_called_once_with(10)
+            mock_get_positions.assert_called_once_with(1, final=False)
+            mock_sync_positions.assert_called_once_with(race, mock_positions)
 
-    @patch('data_loader.services.races_puller.time.sleep')
-    @patch.object(RacesPuller, '_process_position')
-    def test_process_race_positions_api_error(self, mock_process_position, mock_sleep):
+    @patch.object(RacesPuller, '_sync_positions')
+    def test_process_race_positions_api_error(self, mock_sync_positions):
         """Test processing race positions when API call fails"""
         race = Race.objects.create(
             apisports_id=1,
@@ -425,12 +428,12 @@ class RacesPullerTest(TestCase):
                 self.races_puller._process_race_positions(race, 1)
             
             self.assertEqual(str(context.exception), 'API error')
-            mock_get_positions.assert_called_once_with(1)
-            mock_process_position.assert_not_called()
-            mock_sleep.assert_called_once_with(10)
+            mock_get_positions.assert_called_once_with(1, final=False)
+            mock_sync_positions.assert_not_called()
 
-    def test_process_position_new_position(self):
-        """Test processing a new position (creation)"""
+    @patch.object(RacesPuller, '_sync_positions')
+    def test_process_race_positions_prefetched(self, mock_sync_positions):
+        """Test prefetched positions are processed without another request, and a failed prefetch is raised"""
         race = Race.objects.create(
             apisports_id=1,
             circuit=self.test_circuit,
@@ -440,24 +443,18 @@ class RacesPullerTest(TestCase):
             status=RaceStatus.COMPLETED
         )
         
-        with patch.object(self.races_puller, '_find_driver') as mock_find_driver, \
-             patch.object(self.races_puller, '_find_position') as mock_find_position, \
-             patch.object(self.races_puller, '_create_position') as mock_create_position:
-            
-            mock_find_driver.return_value = self.test_driver
-            mock_find_position.return_value = None  # Position doesn't exist
-            
-            self.races_puller._process_position(race, self.mock_position_data)
+        with patch.object(self.races_puller.client, 'get_race_rankings') as mock_get_positions:
+            self.races_puller._process_race_positions(race, 1, [self.mock_position_data])
             
-            mock_find_driver.assert_called_once_with(self.mock_position_data)
-            mock_find_position.assert_called_once_with(race, self.test_driver)
-            mock_create_position.assert_called_once_with(race, self.test_driver, self.mock_position_data)
+            with self.assertRaises(Exception) as context:
+                self.races_puller._process_race_positions(race, 1, Exception('API error'))
             
-            self.assertEqual(self.races_puller.result['positions_created'], 1)
+            self.assertEqual(str(context.exception), 'API error')
+            mock_get_positions.assert_not_called()
+            mock_sync_positions.assert_called_once_with(race, [self.mock_position_data])
 
-    def test_process_position_existing_position(self):
-        """Test processing an existing position (update)"""
-        race = Race.objects.create(
+    def create_race(self):
+        return Race.objects.create(
             apisports_id=1,
             circuit=self.test_circuit,
             name='Monaco Grand Prix',
@@ -465,47 +462,90 @@ class RacesPullerTest(TestCase):
             start_at=datetime.now(),
             status=RaceStatus.COMPLETED
         )
-        
-        existing_position = Position.objects.create(
-            race=race,
-            driver=self.test_driver,
-            position=1,
-            points=25
+
+    def test_sync_positions_creates_and_updates(self):
+        """Test new positions are created and known ones updated, with accurate counts"""
+        race = self.create_race()
+        second_driver = Member.objects.create(
+            apisports_id=2,
+            name='Sergio Perez',
+            role=MemberRole.DRIVER,
+            team=self.test_team,
+            driver_number=11
         )
+        existing_position = Position.objects.create(race=race, driver=self.test_driver, position=2, points=18)
+        
+        self.races_puller._sync_positions(race, [
+            self.mock_position_data,
+            {**self.mock_position_data, 'driver': {'id': 2, 'name': 'Sergio Perez'}, 'position': 2},
+        ])
+        
+        self.assertEqual(self.races_puller.result['positions_created'], 1)
+        self.assertEqual(self.races_puller.result['positions_updated'], 1)
+        
+        existing_position.refresh_from_db()
+        self.assertEqual(existing_position.position, 1)
+        self.assertEqual(existing_position.points, 25)
+        self.assertEqual(existing_position.pit_stop_count, 2)
+        self.assertEqual(Position.objects.get(race=race, driver=second_driver).points, 18)
+
+    def test_sync_positions_swapped_places(self):
+        """Test two drivers trading places (e.g. after a penalty) are both updated"""
+        race = self.create_race()
+        second_driver = Member.objects.create(
+            apisports_id=2, name='Sergio Perez', role=MemberRole.DRIVER, team=self.test_team, driver_number=11
+        )
+        Position.objects.create(race=race, driver=self.test_driver, position=2, points=18)
+        Position.objects.create(race=race, driver=second_driver, position=1, points=25)
+        
+        self.races_puller._sync_positions(race, [
+            self.mock_position_data,
+            {**self.mock_position_data, 'driver': {'id': 2}, 'position': 2},
+        ])
+        
+        self.assertEqual(self.races_puller.result['positions_updated'], 2)
+        self.assertEqual(Position.objects.get(race=race, driver=self.test_driver).position, 1)
+        self.assertEqual(Position.objects.get(race=race, driver=second_driver).position, 2)
+
+    def test_sync_positions_skips_unknown_drivers(self):
+        """Test positions of unknown drivers, or without a position number, are skipped"""
+        race = self.create_race()
+        
+        self.races_puller._sync_positions(race, [
+            {**self.mock_position_data, 'driver': {'id': 99, 'name': 'Unknown Driver'}},
+            {**self.mock_position_data, 'position': None},
+        ])
+        
+        self.assertEqual(self.races_puller.result['positions_created'], 0)
+        self.assertEqual(self.races_puller.result['errors'], [])
+        self.assertFalse(Position.objects.exists())
+
+    def test_sync_positions_query_count(self):
+        """Test a race's rankings cost two lookups and one write per kind, however many positions"""
+        race = self.create_race()
+        Position.objects.create(race=race, driver=self.test_driver, position=1, points=25)
+        positions_data = [self.mock_position_data]
+        for number in range(2, 21):
+            Member.objects.create(
+                apisports_id=number, name=f'Driver {number}', role=MemberRole.DRIVER, driver_number=number
+            )
+            positions_data.append({**self.mock_position_data, 'driver': {'id': number}, 'position': number})
         
-        with patch.object(self.races_puller, '_find_driver') as mock_find_driver, \
-             patch.object(self.races_puller, '_find_position') as mock_find_position, \
-             patch.object(self.races_puller, '_update_position') as mock_update_position:
-            
-            mock_find_driver.return_value = self.test_driver
-            mock_find_position.return_value = existing_position
-            
-            self.races_puller._process_position(race, self.mock_position_data)
-            
-            mock_find_driver.assert_called_once_with(self.mock_position_data)
-            mock_find_position.assert_called_once_with(race, self.test_driver)
-            mock_update_position.assert_called_once_with(existing_position, race, self.test_driver, self.mock_position_data)
-            
-            self.assertEqual(self.races_puller.result['positions_updated'], 1)
+        # Members and positions SELECTs, then the INSERT and the UPDATE
+        with self.assertNumQueries(4):
+            self.races_puller._sync_positions(race, positions_data)
+        
+        self.assertEqual(self.races_puller.result['positions_created'], 19)
+        self.assertEqual(self.races_puller.result['positions_updated'], 1)
+        self.assertEqual(Position.objects.filter(race=race).count(), 20)
 
-    def test_process_position_driver_not_found(self):
-        """Test processing position when driver is not found"""
-        race = Race.objects.create(
-            apisports_id=1,
-            circuit=self.test_circuit,
-            name='Monaco Grand Prix',
-            description='Test race',
-            start_at=datetime.now(),
-            status=RaceStatus.COMPLETED
-        )
+    def test_process_race_is_one_transaction(self):
+        """Test a race whose positions fail to save is not written either"""
+        with patch.object(RacesPuller, '_sync_positions', side_effect=Exception('Write error')):
+            with self.assertRaises(Exception):
+                self.races_puller._process_race(self.mock_race_data, [self.mock_position_data])
         
-        with patch.object(self.races_puller, '_find_driver') as mock_find_driver:
-            mock_find_driver.return_value = None  # Driver not found
-            
-            # Should not raise exception, just log error
-            self.races_puller._process_position(race, self.mock_position_data)
-            
-            mock_find_driver.assert_called_once_with(self.mock_position_data)
+        self.assertFalse(Race.objects.filter(apisports_id=1).exists())
 
     def test_find_driver_by_apisports_id(self):
         """Test finding driver by API Sports ID"""
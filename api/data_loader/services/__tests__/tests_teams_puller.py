@@ -53,9 +53,8 @@ class TeamsPullerTest(TestCase):
             }
         ]
 
-    @patch('data_loader.services.teams_puller.time.sleep')
-    @patch.object(TeamsPuller, '_process_team')
-    def test_pull_and_sync_teams_success(self, mock_process_team, mock_sleep):
+    @patch.object(TeamsPuller, '_sync_teams')
+    def test_pull_and_sync_teams_success(self, mock_sync_teams):
         """Test successful teams pulling and syncing"""
         # Mock the API client
         with patch.object(self.teams_puller.client, 'get_teams') as mock_get_teams:
@@ -71,13 +70,10 @@ class TeamsPullerTest(TestCase):
             # Verify API client was called
             mock_get_teams.assert_called_once()
             
-            # Verify process_team was called for each team
-            self.assertEqual(mock_process_team.call_count, 2)
-            mock_process_team.assert_any_call(self.mock_api_teams[0])
-            mock_process_team.assert_any_call(self.mock_api_teams[1])
+            # Verify the whole response was synced at once
+            mock_sync_teams.assert_called_once_with(self.mock_api_teams)
 
-    @patch('data_loader.services.teams_puller.time.sleep')
-    def test_pull_and_sync_teams_api_error(self, mock_sleep):
+    def test_pull_and_sync_teams_api_error(self):
         """Test teams pulling when API call fails"""
         with patch.object(self.teams_puller.client, 'get_teams') as mock_get_teams:
             mock_get_teams.side_effect = Exception('API connection failed')
@@ -89,110 +85,63 @@ class TeamsPullerTest(TestCase):
             self.assertEqual(result['teams_fetched'], 0)
             self.assertIn('API connection failed', result['errors'])
 
-    @patch('data_loader.services.teams_puller.time.sleep')
-    @patch.object(TeamsPuller, '_process_team')
-    def test_pull_and_sync_teams_process_error(self, mock_process_team, mock_sleep):
-        """Test teams pulling when processing individual team fails"""
-        # Mock process_team to raise exception for first team
-        mock_process_team.side_effect = [Exception('Processing error'), None]
+    def test_pull_and_sync_teams_process_error(self):
+        """Test a team that fails to process leaves every team of the response unwritten"""
+        broken_team = {**self.mock_api_teams[1], 'highest_race_finish': None}
         
         with patch.object(self.teams_puller.client, 'get_teams') as mock_get_teams:
-            mock_get_teams.return_value = self.mock_api_teams
+            mock_get_teams.return_value = [self.mock_api_teams[0], broken_team]
             
             result = self.teams_puller.pull_and_sync_teams()
             
-            # Should fail because processing error will be re-raised
             self.assertFalse(result['success'])
             self.assertEqual(result['teams_fetched'], 2)
-            self.assertIn('Processing error', result['errors'])
-
-    def test_process_team_new_team(self):
-        """Test processing a new team (creation)"""
-        with patch.object(self.teams_puller, '_find_team') as mock_find_team, \
-             patch.object(self.teams_puller, '_create_team') as mock_create_team:
-            
-            mock_find_team.return_value = None  # Team doesn't exist
-            
-            self.teams_puller._process_team(self.mock_team_data)
-            
-            # Verify find_team and create_team were called
-            mock_find_team.assert_called_once_with(self.mock_team_data)
-            mock_create_team.assert_called_once_with(self.mock_team_data)
-            
-            # Verify result counters
-            self.assertEqual(self.teams_puller.result['teams_created'], 1)
-            self.assertEqual(self.teams_puller.result['teams_updated'], 0)
+            self.assertEqual(len(result['errors']), 1)
+            self.assertEqual(result['teams_created'], 0)
+            self.assertFalse(Team.objects.exists())
 
-    def test_process_team_existing_team(self):
-        """Test processing an existing team (update)"""
+    def test_sync_teams_creates_and_updates(self):
+        """Test new teams are created and known ones updated, with accurate counts"""
         existing_team = Team.objects.create(
             name='Red Bull Racing',
             description='Existing team',
-            status=TeamStatus.ACTIVE
+            status=TeamStatus.INACTIVE
         )
         
-        with patch.object(self.teams_puller, '_find_team') as mock_find_team, \
-             patch.object(self.teams_puller, '_update_team') as mock_update_team:
-            
-            mock_find_team.return_value = existing_team
-            
-            self.teams_puller._process_team(self.mock_team_data)
-            
-            # Verify find_team and update_team were called
-            mock_find_team.assert_called_once_with(self.mock_team_data)
-            mock_update_team.assert_called_once_with(self.mock_team_data, existing_team)
-            
-            # Verify result counters
-            self.assertEqual(self.teams_puller.result['teams_created'], 0)
-            self.assertEqual(self.teams_puller.result['teams_updated'], 1)
+        self.teams_puller._sync_teams(self.mock_api_teams)
+        
+        self.assertEqual(self.teams_puller.result['teams_created'], 1)
+        self.assertEqual(self.teams_puller.result['teams_updated'], 1)
+        self.assertEqual(Team.objects.count(), 2)
+        
+        existing_team.refresh_from_db()
+        self.assertEqual(existing_team.apisports_id, 1)
+        self.assertEqual(existing_team.status, TeamStatus.ACTIVE)
+        self.assertEqual(existing_team.chassis, 'RB19')
+        self.assertGreater(existing_team.updated_at, existing_team.created_at)
+        self.assertEqual(Team.objects.get(apisports_id=2).name, 'Mercedes')
 
-    def test_create_team(self):
-        """Test team creation"""
-        with patch.object(self.teams_puller, '_team_params') as mock_team_params:
-            mock_params = {
-                'name': 'Red Bull Racing', 
-                'status': TeamStatus.ACTIVE,
-                'apisports_id': 1
-            }
-            mock_team_params.return_value = mock_params
-            
-            self.teams_puller._create_team(self.mock_team_data)
-            
-            # Verify team_params was called
-            mock_team_params.assert_called_once_with(self.mock_team_data)
-            
-            # Verify team was created in database
-            self.assertTrue(Team.objects.filter(name='Red Bull Racing').exists())
-            
-            # Verify counter incremented
-            self.assertEqual(self.teams_puller.result['teams_created'], 1)
+    def test_sync_teams_query_count(self):
+        """Test a response costs one lookup and one write per kind, however many teams it has"""
+        Team.objects.create(name='Red Bull Racing', description='Existing team', status=TeamStatus.ACTIVE)
+        teams = self.mock_api_teams + [
+            {**self.mock_api_teams[1], 'id': team_id, 'name': f'Team {team_id}'} for team_id in range(3, 23)
+        ]
+        
+        # SELECT, then SAVEPOINT, INSERT, UPDATE, RELEASE
+        with self.assertNumQueries(5):
+            self.teams_puller._sync_teams(teams)
+        
+        self.assertEqual(self.teams_puller.result['teams_created'], 21)
+        self.assertEqual(self.teams_puller.result['teams_updated'], 1)
 
-    def test_update_team(self):
-        """Test team update"""
-        existing_team = Team.objects.create(
-            name='Old Name',
-            description='Old description',
-            status=TeamStatus.INACTIVE
-        )
+    def test_sync_teams_duplicates_in_response(self):
+        """Test a team listed twice in one response is written once"""
+        self.teams_puller._sync_teams([self.mock_team_data, {**self.mock_team_data, 'chassis': 'RB20'}])
         
-        with patch.object(self.teams_puller, '_team_params') as mock_team_params:
-            mock_params = {
-                'name': 'Red Bull Racing',
-                'status': TeamStatus.ACTIVE,
-                'apisports_id': 1
-            }
-            mock_team_params.return_value = mock_params
-            
-            self.teams_puller._update_team(self.mock_team_data, existing_team)
-            
-            # Verify team_params was called
-            mock_team_params.assert_called_once_with(self.mock_team_data)
-            
-            # Verify team was updated
-            existing_team.refresh_from_db()
-            self.assertEqual(existing_team.name, 'Red Bull Racing')
-            self.assertEqual(existing_team.status, TeamStatus.ACTIVE)
-            self.assertEqual(existing_team.apisports_id, 1)
+        self.assertEqual(self.teams_puller.result['teams_created'], 1)
+        self.assertEqual(self.teams_puller.result['teams_updated'], 0)
+        self.assertEqual(Team.objects.get().chassis, 'RB20')
 
     def test_team_params(self):
         """Test team parameters extraction from API data"""
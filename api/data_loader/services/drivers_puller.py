@@ -1,20 +1,30 @@
 import logging
 from datetime import datetime
-from typing import Dict, Any
-import time
-from django.db.models import Q
+from typing import Dict, Any, List, Tuple
+from django.db import transaction
 
 from teams.models import Member, MemberRole, Team
 from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.async_client import AsyncFetcher
+from data_loader.lib.record_index import RecordIndex
+from formulated.lib.bulk import save_in_bulk
+from formulated.lib.response_cache import invalidate_api_cache
 
 logger = logging.getLogger(__name__)
 
+# Columns written by a sync, i.e. the keys of DriversPuller._driver_params
+MEMBER_FIELDS = [
+    'apisports_id', 'name', 'description', 'role', 'team', 'driver_number', 'name_acronym', 'country_code',
+    'headshot_url',
+]
+
 class DriversPuller:
     """Service for pulling and syncing driver data from ApiSports F1"""
     
-    def __init__(self):
+    def __init__(self, concurrency: int = None):
         """Initialize the service with ApiSports F1 client"""
         self.client = APISportsClient()
+        self.fetcher = AsyncFetcher(self.client, concurrency)
         self.result = {
             'success': False,
             'drivers_fetched': 0,
@@ -28,8 +38,6 @@ class DriversPuller:
         Pull drivers from OpenF1 and sync with database
         """
         
-        time.sleep(10) # 10 seconds between requests
-        
         try:
             current_year = datetime.now().year
 
@@ -46,72 +54,81 @@ class DriversPuller:
                 self.result['errors'].append("No drivers found in APISports F1 API")
                 return self.result
             
-            # Process each driver
-            for driver_id in driver_ids:                
-                # Prevent rate limiting
-                time.sleep(10) # 10 seconds between requests
-
-                logger.info(f"Processing driver ID: {driver_id}")
-                
+            # Fetch every driver concurrently, then write them all at once
+            responses = self.fetcher.run(('get_driver', driver_id) for driver_id in driver_ids)
+            drivers = []
+            
+            for driver_id, response in zip(driver_ids, responses):                
                 try:
-                    driver = self.client.get_driver(driver_id)[0]
+                    if isinstance(response, Exception):
+                        raise response
+                    driver = response[0]
                     
                     if not driver:
                         logger.error(f"Driver not found: {driver_id}")
                         self.result['errors'].append(f"Driver not found: {driver_id}")
                         continue
 
-                    self._process_driver(driver)
+                    drivers.append((driver_id, driver))
                 except Exception as e:
                     logger.error(f"Error processing driver: {e}")
                     self.result['errors'].append(f"Error processing driver ({driver_id}): {e}")
                     continue
             
+            self._sync_drivers(drivers)
+            
         except Exception as e:
             logger.error(f"Error processing drivers: {e}")
             self.result['errors'].append(str(e))
             return self.result
+        finally:
+            # Whatever was written before a failure is already visible
+            invalidate_api_cache('drivers sync finished')
         
         self.result['success'] = True
         return self.result
     
-    def _process_driver(self, driver: Dict[str, Any]) -> None:
-        """Process a driver from APISports F1 API"""
-        logger.info(f"Processing driver: {driver['name']} (#{driver['number']}) (ID: {driver['id']})")
+    def _sync_drivers(self, drivers: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Create or update (driver_id, driver) pairs from APISports F1 API, in bulk and in one transaction"""
+        team_index = self._team_index([driver['teams'][0].get('team') or {} for _, driver in drivers if driver.get('teams')])
+        index = self._driver_index([driver for _, driver in drivers])
+        created, updated = [], {}
         
-        # Get driver by api id OR name
-        existing_driver = self._find_driver(driver)
-        
-        if existing_driver:
-            logger.info(f"Driver {driver['name']} already exists (ID: {driver['id']}), updating...")
-            self._update_driver(driver, existing_driver)
-            self.result['drivers_updated'] += 1
-        else:
-            logger.info(f"Driver {driver['name']} does not exist (ID: {driver['id']}), creating...")
-            self._create_driver(driver)
-            self.result['drivers_created'] += 1
+        for driver_id, driver in drivers:
+            try:
+                logger.info(f"Processing driver: {driver['name']} (#{driver['number']}) (ID: {driver['id']})")
+                params = self._driver_params(driver, team_index)
+            except Exception as e:
+                logger.error(f"Error processing driver: {e}")
+                self.result['errors'].append(f"Error processing driver ({driver_id}): {e}")
+                continue
             
-        logger.info(f"Driver {driver['name']} processed successfully")
+            existing_driver = self._find_driver(driver, index)
+            if existing_driver is None:
+                existing_driver = Member(**params)
+                index.add(existing_driver)
+                created.append(existing_driver)
+            else:
+                for key, value in params.items():
+                    setattr(existing_driver, key, value)
+                # A driver matched twice in one batch is still written once
+                if not existing_driver._state.adding:
+                    updated[existing_driver.pk] = existing_driver
         
-    def _create_driver(self, driver: Dict[str, Any]) -> None:
-        """Create a driver from APISports F1 API"""
-        Member.objects.create(**self._driver_params(driver))
-        self.result['drivers_created'] += 1
-
-    def _update_driver(self, driver: Dict[str, Any], existing_driver: Member) -> None:
-        """Update a driver from APISports F1 API"""
-        driver_params = self._driver_params(driver)
-        for key, value in driver_params.items():
-            setattr(existing_driver, key, value)
-        existing_driver.save()
+        with transaction.atomic():
+            created_count, updated_count = save_in_bulk(Member, created, updated.values(), MEMBER_FIELDS)
+        
+        self.result['drivers_created'] += created_count
+        self.result['drivers_updated'] += updated_count
+        logger.info(f"Drivers synced: {created_count} created, {updated_count} updated")
 
-    def _driver_params(self, driver: Dict[str, Any]) -> Dict[str, Any]:
+    def _driver_params(self, driver: Dict[str, Any], team_index: RecordIndex = None) -> Dict[str, Any]:
         """Get driver parameters from APISports F1 API"""
         # Find team by apisports_id first, then fall back to name
         team = None
         if driver.get('teams') and len(driver['teams']) > 0:
             team_data = driver['teams'][0]['team'] # first team is the current team
-            team = self._find_team(team_data)
+            team = self._find_team(team_data, team_index)
                 
             if not team:
                 raise Exception(f"Could not find team for driver {driver['name']}")
@@ -128,15 +145,29 @@ class DriversPuller:
             'headshot_url': driver['image'],
         }
         
-    def _find_driver(self, driver_data: Dict[str, Any]) -> Member:
-        """Find a driver from APISports F1 API"""
-        driver_id = driver_data.get('id')
-        driver_name = driver_data.get('name')
-        driver_number = driver_data.get('number')
-        return Member.objects.filter(Q(apisports_id=driver_id) | Q(name=driver_name) | Q(driver_number=driver_number)).first()
+    def _driver_index(self, drivers: List[Dict[str, Any]]) -> RecordIndex:
+        """Load the stored members matching any of the drivers, in one query"""
+        return RecordIndex(Member.objects.all(), ['apisports_id', 'name', 'driver_number'], [
+            {'apisports_id': driver.get('id'), 'name': driver.get('name'), 'driver_number': driver.get('number')}
+            for driver in drivers
+        ])
+        
+    def _find_driver(self, driver_data: Dict[str, Any], index: RecordIndex = None) -> Member:
+        """Find a driver from APISports F1 API by id, name or number"""
+        index = index or self._driver_index([driver_data])
+        return index.find(
+            apisports_id=driver_data.get('id'),
+            name=driver_data.get('name'),
+            driver_number=driver_data.get('number')
+        )
+        
+    def _team_index(self, teams: List[Dict[str, Any]]) -> RecordIndex:
+        """Load the stored teams matching any of the drivers' teams, in one query"""
+        return RecordIndex(Team.objects.all(), ['apisports_id', 'name'], [
+            {'apisports_id': team.get('id'), 'name': team.get('name')} for team in teams
+        ])
         
-    def _find_team(self, team_data: Dict[str, Any]) -> Team:
-        """Find a team from APISports F1 API"""
-        team_id = team_data.get('id')
-        team_name = team_data.get('name')
-        return Team.objects.filter(Q(apisports_id=team_id) | Q(name=team_name)).first()
\ No newline at end of file
+    def _find_team(self, team_data: Dict[str, Any], index: RecordIndex = None) -> Team:
+        """Find a team from APISports F1 API by id or name"""
+        index = index or self._team_index([team_data])
+        return index.find(apisports_id=team_data.get('id'), name=team_data.get('name'))
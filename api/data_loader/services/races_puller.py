@@ -3,21 +3,29 @@ from datetime import datetime
 from typing import Dict, List, Any
 from django.db import transaction
 from django.utils.dateparse import parse_datetime
-import time
 from django.db.models import Q
 
 from races.models import Race, Circuit, RaceStatus, Position
 from teams.models import Member, Team, MemberRole
 from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.async_client import AsyncFetcher
+from data_loader.lib.http_cache import is_completed_season
+from data_loader.lib.record_index import RecordIndex
+from formulated.lib.bulk import save_in_bulk
+from formulated.lib.response_cache import invalidate_api_cache
 
 logger = logging.getLogger(__name__)
 
+# Columns written by a sync, i.e. the keys of RacesPuller._position_params
+POSITION_FIELDS = ['race', 'driver', 'position', 'points', 'laps', 'time', 'pit_stop_count', 'grid']
+
 class RacesPuller:
     """Service for pulling and syncing race data from APISports F1 API"""
     
-    def __init__(self):
+    def __init__(self, concurrency: int = None):
         """Initialize the service with APISports F1 API client"""
         self.client = APISportsClient()
+        self.fetcher = AsyncFetcher(self.client, concurrency)
         self.result = {
             'success': False,
             'races_fetched': 0,
@@ -44,13 +52,20 @@ class RacesPuller:
         try:
             # Get races for the specified season
             races = self.client.get_races(season)
+            self.result['races_fetched'] = len(races)
+            
+            # Fetch the positions of every race concurrently, then process the races one by one
+            rankings = self.fetcher.run(
+                ('get_race_rankings', race_data.get('id'), is_completed_season(race_data.get('season') or season))
+                for race_data in races
+            )
             
-            for race_data in races:
+            for race_data, positions_data in zip(races, rankings):
                 try:
                     race_id = race_data.get('id')
                     race_name = race_data.get('competition', {}).get('name', 'Unknown')
                     logger.info(f"Processing race: {race_name} (ID: {race_id})")
-                    self._process_race(race_data)
+                    self._process_race(race_data, positions_data)
                     
                 except Exception as e:
                     logger.error(f"Error processing race: {e}")
@@ -61,12 +76,15 @@ class RacesPuller:
             logger.error(f"Error processing races: {e}")
             self.result['errors'].append(str(e))
             return self.result
+        finally:
+            # Whatever was written before a failure is already visible
+            invalidate_api_cache('races sync finished')
         
         self.result['success'] = True
         return self.result
     
-    def _process_race(self, race_data: Dict[str, Any]) -> None:
-        """Process a race from APISports F1 API"""
+    def _process_race(self, race_data: Dict[str, Any], positions_data: Any = None) -> None:
+        """Process a race from APISports F1 API, with its positions if already fetched"""
         
         race_id = race_data.get('id')
         race_name = race_data.get('competition', {}).get('name', 'Unknown Race')
@@ -74,7 +92,7 @@ class RacesPuller:
         if not race_id:
             raise Exception(f"Race {race_name} has no API ID")
         
-        # Process race and circuit in separate transaction
+        # The race, its circuit and its positions are written together or not at all
         with transaction.atomic():
             circuit = self._get_or_create_circuit(race_data)
             
@@ -90,8 +108,7 @@ class RacesPuller:
                 race = self._create_race(race_data, circuit)
                 self.result['races_created'] += 1
 
-        # Process positions separately to avoid transaction conflicts
-        self._process_race_positions(race, race_id)
+            self._process_race_positions(race, race_id, positions_data)
                 
         logger.info(f"Race {race_name} processed successfully")
     
@@ -194,112 +211,114 @@ class RacesPuller:
         
         description = " | ".join(description_parts) if description_parts else "Formula 1 Race"
         
+        start_at = parse_datetime(race_data['date'])
+        
         return {
             'apisports_id': race_data['id'],
             'circuit': circuit,
             'name': competition_data.get('name', 'Unknown Race'),
             'description': description,
-            'start_at': parse_datetime(race_data['date']),
+            'start_at': start_at,
             'status': status,
         }
     
-    def _process_race_positions(self, race: Race, race_id: int) -> None:
-        """Process positions for a specific race"""
-        
-        logger.info(f"Fetching positions for race: {race.name}")
-        
-        # Add delay before fetching positions
-        time.sleep(10)
+    def _process_race_positions(self, race: Race, race_id: int, positions_data: Any = None) -> None:
+        """Process positions for a specific race, fetching them unless given (a failed fetch is re-raised)"""
         
         try:
-            positions_data = self.client.get_race_rankings(race_id)
+            if isinstance(positions_data, Exception):
+                raise positions_data
+            if positions_data is None:
+                logger.info(f"Fetching positions for race: {race.name}")
+                # Results of a finished season are final and cached for good
+                positions_data = self.client.get_race_rankings(race_id, final=is_completed_season(race.season))
             
             if not positions_data:
                 logger.info(f"No position data found for race {race.name}")
                 return
             
             logger.info(f"Found {len(positions_data)} positions for race {race.name}")
-            
-            for position_data in positions_data:
-                try:
-                    self._process_position(race, position_data)
-                except Exception as e:
-                    logger.error(f"Error processing position: {e}")
-                    self.result['errors'].append(f"Error processing position: {e}")
-                    continue
+            self._sync_positions(race, positions_data)
                     
         except Exception as e:
             logger.error(f"Error fetching positions for race {race.name}: {e}")
             raise
     
-    def _process_position(self, race: Race, position_data: Dict[str, Any]) -> None:
-        """Process a single position entry"""
-        
-        driver = self._find_driver(position_data)
+    def _sync_positions(self, race: Race, positions_data: List[Dict[str, Any]]) -> None:
+        """Create or update every position of a race's rankings in bulk"""
         
-        if not driver:
-            driver_data = position_data.get('driver', {})
-            driver_name = driver_data.get('name', 'Unknown')
-            driver_id = driver_data.get('id', 'Unknown')
-            logger.warning(f"Could not find existing driver: {driver_name} (ID: {driver_id})")
-            return
+        drivers = self._driver_index(positions_data)
+        positions = {position.driver_id: position for position in Position.objects.filter(race=race)}
+        created, updated, moved = [], {}, []
         
-        position_num = position_data.get('position')
-        if not position_num:
-            logger.warning(f"Position number missing for driver {driver.name}")
-            return
-        
-        # Use individual transaction for each position to avoid transaction conflicts
-        try:
-            with transaction.atomic():
-                existing_position = self._find_position(race, driver)
+        for position_data in positions_data:
+            try:
+                driver = self._find_driver(position_data, drivers)
                 
-                if existing_position:
-                    logger.info(f"Position {position_num} already exists for race {race.name}, updating...")
-                    self._update_position(existing_position, race, driver, position_data)
-                    self.result['positions_updated'] += 1
-                else:
-                    logger.info(f"Creating position {position_num} for {driver.name} in race {race.name}")
-                    self._create_position(race, driver, position_data)
-                    self.result['positions_created'] += 1
-        except Exception as e:
-            logger.error(f"Error saving position {position_num} for {driver.name} in race {race.name}: {e}")
-            raise
+                if not driver:
+                    driver_data = position_data.get('driver', {})
+                    driver_name = driver_data.get('name', 'Unknown')
+                    driver_id = driver_data.get('id', 'Unknown')
+                    logger.warning(f"Could not find existing driver: {driver_name} (ID: {driver_id})")
+                    continue
+                
+                position_num = position_data.get('position')
+                if not position_num:
+                    logger.warning(f"Position number missing for driver {driver.name}")
+                    continue
+                
+                params = self._position_params(race, driver, position_data)
+            except Exception as e:
+                logger.error(f"Error processing position: {e}")
+                self.result['errors'].append(f"Error processing position: {e}")
+                continue
+            
+            position = positions.get(driver.pk)
+            if position is None:
+                position = positions[driver.pk] = Position(**params)
+                created.append(position)
+            else:
+                if not position._state.adding and position.position != params['position']:
+                    moved.append(position.pk)
+                for key, value in params.items():
+                    setattr(position, key, value)
+                # A driver listed twice in one response is still written once
+                if not position._state.adding:
+                    updated[position.pk] = position
+        
+        # Places are unique per race: vacate the ones changing hands before
+        # writing them, or a swap would conflict halfway through
+        if moved:
+            Position.objects.filter(pk__in=moved).update(position=None)
+        created_count, updated_count = save_in_bulk(Position, created, updated.values(), POSITION_FIELDS)
+        self.result['positions_created'] += created_count
+        self.result['positions_updated'] += updated_count
+        logger.info(f"Positions for race {race.name}: {created_count} created, {updated_count} updated")
     
-    def _find_driver(self, position_data: Dict[str, Any]) -> Member:
+    def _driver_index(self, positions_data: List[Dict[str, Any]]) -> RecordIndex:
+        """Load the stored members matching any driver of a race's rankings, in one query"""
+        return RecordIndex(Member.objects.all(), ['apisports_id', 'name', 'driver_number', 'name_acronym'], [
+            {
+                'apisports_id': driver_data.get('id'),
+                'name': driver_data.get('name'),
+                'driver_number': driver_data.get('number'),
+                'name_acronym': driver_data.get('abbr'),
+            }
+            for driver_data in (position_data.get('driver', {}) for position_data in positions_data)
+        ])
+    
+    def _find_driver(self, position_data: Dict[str, Any], index: RecordIndex = None) -> Member:
         """Find an existing driver from position data"""
         
         driver_data = position_data.get('driver', {})
-        
-        driver_id = driver_data.get('id')
-        driver_name = driver_data.get('name', '')
-        driver_abbr = driver_data.get('abbr', '')
-        driver_number = driver_data.get('number')
-        
-        driver = Member.objects.filter(
-            Q(apisports_id=driver_id) |
-            Q(name=driver_name) |
-            Q(driver_number=driver_number) |
-            Q(name_acronym=driver_abbr)
-        ).first()
-
-        return driver
-    
-    def _find_position(self, race: Race, driver: Member) -> Position:
-        """Find a position from APISports F1 API"""
-        return Position.objects.filter(race=race, driver=driver).first()
-    
-    def _create_position(self, race: Race, driver: Member, position_data: Dict[str, Any]) -> Position:
-        """Create a position from APISports F1 API"""
-        return Position.objects.create(**self._position_params(race, driver, position_data))
-    
-    def _update_position(self, position: Position, race: Race, driver: Member, position_data: Dict[str, Any]) -> Position:
-        """Update a position from APISports F1 API"""
-        position_params = self._position_params(race, driver, position_data)
-        for key, value in position_params.items():
-            setattr(position, key, value)
-        position.save()
-        return position
+        index = index or self._driver_index([position_data])
+        
+        return index.find(
+            apisports_id=driver_data.get('id'),
+            name=driver_data.get('name'),
+            driver_number=driver_data.get('number'),
+            name_acronym=driver_data.get('abbr'),
+        )
     
     def _position_params(self, race: Race, driver: Member, position_data: Dict[str, Any]) -> Dict[str, Any]:
         """Get position parameters from API data"""
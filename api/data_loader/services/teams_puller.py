@@ -1,12 +1,21 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from data_loader.lib.apisports_client import APISportsClient
+from data_loader.lib.record_index import RecordIndex
+from formulated.lib.bulk import save_in_bulk
+from formulated.lib.response_cache import invalidate_api_cache
 import logging
 from teams.models import Team, TeamStatus
-from django.db.models import Q
-import time
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
+# Columns written by a sync, i.e. the keys of TeamsPuller._team_params
+TEAM_FIELDS = [
+    'apisports_id', 'name', 'description', 'logo_url', 'base', 'first_team_entry', 'world_championships',
+    'highest_race_finish', 'pole_positions', 'fastest_laps', 'president', 'director', 'technical_manager',
+    'chassis', 'engine', 'tyres', 'status',
+]
+
 class TeamsPuller:
     """Service for pulling and syncing team data from APISports F1 API"""
     
@@ -26,52 +35,50 @@ class TeamsPuller:
         Pull and sync teams from APISports F1 API
         """
         
-        time.sleep(10) # 10 seconds between requests
-        
         try:
             teams = self.client.get_teams()
             self.result['teams_fetched'] = len(teams)
 
-            for team in teams:
-                logger.info(f"Processing team: {team['name']} (ID: {team.get('id', 'Unknown')})")
-                self._process_team(team)
+            self._sync_teams(teams)
                 
         except Exception as e:
             logger.error(f"Error processing teams: {e}")
             self.result['errors'].append(str(e))
             return self.result
+        finally:
+            # Whatever was written before a failure is already visible
+            invalidate_api_cache('teams sync finished')
         
         self.result['success'] = True
         return self.result
     
-    def _process_team(self, team: Dict[str, Any]) -> None:
-        """Process a team from APISports F1 API"""
-        logger.info(f"Processing team: {team['name']} (ID: {team.get('id', 'Unknown')})")
+    def _sync_teams(self, teams: List[Dict[str, Any]]) -> None:
+        """Create or update every team of an API response, in bulk and in one transaction"""
+        index = self._team_index(teams)
+        created, updated = [], {}
         
-        existing_team = self._find_team(team)
-        
-        if existing_team:
-            logger.info(f"Team {team['name']} already exists (ID: {team.get('id', 'Unknown')}), updating...")
-            self._update_team(team, existing_team)
-            self.result['teams_updated'] += 1
-        else:
-            logger.info(f"Team {team['name']} does not exist (ID: {team.get('id', 'Unknown')}), creating...")
-            self._create_team(team)
-            self.result['teams_created'] += 1
+        for team in teams:
+            logger.info(f"Processing team: {team['name']} (ID: {team.get('id', 'Unknown')})")
+            params = self._team_params(team)
+            existing_team = self._find_team(team, index)
             
-        logger.info(f"Team {team['name']} processed successfully")
+            if existing_team is None:
+                existing_team = Team(**params)
+                index.add(existing_team)
+                created.append(existing_team)
+            else:
+                for key, value in params.items():
+                    setattr(existing_team, key, value)
+                # A team matched twice in one response is still written once
+                if not existing_team._state.adding:
+                    updated[existing_team.pk] = existing_team
         
-    def _create_team(self, team: Dict[str, Any]) -> None:
-        """Create a team from APISports F1 API"""
-        Team.objects.create(**self._team_params(team))
-        self.result['teams_created'] += 1
+        with transaction.atomic():
+            created_count, updated_count = save_in_bulk(Team, created, updated.values(), TEAM_FIELDS)
         
-    def _update_team(self, team: Dict[str, Any], existing_team: Team) -> None:
-        """Update a team from APISports F1 API"""
-        team_params = self._team_params(team)
-        for key, value in team_params.items():
-            setattr(existing_team, key, value)
-        existing_team.save()
+        self.result['teams_created'] += created_count
+        self.result['teams_updated'] += updated_count
+        logger.info(f"Teams synced: {created_count} created, {updated_count} updated")
         
     def _team_params(self, team: Dict[str, Any]) -> Dict[str, Any]:
         """Get team parameters from APISports F1 API"""
@@ -95,8 +102,13 @@ class TeamsPuller:
             'status': TeamStatus.ACTIVE,
         }
         
-    def _find_team(self, team: Dict[str, Any]) -> Team:
-        """Find a team from APISports F1 API"""
-        team_id = team.get('id')
-        team_name = team.get('name')
-        return Team.objects.filter(Q(apisports_id=team_id) | Q(name=team_name)).first()
\ No newline at end of file
+    def _team_index(self, teams: List[Dict[str, Any]]) -> RecordIndex:
+        """Load the stored teams matching any team of an API response, in one query"""
+        return RecordIndex(Team.objects.all(), ['apisports_id', 'name'], [
+            {'apisports_id': team.get('id'), 'name': team.get('name')} for team in teams
+        ])
+        
+    def _find_team(self, team: Dict[str, Any], index: RecordIndex = None) -> Team:
+        """Find a team from APISports F1 API by id or name"""
+        index = index or self._team_index([team])
+        return index.find(apisports_id=team.get('id'), name=team.get('name'))
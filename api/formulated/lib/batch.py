@@ -0,0 +1,88 @@
+"""
+Batch lookups: many records by id in one request.
+
+``GET /api/races/batch/?ids=a,b,c`` or ``POST /api/races/batch/`` with
+``{"ids": [...]}`` (for lists too long for a URL) returns every requested
+record from a single prefetched queryset, serialized like the detail view.
+"""
+
+from functools import partial
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from formulated.lib.expandable import parse_field_paths
+
+
+class BatchIdsMixin:
+    """Reads a list of primary keys from ``?ids=a,b,c`` or a POSTed ``{"ids": [...]}``"""
+    batch_max_size = 100
+    batch_ids_param = 'ids'
+
+    def get_batch_ids(self):
+        """Return the requested primary keys, validated and deduplicated in order"""
+        if self.request.method == 'POST':
+            ids = self.request.data.get(self.batch_ids_param) if isinstance(self.request.data, dict) else self.request.data
+            if not isinstance(ids, list):
+                raise ValidationError({self.batch_ids_param: 'Expected a list of ids'})
+        else:
+            value = self.request.query_params.get(self.batch_ids_param, '')
+            ids = [item.strip() for item in value.split(',') if item.strip()]
+
+        if not ids:
+            raise ValidationError({self.batch_ids_param: 'At least one id is required'})
+        if len(ids) > self.batch_max_size:
+            raise ValidationError({self.batch_ids_param: f'At most {self.batch_max_size} ids per batch'})
+
+        pk_field = self.queryset.model._meta.pk
+        try:
+            ids = [pk_field.to_python(item) for item in ids]
+        except DjangoValidationError:
+            raise ValidationError({self.batch_ids_param: 'Invalid id'})
+        return list(dict.fromkeys(ids))
+
+
+class BatchLookupMixin(BatchIdsMixin):
+    """
+    Adds ``/batch`` to a viewset, returning ``{"results": [...], "missing": [...]}``
+
+    Results come back in the order the ids were given, through the viewset's
+    own get_queryset/filter_queryset, and expand ``detail_expand`` unless
+    ``?expand=`` says otherwise. At most ``batch_max_size`` ids are accepted.
+    GET batches are conditional and cached like list and retrieve.
+    """
+
+    def get_expand(self):
+        # A batch stands in for a series of detail requests
+        if getattr(self, 'action', None) == 'batch' and not hasattr(self, '_expand') \
+                and 'expand' not in self.request.query_params:
+            self._expand = parse_field_paths(','.join(self.detail_expand))
+        return super().get_expand()
+
+    # A POSTed batch is still a read, so it is open to anyone who can list
+    @action(detail=False, methods=['get', 'post'], permission_classes=[permissions.AllowAny])
+    def batch(self, request, *args, **kwargs):
+        ids = self.get_batch_ids()
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+
+        if request.method != 'GET':
+            return self._batch_response(queryset, ids, request)
+
+        handler = partial(self._batch_response, queryset, ids)
+        if hasattr(self, 'cached_response'):
+            handler = partial(self.cached_response, handler)
+        if hasattr(self, 'conditional_response'):
+            return self.conditional_response(queryset, handler, request)
+        return handler(request)
+
+    def _batch_response(self, queryset, ids, request, *args, **kwargs):
+        records = {record.pk: record for record in queryset}
+        found = [records[pk] for pk in ids if pk in records]
+        serializer = self.get_serializer(found, many=True)
+        return Response({
+            'results': serializer.data,
+            'missing': [str(pk) for pk in ids if pk not in records],
+        })
@@ -0,0 +1,59 @@
+"""
+Bulk write helpers that report how many rows they actually wrote.
+
+``bulk_create(ignore_conflicts=True)`` relies on the database's unique
+constraints (``ON CONFLICT DO NOTHING`` on PostgreSQL, ``INSERT OR IGNORE`` on
+SQLite) but does not say which rows were skipped. ``insert_ignoring_conflicts``
+runs the same INSERT and returns the database's row count, so callers can
+tell a new row from a duplicate without reading before they write.
+
+``save_in_bulk`` writes a batch of new and changed instances in two
+statements (per batch size), keeping ``auto_now`` fields current.
+"""
+
+from django.db import connections, router
+from django.utils import timezone
+from django.db.models.constants import OnConflict
+from django.db.models.sql import InsertQuery
+
+
+def insert_ignoring_conflicts(objs, using=None):
+    """Insert unsaved instances of one model, skipping rows that conflict; return how many were inserted"""
+    objs = list(objs)
+    if not objs:
+        return 0
+
+    model = objs[0]._meta.concrete_model
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    fields = list(model._meta.concrete_fields)
+    batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+
+    inserted = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(objs), batch_size):
+            query = InsertQuery(model, on_conflict=OnConflict.IGNORE)
+            query.insert_values(fields, objs[start:start + batch_size])
+            for sql, params in query.get_compiler(using=using).as_sql():
+                cursor.execute(sql, params)
+                inserted += max(cursor.rowcount, 0)
+    return inserted
+
+
+def save_in_bulk(model, created, updated, fields):
+    """bulk_update ``fields`` of the changed instances and bulk_create the new ones; return the counts"""
+    created, updated = list(created), list(updated)
+
+    # bulk_update skips Field.pre_save, so auto_now fields are set here
+    auto_now = [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+    now = timezone.now()
+    for obj in updated:
+        for name in auto_now:
+            setattr(obj, name, now)
+
+    # Updates first, so that values they move away from are free for the new rows
+    if updated:
+        model.objects.bulk_update(updated, list(fields) + [name for name in auto_now if name not in fields])
+    if created:
+        model.objects.bulk_create(created)
+    return len(created), len(updated)
@@ -0,0 +1,115 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-only viewsets.
+
+Validators come from aggregates, never from the serialized payload: the row
+count and MAX(updated_at) of the filtered queryset, plus the same pair over
+every model rendered inside it (``conditional_dependencies``), so that nested
+changes and deletions also invalidate the response. They are computed once
+per URL and dataset generation (see response_cache) and kept in the cache,
+so most requests answer without touching the tables.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Value
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from formulated.lib.response_cache import get_generation
+
+
+class ConditionalGetMixin:
+    """
+    Answer list and retrieve requests with 304 when the client's copy is current
+
+    ``conditional_dependencies`` lists the other models whose rows appear in
+    the payload (nested serializers, joined columns). Other GET handlers can
+    be wrapped with ``conditional_response``.
+    """
+    conditional_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(queryset, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return self.conditional_response(queryset, super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self, queryset):
+        """Return (etag, last_modified) for the queryset, from the cache within a generation"""
+        # Payloads carry absolute links, so the host and scheme are part of the identity
+        request_key = '|'.join([
+            self.request.scheme,
+            self.request.get_host(),
+            self.request.path,
+            self.request.accepted_renderer.format or '',
+            '&'.join(f'{name}={value}' for name, value in sorted(self.request.query_params.lists())),
+        ])
+        digest = hashlib.md5(request_key.encode('utf-8')).hexdigest()
+        key = f'api:validators:{get_generation()}:{digest}'
+
+        validators = cache.get(key)
+        if validators is None:
+            validators = self._compute_validators(queryset, request_key)
+            cache.set(key, validators, timeout=settings.API_CACHE_TIMEOUT)
+        return validators
+
+    def _compute_validators(self, queryset, request_key):
+        stats = [self._queryset_stats(queryset)] + self._dependency_stats()
+
+        modified = [last_modified for _, last_modified in stats if last_modified is not None]
+        # HTTP dates have one second resolution
+        last_modified = int(max(modified).timestamp()) if modified else None
+
+        key = '|'.join([
+            request_key,
+            *(f'{count}:{changed.isoformat() if changed else ""}' for count, changed in stats),
+        ])
+        etag = '"%s"' % hashlib.md5(key.encode('utf-8')).hexdigest()
+        return etag, last_modified
+
+    @staticmethod
+    def _queryset_stats(queryset):
+        stats = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+        return stats['count'], stats['last_modified']
+
+    def _dependency_stats(self):
+        """Count and MAX(updated_at) of every dependency table, in one UNION query"""
+        if not self.conditional_dependencies:
+            return []
+
+        querysets = [
+            model.objects.order_by().annotate(table=Value(index)).values('table').annotate(
+                count=Count('pk'), last_modified=Max('updated_at')
+            )
+            for index, model in enumerate(self.conditional_dependencies)
+        ]
+        rows = {row['table']: row for row in querysets[0].union(*querysets[1:], all=True)}
+
+        # Empty tables produce no group, so they report as (0, None)
+        return [
+            (rows[index]['count'], rows[index]['last_modified']) if index in rows else (0, None)
+            for index in range(len(self.conditional_dependencies))
+        ]
+
+    def conditional_response(self, queryset, view_method, request, *args, **kwargs):
+        """Return 304 if the client's validators match, else call view_method and tag its response"""
+        etag, last_modified = self.get_validators(queryset)
+        self.validators = (etag, last_modified)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = view_method(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,113 @@
+"""
+Sparse fieldsets (?fields=) and opt-in nesting (?expand=) for API serializers.
+
+Both parameters take comma separated field names, with dots reaching into
+nested serializers, e.g. ``?expand=circuit,circuit.races&fields=id,name,circuit.name``.
+"""
+
+
+def parse_field_paths(value):
+    """
+    Parse a comma separated list of dotted field paths into a nested dict
+
+    "circuit,circuit.races,positions" -> {'circuit': {'races': {}}, 'positions': {}}
+    """
+    tree = {}
+    if not value:
+        return tree
+
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    Serializer mixin that keeps nested serializers out of the payload unless expanded.
+
+    Nested serializers are declared in ``Meta.expandable_fields`` as
+    ``{name: (serializer_class, kwargs)}``. Top-level serializers read the
+    parsed ``expand`` and ``fields`` trees from the serializer context; nested
+    serializers receive their own branch of both trees from their parent.
+    """
+
+    def __init__(self, *args, **kwargs):
+        expand = kwargs.pop('expand', None)
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if expand is None and fields is None:
+            expand = self._context.get('expand')
+            fields = self._context.get('fields')
+
+        self._expand = expand or {}
+        self._sparse_fields = fields or {}
+
+    def get_field_names(self, declared_fields, info):
+        # Nested serializers that are not expanded are never built
+        field_names = super().get_field_names(declared_fields, info)
+        expandable_fields = getattr(self.Meta, 'expandable_fields', {})
+        return [name for name in field_names if name not in expandable_fields or name in self._expand]
+
+    def get_fields(self):
+        # Expanded serializers are declared for this instance only, so they
+        # keep their place in Meta.fields and need not be model fields
+        declared_fields = dict(self._declared_fields)
+        expandable_fields = getattr(self.Meta, 'expandable_fields', {})
+
+        for name, (serializer_class, options) in expandable_fields.items():
+            if name not in self._expand:
+                continue
+
+            if issubclass(serializer_class, ExpandableFieldsMixin):
+                options = dict(
+                    options,
+                    expand=self._expand[name],
+                    fields=self._sparse_fields.get(name)
+                )
+            declared_fields[name] = serializer_class(**options)
+
+        self._declared_fields = declared_fields
+        fields = super().get_fields()
+
+        if self._sparse_fields:
+            for name in list(fields):
+                if name not in self._sparse_fields:
+                    fields.pop(name)
+
+        return fields
+
+
+class ExpandableViewSetMixin:
+    """
+    Viewset mixin that parses ?expand= and ?fields= and hands them to the serializer.
+
+    Nothing is expanded on list endpoints unless requested. Detail endpoints
+    expand ``detail_expand`` by default; an explicit ``?expand=`` replaces it.
+    """
+    detail_expand = ()
+
+    def get_expand(self):
+        """Return the parsed expansion tree for the current request"""
+        if not hasattr(self, '_expand'):
+            value = self.request.query_params.get('expand') if self.request else None
+            if value is None and getattr(self, 'detail', False):
+                value = ','.join(self.detail_expand)
+            self._expand = parse_field_paths(value)
+        return self._expand
+
+    def get_sparse_fields(self):
+        """Return the parsed sparse fieldset for the current request"""
+        if not hasattr(self, '_sparse_fields'):
+            value = self.request.query_params.get('fields') if self.request else None
+            self._sparse_fields = parse_field_paths(value)
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        context['fields'] = self.get_sparse_fields()
+        return context
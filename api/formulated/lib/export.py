@@ -0,0 +1,58 @@
+"""
+Streaming exports of flat rows (NDJSON or CSV) for read-only viewsets.
+
+Rows are read from ``.values()`` querysets with ``.iterator()``, which uses a
+server-side cursor on PostgreSQL, and written straight into a
+StreamingHttpResponse, so memory stays flat however many rows are exported.
+"""
+
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+
+from formulated.lib.renderers import NDJSONRenderer, CSVRenderer
+
+
+def values_columns(queryset):
+    """Return the column names of a .values() queryset, in row order"""
+    query = queryset.query
+    return [*query.extra_select, *query.values_select, *query.annotation_select]
+
+
+class StreamingExportMixin:
+    """
+    Adds ``/export`` to a viewset, e.g. ``/api/positions/export?format=csv&season=2024``
+
+    ``get_export_queryset`` must return a ``.values()`` queryset and should
+    apply the same filters as the list endpoint. The format is negotiated
+    like any other DRF response (``?format=``, the Accept header or an
+    ``.ndjson``/``.csv`` suffix) and defaults to NDJSON.
+    """
+    export_name = 'export'
+    export_chunk_size = 2000
+
+    def get_export_queryset(self):
+        raise NotImplementedError('get_export_queryset() must be implemented')
+
+    def get_export_filename(self, format):
+        parts = [self.export_name]
+        season = self.request.query_params.get('season') or self.request.query_params.get('year')
+        if season:
+            parts.append(season)
+        return f"{'-'.join(parts)}.{format}"
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        queryset = self.get_export_queryset()
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+
+        if isinstance(renderer, CSVRenderer):
+            content = renderer.stream(rows, columns=values_columns(queryset))
+            content_type = f'{renderer.media_type}; charset={renderer.charset}'
+        else:
+            content = renderer.stream(rows)
+            content_type = renderer.media_type
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.get_export_filename(renderer.format)}"'
+        return response
@@ -0,0 +1,66 @@
+"""
+Hyperlink fields that reverse each route once per request.
+
+DRF's hyperlink fields call reverse() and build_absolute_uri() for every
+object they render, which adds up to several resolver walks per row on list
+endpoints. These fields reverse a route once with a placeholder lookup
+value, keep the absolute URL around as a (prefix, suffix) template on the
+request, and build every other URL by concatenation. Values that reverse()
+would have to quote, and requests without a request object, take DRF's
+regular path, so the output is identical.
+"""
+
+import re
+
+from django.urls import NoReverseMatch
+from rest_framework import serializers
+
+PLACEHOLDER = 'urltemplatelookupvalue'
+
+# Lookup values that reverse() emits unchanged (UUIDs, integers, slugs)
+SAFE_LOOKUP_VALUE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def get_url_template(field, view_name, request, format):
+    """Return the cached (prefix, suffix) around the lookup value, or None"""
+    templates = getattr(request, '_url_templates', None)
+    if templates is None:
+        templates = request._url_templates = {}
+
+    key = (view_name, field.lookup_url_kwarg, format)
+    if key not in templates:
+        try:
+            url = field.reverse(
+                view_name, kwargs={field.lookup_url_kwarg: PLACEHOLDER}, request=request, format=format
+            )
+        except NoReverseMatch:
+            url = None
+        templates[key] = tuple(url.split(PLACEHOLDER)) if url and url.count(PLACEHOLDER) == 1 else None
+    return templates[key]
+
+
+class CachedUrlMixin:
+    """Build URLs from a per request template instead of reversing every object"""
+
+    def get_url(self, obj, view_name, request, format):
+        # Unsaved objects do not have a URL
+        if hasattr(obj, 'pk') and obj.pk in (None, ''):
+            return None
+
+        lookup_value = str(getattr(obj, self.lookup_field))
+        template = None
+        if request is not None and SAFE_LOOKUP_VALUE.match(lookup_value):
+            template = get_url_template(self, view_name, request, format)
+        if template is None:
+            return super().get_url(obj, view_name, request, format)
+
+        prefix, suffix = template
+        return prefix + lookup_value + suffix
+
+
+class CachedHyperlinkedRelatedField(CachedUrlMixin, serializers.HyperlinkedRelatedField):
+    pass
+
+
+class CachedHyperlinkedIdentityField(CachedUrlMixin, serializers.HyperlinkedIdentityField):
+    pass
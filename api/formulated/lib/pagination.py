@@ -0,0 +1,183 @@
+"""
+Keyset (cursor) pagination on a composite ordering.
+
+Unlike PageNumberPagination there is no OFFSET scan and no COUNT(*): each page
+is read with a WHERE clause that continues from the last row of the previous
+one, so deep pages cost the same as the first.
+"""
+
+import base64
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from uuid import UUID
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on ``ordering``, a tuple of field paths (``-`` for descending)
+
+    The ordering must be unique, so it should end with the primary key.
+    NULLs sort last in both directions. Rows from ``.values()`` querysets are
+    read by their field path with ``__`` flattened to ``_``
+    (``race__start_at`` -> ``race_start_at``).
+    """
+    ordering = ('id',)
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+        ordering = [self._parse_field(field) for field in self.ordering]
+
+        queryset = self.order_queryset(queryset, reverse)
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Moving backwards there is always a next page (the one we came from);
+        # moving forwards there is a previous page whenever a cursor was given
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.page = rows
+        return rows
+
+    def order_queryset(self, queryset, reverse=False):
+        """Apply the pagination ordering, flipped when walking backwards"""
+        return queryset.order_by(*[
+            self._order_expression(*self._parse_field(field), reverse) for field in self.ordering
+        ])
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position_of(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position_of(self.page[0]), reverse=True)
+
+    # Cursors
+
+    def decode_cursor(self, request):
+        """Return the (position, reverse) pair encoded in the request's cursor"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': [self._encode_value(value) for value in position]}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    @staticmethod
+    def _encode_value(value):
+        # Keep full precision: microseconds matter for keyset equality
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, UUID):
+            return str(value)
+        return value
+
+    # Keyset helpers
+
+    @staticmethod
+    def _parse_field(field):
+        return (field[1:], True) if field.startswith('-') else (field, False)
+
+    @staticmethod
+    def _order_expression(name, descending, reverse):
+        # Walking backwards flips the direction, which also moves NULLs first
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        if descending != reverse:
+            return F(name).desc(**nulls)
+        return F(name).asc(**nulls)
+
+    def _position_of(self, row):
+        position = []
+        for name, _ in (self._parse_field(field) for field in self.ordering):
+            if isinstance(row, dict):
+                value = row[name.replace('__', '_')]
+            else:
+                value = row
+                for attr in name.split('__'):
+                    value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    def _keyset_filter(self, ordering, position, reverse):
+        """
+        Build the WHERE clause for rows strictly after ``position``
+
+        (a, b, c) > (x, y, z) expands to
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z),
+        with "after" flipped for descending fields and NULLs kept last.
+        """
+        keyset = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(ordering, position):
+            keyset |= equal & self._after(name, value, descending != reverse, reverse)
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        return keyset
+
+    @staticmethod
+    def _after(name, value, descending, reverse):
+        """Rows strictly after ``value`` in a single column"""
+        lookup = 'lt' if descending else 'gt'
+        if reverse:
+            # Walking backwards: every value comes before a NULL, and no NULL
+            # comes before a value
+            if value is None:
+                return Q(**{f'{name}__isnull': False})
+            return Q(**{f'{name}__{lookup}': value})
+        if value is None:
+            return Q(pk__in=[])
+        return Q(**{f'{name}__{lookup}': value}) | Q(**{f'{name}__isnull': True})
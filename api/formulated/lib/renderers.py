@@ -0,0 +1,115 @@
+"""
+JSON renderer backed by orjson, when it is installed, plus the NDJSON and CSV
+renderers used by the streaming export endpoints.
+
+orjson serializes UUIDs and timezone aware datetimes in C instead of calling
+back into Python for every value. Anything it does not know natively
+(Decimals, lazy strings, querysets...) goes through DRF's own encoder, so
+the output matches JSONRenderer. Without orjson, or when an indented
+response is requested, it simply is JSONRenderer.
+"""
+
+import csv
+import itertools
+from datetime import date, datetime
+
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Match DRF's formatting: "Z" for UTC and stringified non-str keys
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in replacement for JSONRenderer that uses orjson when available"""
+
+    def __init__(self):
+        super().__init__()
+        self._encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self._encoder.default, option=ORJSON_OPTIONS)
+
+        # Same strict javascript subset as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """Newline delimited JSON, one object per row"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b''.join(self.stream(data))
+
+    def stream(self, rows, batch_size=500):
+        """Yield the rendered rows, a batch of lines at a time"""
+        lines = []
+        for row in rows:
+            lines.append(super().render(row) + b'\n')
+            if len(lines) >= batch_size:
+                yield b''.join(lines)
+                lines = []
+        if lines:
+            yield b''.join(lines)
+
+
+class _Echo:
+    """File-like object whose write() hands back what csv.writer wrote"""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV with a header row, for flat rows (dicts of scalars)"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return ''.join(self.stream(data)).encode(self.charset)
+
+    def stream(self, rows, columns=None, batch_size=500):
+        """Yield the header and rows as CSV text, a batch of lines at a time"""
+        writer = csv.writer(_Echo())
+        rows = iter(rows)
+        if columns is None:
+            first = next(rows, None)
+            if first is None:
+                return
+            columns = list(first)
+            rows = itertools.chain([first], rows)
+
+        lines = [writer.writerow(columns)]
+        for row in rows:
+            lines.append(writer.writerow([self._format_value(row[column]) for column in columns]))
+            if len(lines) >= batch_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+    @staticmethod
+    def _format_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
@@ -0,0 +1,209 @@
+"""
+Response cache for the read-only API viewsets.
+
+Cached payloads are keyed by scheme, host, path, normalized query params,
+renderer and (optionally) the user, under the current dataset generation.
+Bumping the generation when a puller finishes a sync or an admin edits a
+model makes every earlier entry unreachable, so nothing has to be deleted
+one by one.
+Saves and deletes of the models the API renders bump it too
+(``invalidate_api_cache_on_change``), wherever they come from.
+The counters live in the configured cache, so they are per process with the
+local-memory backend and shared with a shared backend.
+"""
+
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'api:generation'
+HITS_KEY = 'api:hits'
+MISSES_KEY = 'api:misses'
+
+
+def _incr(key):
+    """Increment a counter, creating it if it does not exist yet"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def get_generation():
+    """Return the current dataset generation"""
+    # Writes later in this transaction must not be answered from what it read
+    connection = transaction.get_connection()
+    connection.api_cache_read = connection.in_atomic_block
+    return _generation()
+
+
+def _generation():
+    # Seeded from the clock so that a generation lost to eviction or a
+    # restart never comes back with a number that is already in use
+    return cache.get_or_set(GENERATION_KEY, lambda: int(time.time() * 1000), timeout=None)
+
+
+def _bump_generation():
+    _generation()
+    return _incr(GENERATION_KEY)
+
+
+class _PendingInvalidation:
+    """The one invalidation a transaction runs once it commits"""
+
+    def __init__(self):
+        self.reasons = []
+        self.done = False
+
+    def add(self, reason):
+        if reason and reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def __call__(self):
+        self.done = True
+        generation = _bump_generation()
+        reasons = ', '.join(self.reasons)
+        logger.info(f"API cache invalidated (generation {generation}){f': {reasons}' if reasons else ''}")
+
+
+def invalidate_api_cache(reason=''):
+    """
+    Bump the dataset generation, dropping every cached API response
+
+    Inside a transaction the bump waits for the commit, so that responses
+    other workers cached in between are dropped too, and however many writes
+    the transaction makes it is bumped once. It is also bumped straight away
+    if the transaction has read the cache since its last write, so that it
+    does not read its own stale responses.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        pending = _PendingInvalidation()
+        pending.add(reason)
+        pending()
+        return
+
+    if getattr(connection, 'api_cache_read', False):
+        connection.api_cache_read = False
+        _bump_generation()
+
+    # Callbacks of rolled back savepoints are dropped from run_on_commit
+    pending = getattr(connection, 'api_cache_pending', None)
+    if pending is None or pending.done or not any(entry[1] is pending for entry in connection.run_on_commit):
+        pending = connection.api_cache_pending = _PendingInvalidation()
+        transaction.on_commit(pending)
+    pending.add(reason)
+
+
+def _invalidate_on_change(sender, **kwargs):
+    invalidate_api_cache(f'{sender._meta.label} changed')
+
+
+def invalidate_api_cache_on_change(*models):
+    """
+    Invalidate whenever a row of these models is saved or deleted
+
+    Bulk writes (bulk_create, bulk_update, update) send no signals; code
+    that uses them, like the pullers, invalidates when it is done.
+    """
+    for model in models:
+        post_save.connect(_invalidate_on_change, sender=model, dispatch_uid=f'api_cache_save_{model._meta.label}')
+        post_delete.connect(_invalidate_on_change, sender=model, dispatch_uid=f'api_cache_delete_{model._meta.label}')
+
+
+def get_cache_stats():
+    """Return the cache generation and hit/miss counters"""
+    stats = cache.get_many([GENERATION_KEY, HITS_KEY, MISSES_KEY])
+    return {
+        'generation': stats.get(GENERATION_KEY),
+        'hits': stats.get(HITS_KEY, 0),
+        'misses': stats.get(MISSES_KEY, 0),
+    }
+
+
+def reset_cache_stats():
+    """Reset the hit/miss counters"""
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedResponseMixin:
+    """
+    Serve list and retrieve responses from the cache when possible
+
+    Set ``cache_per_user`` when the payload depends on who is asking. Other
+    GET handlers can be wrapped with ``cached_response``. Behind
+    ConditionalGetMixin the response's ETag is part of the key too.
+    """
+    cache_per_user = False
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request):
+        # Payloads carry absolute links and cursors, so they belong to one host and scheme
+        parts = [
+            request.scheme,
+            request.get_host(),
+            request.path,
+            request.accepted_renderer.format or '',
+            '&'.join(
+                f'{name}={value}'
+                for name, values in sorted(request.query_params.lists())
+                for value in sorted(values)
+            ),
+        ]
+        validators = getattr(self, 'validators', None)
+        if validators:
+            parts.append(validators[0])
+        if self.cache_per_user:
+            parts.append(str(request.user.pk) if request.user.is_authenticated else 'anonymous')
+
+        digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+        return f'api:response:{get_generation()}:{digest}'
+
+    def cached_response(self, view_method, request, *args, **kwargs):
+        """Return the cached payload for this request, or call view_method and cache its payload"""
+        key = self.get_response_cache_key(request)
+
+        data = cache.get(key)
+        if data is not None:
+            _incr(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _incr(MISSES_KEY)
+        response = view_method(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=settings.API_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class InvalidateApiCacheAdminMixin:
+    """ModelAdmin mixin that invalidates the API cache whenever an admin writes"""
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_api_cache(f'{obj._meta.label} saved in admin')
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_api_cache(f'{obj._meta.label} deleted in admin')
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_api_cache(f'{queryset.model._meta.label} deleted in admin')
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from formulated.lib.response_cache import get_cache_stats, invalidate_api_cache, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show API response cache statistics, or invalidate the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--invalidate',
+            action='store_true',
+            help='Drop every cached API response'
+        )
+        parser.add_argument(
+            '--reset-stats',
+            action='store_true',
+            help='Reset the hit/miss counters'
+        )
+
+    def handle(self, *args, **options):
+        if options['invalidate']:
+            invalidate_api_cache('invalidated from the command line')
+            self.stdout.write(self.style.SUCCESS('API cache invalidated'))
+
+        if options['reset_stats']:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('API cache counters reset'))
+
+        stats = get_cache_stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = f'{stats["hits"] / lookups:.1%}' if lookups else 'n/a'
+
+        self.stdout.write('\n📊 API Cache:')
+        self.stdout.write(f'   Generation: {stats["generation"]}')
+        self.stdout.write(f'   Hits: {stats["hits"]}')
+        self.stdout.write(f'   Misses: {stats["misses"]}')
+        self.stdout.write(f'   Hit rate: {hit_rate}')
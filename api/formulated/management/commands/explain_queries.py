@@ -0,0 +1,111 @@
+import re
+import uuid
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from interactions.models import Like, Review
+from races.models import Race, Position, RaceStatus
+from races.views import PositionViewSet
+from teams.models import Team, Member
+
+
+def list_page_queryset(viewset_class, **params):
+    """The first page a viewset's list action reads for the given query params"""
+    request = Request(RequestFactory().get('/', params))
+    view = viewset_class(request=request, action='list', format_kwarg=None, args=(), kwargs={})
+    queryset = view.filter_queryset(view.get_queryset())
+    return view.paginator.order_queryset(queryset)[:view.paginator.page_size + 1]
+
+
+def hot_queries():
+    """The querysets behind the busiest endpoints and sync steps, as (name, queryset)"""
+    user = User.objects.order_by('pk').first()
+    user_id = user.pk if user else 0
+    record_type = ContentType.objects.get_for_model(Team)
+    record_id = Team.objects.values_list('pk', flat=True).first() or uuid.uuid4()
+    race_id = Race.objects.values_list('pk', flat=True).first() or uuid.uuid4()
+    driver_id = Member.objects.values_list('pk', flat=True).first() or uuid.uuid4()
+    season = Race.objects.values_list('season', flat=True).first() or 2024
+    record = {'record_type': record_type, 'record_id': record_id}
+
+    return [
+        ('LikeService: user like on a record', Like.objects.filter(user_id=user_id, **record)),
+        ('LikeService: likes on a record', Like.objects.filter(**record).order_by('-created_at')[:50]),
+        ('ReviewService: user review on a record', Review.objects.filter(user_id=user_id, **record)),
+        ('ReviewService: reviews page', Review.objects.filter(**record).order_by('-created_at', 'id')[:51]),
+        ('RacesPuller: race positions', Position.objects.filter(race_id=race_id)),
+        ('Positions: by driver', list_page_queryset(PositionViewSet, driver_id=driver_id)),
+        ('Positions: winners', list_page_queryset(PositionViewSet, position=1)),
+        ('Positions: by season', list_page_queryset(PositionViewSet, season=season)),
+        ('Races: season page', Race.objects.filter(season=season, status=RaceStatus.COMPLETED).order_by('start_at')[:50]),
+        ('Races: upcoming', Race.objects.filter(status=RaceStatus.SCHEDULED).order_by('start_at')[:50]),
+    ]
+
+
+def sequential_scans(plan, vendor):
+    """Return the tables a query plan reads with a full sequential scan"""
+    if vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    if vendor == 'sqlite':
+        # "SCAN t USING [COVERING] INDEX ..." walks an index, a bare "SCAN t" the table
+        return re.findall(r'\bSCAN (\w+)\b(?! USING)', plan)
+    return []
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the hot queries and report sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the full plan of every query'
+        )
+        parser.add_argument(
+            '--no-seqscan',
+            action='store_true',
+            help='PostgreSQL only: disable sequential scans, so that any left have no usable index'
+        )
+        parser.add_argument(
+            '--fail-on-seqscan',
+            action='store_true',
+            help='Exit with an error if any query does a sequential scan'
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('postgresql', 'sqlite'):
+            self.stdout.write(self.style.WARNING(f'Sequential scans are not detected on {vendor}; printing plans only'))
+            options['verbose_plans'] = True
+
+        # Small tables are cheaper to scan than to index, so on PostgreSQL the
+        # planner has to be told not to before its plans mean anything
+        with transaction.atomic():
+            if options['no_seqscan'] and vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            queries = hot_queries()
+            flagged = []
+            for name, queryset in queries:
+                plan = queryset.explain()
+                scans = sequential_scans(plan, vendor)
+
+                if scans:
+                    flagged.append(name)
+                    self.stdout.write(self.style.ERROR(f'❌ {name}: sequential scan on {", ".join(scans)}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'✅ {name}'))
+
+                if options['verbose_plans'] or scans:
+                    for line in plan.splitlines():
+                        self.stdout.write(f'   {line}')
+
+        self.stdout.write(f'\n📊 {len(flagged)} of {len(queries)} queries do sequential scans')
+        if flagged and options['fail_on_seqscan']:
+            raise CommandError(f'Sequential scans in: {", ".join(flagged)}')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from interactions.services.likes.like_buffer import get_like_buffer
+
+
+class Command(BaseCommand):
+    help = 'Write the likes waiting in the write-behind buffer, including those left by stopped workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Also take journals that still look active (only while the API workers are stopped)'
+        )
+
+    def handle(self, *args, **options):
+        # Runs even with buffering turned off, to drain journals left from when it was on
+        buffer = get_like_buffer(force=True)
+        self.stdout.write(f'🔄 Flushing like buffer in {buffer.directory}...')
+        result = buffer.flush(include_active=options['all'])
+
+        self.stdout.write(self.style.SUCCESS('✅ Like buffer flushed'))
+        self.stdout.write(f'   Journals: {result["journals"]}')
+        self.stdout.write(f'   Events: {result["events"]}')
+        self.stdout.write(f'   Likes written: {result["liked"]}')
+        self.stdout.write(f'   Likes removed: {result["unliked"]}')
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from datetime import datetime
+from data_loader.lib.http_cache import get_http_cache
 from data_loader.services.races_puller import RacesPuller
 
 
@@ -19,10 +20,24 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be done without making changes'
         )
+        parser.add_argument(
+            '--offline',
+            action='store_true',
+            help='Use only cached API responses, making no requests'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Requests to keep in flight at once, within the rate limit (default: DATA_LOADER_CONCURRENCY)'
+        )
 
     def handle(self, *args, **options):
         season = options['season'] or datetime.now().year
         dry_run = options['dry_run']
+        http_cache = get_http_cache()
+        if options['offline']:
+            http_cache.offline = True
         
         self.stdout.write(
             self.style.SUCCESS(f'Starting to pull races data for {season} season...')
@@ -36,11 +51,12 @@ class Command(BaseCommand):
         try:
             if not dry_run:
                 with transaction.atomic():
-                    result = self._pull_races(season)
+                    result = self._pull_races(season, options['concurrency'])
             else:
                 result = self._pull_races_dry_run(season)
                 
             self._display_results(result, season)
+            self.stdout.write(f'\n💾 API cache: {http_cache.stats()}')
             
         except Exception as e:
             self.stdout.write(
@@ -48,9 +64,9 @@ class Command(BaseCommand):
             )
             raise
 
-    def _pull_races(self, season):
+    def _pull_races(self, season, concurrency=None):
         """Pull races data and sync with database"""
-        puller = RacesPuller()
+        puller = RacesPuller(concurrency)
         
         # Get initial stats
         initial_stats = puller.get_sync_stats()
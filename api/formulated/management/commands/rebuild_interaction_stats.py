@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from interactions.services.stats.stats_service import InteractionStatsService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized like/review stats from the Like and Review tables'
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔧 Rebuilding interaction stats...')
+        result = InteractionStatsService.rebuild()
+
+        self.stdout.write(self.style.SUCCESS('✅ Interaction stats rebuilt'))
+        self.stdout.write(f'   Records with stats: {result["records"]}')
+        self.stdout.write(f'   Rows replaced: {result["replaced"]}')
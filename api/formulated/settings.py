@@ -95,6 +95,64 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) in production
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default='formulated'),
+    }
+}
+
+if CACHE_BACKEND.endswith('LocMemCache'):
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int),
+    }
+
+# Seconds a cached API response lives before it is rebuilt, even without a sync
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Write-behind buffer for likes (interactions/services/likes/like_buffer.py):
+# likes are acknowledged once journaled to LIKE_BUFFER_DIR and written in
+# batches every LIKE_BUFFER_FLUSH_INTERVAL seconds or LIKE_BUFFER_MAX_SIZE events
+LIKE_BUFFER_ENABLED = config('LIKE_BUFFER_ENABLED', default=False, cast=bool)
+LIKE_BUFFER_DIR = config('LIKE_BUFFER_DIR', default=str(BASE_DIR / 'var' / 'like_buffer'))
+LIKE_BUFFER_FLUSH_INTERVAL = config('LIKE_BUFFER_FLUSH_INTERVAL', default=1.0, cast=float)
+LIKE_BUFFER_MAX_SIZE = config('LIKE_BUFFER_MAX_SIZE', default=500, cast=int)
+
+# Token buckets for the data loader's API clients, per upstream host
+# (data_loader/lib/rate_limiter.py): `rate` requests per second on average,
+# bursts of `burst`, and an error instead of waiting longer than `max_wait`
+# seconds. Response headers tighten these when the upstream asks
+DATA_LOADER_RATE_LIMITS = {
+    'default': {'rate': 1.0, 'burst': 1, 'max_wait': 300.0},
+    'api-formula-1.p.rapidapi.com': {
+        'rate': config('APISPORTS_REQUESTS_PER_MINUTE', default=10, cast=float) / 60,
+        'burst': config('APISPORTS_BURST', default=5, cast=int),
+    },
+    'api.openf1.org': {'rate': 0.5, 'burst': 3},
+}
+
+# On-disk cache of upstream responses (data_loader/lib/http_cache.py): fresh
+# for `ttl` seconds, then revalidated; completed seasons are kept for good.
+# With DATA_LOADER_OFFLINE the pullers read only from the cache
+DATA_LOADER_HTTP_CACHE = {
+    'enabled': config('DATA_LOADER_CACHE_ENABLED', default=True, cast=bool),
+    'directory': config('DATA_LOADER_CACHE_DIR', default=str(BASE_DIR / 'var' / 'http_cache')),
+    'ttl': config('DATA_LOADER_CACHE_TTL', default=3600, cast=int),
+    'offline': config('DATA_LOADER_OFFLINE', default=False, cast=bool),
+}
+
+# Requests the pullers keep in flight at once (data_loader/lib/async_client.py),
+# still paced by DATA_LOADER_RATE_LIMITS
+DATA_LOADER_CONCURRENCY = config('DATA_LOADER_CONCURRENCY', default=4, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -141,6 +199,11 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST framework
 
 REST_FRAMEWORK = {
+    # FastJSONRenderer uses orjson when installed and falls back to the stdlib
+    'DEFAULT_RENDERER_CLASSES': [
+        'formulated.lib.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.TokenAuthentication',
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Review, Like
+from .models import Review, Like, InteractionStats
 
 
 @admin.register(Review)
@@ -56,3 +56,23 @@ class LikeAdmin(admin.ModelAdmin):
         """Display the record object in admin list"""
         return str(obj.record) if obj.record else 'N/A'
     record_object.short_description = 'Record'
+
+
+
+@admin.register(InteractionStats)
+class InteractionStatsAdmin(admin.ModelAdmin):
+    """Admin configuration for InteractionStats model, read only"""
+    list_display = ['record_type', 'record_object', 'like_count', 'review_count', 'average_rating', 'updated_at']
+    list_filter = ['record_type']
+    ordering = ['-updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def record_object(self, obj):
+        """Display the record object in admin list"""
+        return str(obj.record) if obj.record else 'N/A'
+    record_object.short_description = 'Record'
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.21 on 2026-10-17 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['record_type', 'record_id', '-created_at'], name='like_record_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['record_type', 'record_id', '-created_at', 'id'], name='review_record_created_idx'),
+        ),
+    ]
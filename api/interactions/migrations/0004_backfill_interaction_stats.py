@@ -0,0 +1,28 @@
+# Generated by Django 4.2.21 on 2026-10-17 23:30
+
+from django.db import migrations
+
+
+def backfill_stats(apps, schema_editor):
+    """Count the likes and reviews written before InteractionStats existed"""
+    from interactions.services.stats.stats_service import InteractionStatsService
+
+    InteractionStats = apps.get_model('interactions', 'InteractionStats')
+    rows = InteractionStatsService.aggregate(
+        apps.get_model('interactions', 'Like'),
+        apps.get_model('interactions', 'Review'),
+        InteractionStats
+    )
+    InteractionStats.objects.all().delete()
+    InteractionStats.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0003_interaction_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -30,6 +30,10 @@ class Review(models.Model):
         # Ensure a user can only review the same object once
         unique_together = ['user', 'record_type', 'record_id']
         ordering = ['-created_at']
+        indexes = [
+            # A record's reviews, newest first (ReviewPagination ordering)
+            models.Index(fields=['record_type', 'record_id', '-created_at', 'id'], name='review_record_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.rating}★ on {self.record}"
@@ -54,6 +58,60 @@ class Like(models.Model):
         # Ensure a user can only like the same object once
         unique_together = ['user', 'record_type', 'record_id']
         ordering = ['-created_at']
+        indexes = [
+            # A record's likes, newest first
+            models.Index(fields=['record_type', 'record_id', '-created_at'], name='like_record_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} likes {self.record}"
+
+
+class InteractionStats(models.Model):
+    """
+    Denormalized like and review counters for a record
+    Kept in step by LikeService and ReviewService in the same transaction as
+    the write; rebuild_interaction_stats recomputes it from the source tables
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Polymorphic relationship fields
+    record_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    record_id = models.UUIDField()
+    record = GenericForeignKey('record_type', 'record_id')
+
+    like_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    # Rating histogram, one column per star so it can be updated with F()
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    RATINGS = range(1, 6)
+
+    class Meta:
+        unique_together = ['record_type', 'record_id']
+        verbose_name_plural = 'interaction stats'
+
+    @staticmethod
+    def rating_field(rating):
+        return f'rating_{rating}_count'
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        return {rating: getattr(self, self.rating_field(rating)) for rating in self.RATINGS}
+
+    def __str__(self):
+        return f"{self.like_count} likes, {self.review_count} reviews on {self.record_type.model} {self.record_id}"
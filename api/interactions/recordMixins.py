@@ -1,16 +1,64 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from interactions.models import Like
 from interactions.serializers import LikeSerializer, LikeCreateSerializer, ReviewSerializer, ReviewCreateUpdateSerializer
 from interactions.services.likes.like_service import LikeService
 from interactions.services.reviews.review_service import ReviewService
+from formulated.lib.batch import BatchIdsMixin
+from formulated.lib.pagination import KeysetPagination
 
-class RecordMixin:
+
+class ReviewPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+
+
+class RecordMixin(BatchIdsMixin):
     """
     Mixin to add likes and reviews to a record
     """
 
+    def get_record(self):
+        """
+        The record the interaction actions act on
+
+        Only its id is read: the viewset's own queryset annotates and
+        prefetches for the detail response, which likes and reviews never need.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.queryset.model.objects.only('pk')
+        record = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, record)
+        return record
+
+    @action(detail=False, methods=['get', 'post'], url_path='interactions', url_name='interactions')
+    def interactions(self, request):
+        """
+        Which records the current user has liked and reviewed
+
+        Answers for ``?ids=a,b,c`` (or a POSTed ``{"ids": [...]}``), or else
+        for the page the list endpoint returns with the same query params.
+        """
+        if not request.user.is_authenticated:
+            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        # Ids are parsed and validated like a /batch request
+        if request.method == 'POST' or self.batch_ids_param in request.query_params:
+            ids = self.get_batch_ids()
+        else:
+            queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+            page = self.paginate_queryset(queryset)
+            ids = [record.pk for record in (queryset if page is None else page)]
+
+        model = self.get_queryset().model
+        liked = LikeService.get_liked_ids(request.user, model, ids)['ids']
+        reviewed = ReviewService.get_reviewed_ids(request.user, model, ids)['ids']
+        return Response({
+            'liked': [str(pk) for pk in ids if pk in liked],
+            'reviewed': [str(pk) for pk in ids if pk in reviewed],
+        })
+
     @action(detail=True, methods=['get', 'post', 'delete'], url_path='likes', url_name='likes', serializer_class=LikeCreateSerializer)
     def likes(self, request, pk=None):
         """
@@ -18,7 +66,7 @@ class RecordMixin:
         POST: Like this object
         DELETE: Unlike this object
         """
-        object = self.get_object()
+        object = self.get_record()
         
         if request.method == 'GET':
             result = LikeService.check_like(request.user, object)
@@ -30,7 +78,9 @@ class RecordMixin:
         elif request.method == 'POST':
             result = LikeService.create_like(request.user, object)
             if result['success']:
-                return Response(result['like'], status=status.HTTP_201_CREATED)
+                # Buffered likes are accepted now and saved with the next flush
+                code = status.HTTP_202_ACCEPTED if result.get('queued') else status.HTTP_201_CREATED
+                return Response(result['like'], status=code)
             else:
                 return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -51,16 +101,26 @@ class RecordMixin:
     @action(detail=True, methods=['get', 'post', 'put', 'delete'], url_path='reviews', url_name='reviews', serializer_class=ReviewCreateUpdateSerializer)
     def reviews(self, request, pk=None):
         """
-        GET: Get all reviews for this object
+        GET: Get reviews for this object, cursor paginated newest first, with
+             their summary (count, mean, histogram) and the current user's review
         POST: Create a review for this object
         PUT: Update current user's review for this object
         DELETE: Delete current user's review for this object
         """
-        object = self.get_object()
+        object = self.get_record()
         
         if request.method == 'GET':
-            result = ReviewService.get_reviews_for_object(object)
-            return Response(result['reviews'], status=status.HTTP_200_OK)
+            reviews = ReviewService.get_reviews_queryset(object)
+            paginator = ReviewPagination()
+            page = paginator.paginate_queryset(reviews, request, view=self)
+            serializer = ReviewSerializer(page, many=True)
+            response = paginator.get_paginated_response(serializer.data)
+
+            # Read from the denormalized stats, so the cost does not grow with the reviews
+            response.data['summary'] = ReviewService.get_review_summary(object, has_reviews=bool(page))['summary']
+            my_review = ReviewService.get_user_review(request.user, object)
+            response.data['my_review'] = my_review['review'] if my_review['success'] else None
+            return response
         
         elif request.method == 'POST':
             result = ReviewService.create_review(request.user, object, request.data)
@@ -0,0 +1,128 @@
+from importlib import import_module
+from io import StringIO
+from unittest.mock import patch
+from django.apps import apps
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+
+from interactions.models import InteractionStats, Like, Review
+from interactions.services.likes.like_service import LikeService
+from interactions.services.reviews.review_service import ReviewService
+from interactions.services.stats.stats_service import InteractionStatsService
+from teams.models import Team, TeamStatus
+
+
+class InteractionStatsServiceTest(TestCase):
+    """Test cases for InteractionStatsService and its wiring into the like/review services"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='testpass123') for i in range(3)
+        ]
+        self.team = Team.objects.create(name='Test Team', status=TeamStatus.ACTIVE)
+        self.other_team = Team.objects.create(name='Other Team', status=TeamStatus.ACTIVE)
+        self.content_type = ContentType.objects.get_for_model(Team)
+
+    def get_stats(self, team=None):
+        return InteractionStatsService.get_stats(team or self.team)['stats']
+
+    def test_get_stats_without_interactions(self):
+        """Test a record nobody interacted with reports zeros"""
+        stats = self.get_stats()
+
+        self.assertEqual(stats['like_count'], 0)
+        self.assertEqual(stats['review_count'], 0)
+        self.assertIsNone(stats['average_rating'])
+        self.assertEqual(stats['rating_histogram'], {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+
+    def test_like_and_unlike_update_stats(self):
+        """Test create_like and remove_like keep like_count in step"""
+        for user in self.users:
+            LikeService.create_like(user, self.team)
+        self.assertEqual(self.get_stats()['like_count'], 3)
+
+        LikeService.remove_like(self.users[0], self.team)
+        self.assertEqual(self.get_stats()['like_count'], 2)
+        self.assertEqual(self.get_stats(self.other_team)['like_count'], 0)
+
+    def test_failed_like_does_not_count(self):
+        """Test duplicate and missing likes leave the stats alone"""
+        LikeService.create_like(self.users[0], self.team)
+        LikeService.create_like(self.users[0], self.team)
+        LikeService.remove_like(self.users[1], self.team)
+
+        self.assertEqual(self.get_stats()['like_count'], 1)
+
+    def test_review_writes_update_stats(self):
+        """Test creating, updating and deleting reviews keeps counts, sum and histogram in step"""
+        ReviewService.create_review(self.users[0], self.team, {'rating': 5, 'description': 'Review'})
+        ReviewService.create_review(self.users[1], self.team, {'rating': 3, 'description': 'Review'})
+        ReviewService.update_review(self.users[1], self.team, {'rating': 4, 'description': 'Review'})
+
+        stats = self.get_stats()
+        self.assertEqual(stats['review_count'], 2)
+        self.assertEqual(stats['average_rating'], 4.5)
+        self.assertEqual(stats['rating_histogram'], {1: 0, 2: 0, 3: 0, 4: 1, 5: 1})
+
+        ReviewService.delete_review(self.users[0], self.team)
+
+        stats = self.get_stats()
+        self.assertEqual(stats['review_count'], 1)
+        self.assertEqual(stats['average_rating'], 4.0)
+        self.assertEqual(stats['rating_histogram'], {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
+
+    @patch('interactions.services.stats.stats_service.InteractionStatsService.record_like')
+    def test_stats_failure_rolls_back_like(self, mock_record_like):
+        """Test the like is not saved when its stats cannot be updated"""
+        mock_record_like.side_effect = Exception('Database error')
+
+        result = LikeService.create_like(self.users[0], self.team)
+
+        self.assertFalse(result['success'])
+        self.assertFalse(Like.objects.exists())
+
+    def test_rebuild_matches_source_tables(self):
+        """Test rebuild recomputes drifted stats from likes and reviews"""
+        LikeService.create_like(self.users[0], self.team)
+        ReviewService.create_review(self.users[0], self.team, {'rating': 2, 'description': 'Review'})
+        # Writes that bypass the services leave the stats behind
+        Like.objects.create(user=self.users[1], record_type=self.content_type, record_id=self.other_team.id)
+        Review.objects.create(user=self.users[1], record_type=self.content_type, record_id=self.team.id, rating=5, description='Review')
+        InteractionStats.objects.filter(record_id=self.team.id).update(like_count=10)
+
+        result = InteractionStatsService.rebuild()
+
+        self.assertEqual(result['records'], 2)
+        stats = self.get_stats()
+        self.assertEqual(stats['like_count'], 1)
+        self.assertEqual(stats['review_count'], 2)
+        self.assertEqual(stats['average_rating'], 3.5)
+        self.assertEqual(stats['rating_histogram'], {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+        self.assertEqual(self.get_stats(self.other_team)['like_count'], 1)
+
+    def test_migration_backfills_existing_interactions(self):
+        """Test the stats migration counts likes and reviews written before the table existed"""
+        Like.objects.create(user=self.users[0], record_type=self.content_type, record_id=self.team.id)
+        Review.objects.create(user=self.users[1], record_type=self.content_type, record_id=self.team.id, rating=4, description='Review')
+        self.assertFalse(InteractionStats.objects.exists())
+
+        migration = import_module('interactions.migrations.0004_backfill_interaction_stats')
+        migration.backfill_stats(apps, None)
+
+        stats = self.get_stats()
+        self.assertEqual(stats['like_count'], 1)
+        self.assertEqual(stats['review_count'], 1)
+        self.assertEqual(stats['rating_histogram'][4], 1)
+
+    def test_rebuild_command(self):
+        """Test the rebuild_interaction_stats command repairs the table"""
+        Like.objects.create(user=self.users[0], record_type=self.content_type, record_id=self.team.id)
+
+        out = StringIO()
+        call_command('rebuild_interaction_stats', stdout=out)
+
+        self.assertIn('Records with stats: 1', out.getvalue())
+        self.assertEqual(self.get_stats()['like_count'], 1)
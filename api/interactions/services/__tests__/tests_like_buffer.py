@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+
+from interactions.models import InteractionStats, Like
+from interactions.services.likes.like_buffer import LikeBuffer, get_like_buffer, pending_key
+from interactions.services.likes.like_service import LikeService
+from teams.models import Team, TeamStatus
+
+
+class LikeBufferTest(TestCase):
+    """Test cases for the write-behind like buffer"""
+
+    def setUp(self):
+        """Set up test data and a buffer that only flushes when told to"""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings = override_settings(
+            LIKE_BUFFER_ENABLED=True,
+            LIKE_BUFFER_DIR=self.directory,
+            LIKE_BUFFER_FLUSH_INTERVAL=3600.0,
+            LIKE_BUFFER_MAX_SIZE=100
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+
+        self.users = [User.objects.create_user(username=f'fan{i}', password='testpass123') for i in range(3)]
+        self.team = Team.objects.create(name='Test Team', status=TeamStatus.ACTIVE)
+        self.buffer = get_like_buffer()
+
+    def like_count(self):
+        stats = InteractionStats.objects.filter(record_id=self.team.id).first()
+        return stats.like_count if stats else 0
+
+    def test_like_is_acknowledged_before_it_is_written(self):
+        """Test a like is visible to its user straight away and written on flush"""
+        result = LikeService.create_like(self.users[0], self.team)
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['queued'])
+        self.assertFalse(Like.objects.exists())
+        self.assertTrue(LikeService.check_like(self.users[0], self.team)['liked'])
+        self.assertFalse(LikeService.check_like(self.users[1], self.team)['liked'])
+        self.assertEqual(LikeService.get_liked_ids(self.users[0], Team, [self.team.id])['ids'], {self.team.id})
+
+        result = self.buffer.flush()
+
+        self.assertEqual(result['liked'], 1)
+        self.assertTrue(Like.objects.filter(user=self.users[0], record_id=self.team.id).exists())
+        self.assertEqual(self.like_count(), 1)
+        self.assertTrue(LikeService.check_like(self.users[0], self.team)['liked'])
+
+    def test_batch_is_written_per_record(self):
+        """Test a batch of likes and unlikes keeps the latest action per user"""
+        for user in self.users:
+            LikeService.create_like(user, self.team)
+        self.buffer.flush()
+
+        LikeService.remove_like(self.users[0], self.team)
+        LikeService.remove_like(self.users[1], self.team)
+        LikeService.create_like(self.users[1], self.team)
+
+        self.assertFalse(LikeService.check_like(self.users[0], self.team)['liked'])
+        self.assertTrue(LikeService.check_like(self.users[1], self.team)['liked'])
+
+        result = self.buffer.flush()
+
+        self.assertEqual(result['unliked'], 1)
+        self.assertEqual(
+            set(Like.objects.values_list('user__username', flat=True)), {'fan1', 'fan2'}
+        )
+        self.assertEqual(self.like_count(), 2)
+
+    def test_duplicate_like_is_rejected_while_queued(self):
+        """Test a queued like counts as a like for validation"""
+        LikeService.create_like(self.users[0], self.team)
+        result = LikeService.create_like(self.users[0], self.team)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'You have already liked this team')
+
+    def test_size_threshold_flushes(self):
+        """Test reaching LIKE_BUFFER_MAX_SIZE flushes without waiting for the interval"""
+        with override_settings(LIKE_BUFFER_MAX_SIZE=2):
+            LikeService.create_like(self.users[0], self.team)
+            self.assertFalse(Like.objects.exists())
+            LikeService.create_like(self.users[1], self.team)
+
+        self.assertEqual(Like.objects.count(), 2)
+
+    def test_journal_survives_a_restart(self):
+        """Test a worker that died before flushing leaves its likes to the next one"""
+        LikeService.create_like(self.users[0], self.team)
+        LikeService.create_like(self.users[1], self.team)
+        journal = next(path for path in os.listdir(self.directory) if path.endswith('.jsonl'))
+
+        # A fresh process has its own buffer; the old journal goes idle
+        idle = time.time() - 3600
+        os.utime(os.path.join(self.directory, journal), (idle, idle))
+        result = LikeBuffer(self.directory).flush()
+
+        self.assertEqual(result['journals'], 1)
+        self.assertEqual(Like.objects.count(), 2)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_replaying_a_batch_is_harmless(self):
+        """Test writing the same events twice leaves the likes and their count unchanged"""
+        content_type = ContentType.objects.get_for_model(Team)
+        events = [
+            {'user_id': user.pk, 'record_type_id': content_type.pk, 'record_id': str(self.team.id),
+             'action': 'like', 'at': time.time()}
+            for user in self.users
+        ]
+
+        LikeBuffer.apply(events)
+        result = LikeBuffer.apply(events)
+
+        self.assertEqual(result['liked'], 0)
+        self.assertEqual(Like.objects.count(), 3)
+        self.assertEqual(self.like_count(), 3)
+
+    def test_replayed_like_does_not_undo_a_later_unlike(self):
+        """Test a journal written again after a newer unlike leaves the like removed"""
+        content_type = ContentType.objects.get_for_model(Team)
+        event = {'user_id': self.users[0].pk, 'record_type_id': content_type.pk, 'record_id': str(self.team.id)}
+        like = {**event, 'action': 'like', 'at': time.time()}
+        unlike = {**event, 'action': 'unlike', 'at': like['at'] + 1}
+
+        LikeBuffer.apply([like])
+        LikeBuffer.apply([unlike])
+        result = LikeBuffer.apply([like])
+
+        self.assertEqual(result['liked'], 0)
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(self.like_count(), 0)
+
+    def test_failed_flush_is_retried(self):
+        """Test a failed flush hands its journals back, keeps the like visible and schedules a retry"""
+        LikeService.create_like(self.users[0], self.team)
+        content_type = ContentType.objects.get_for_model(Team)
+        # As if the like had been waiting longer than PENDING_TIMEOUT
+        cache.delete(pending_key(self.users[0].pk, content_type.pk, str(self.team.id)))
+
+        with patch.object(LikeBuffer, 'apply', side_effect=RuntimeError('database is down')), \
+                patch('interactions.services.likes.like_buffer.connection'), \
+                patch.object(self.buffer, 'flush_interval', 1.0), \
+                patch.object(self.buffer, '_schedule_flush') as schedule:
+            self.buffer._flush_in_background()
+            self.buffer._flush_in_background()
+
+        self.assertEqual([call.args[0] for call in schedule.call_args_list], [2.0, 4.0])
+        self.assertTrue(all(path.endswith('.ready') for path in os.listdir(self.directory)))
+        self.assertTrue(LikeService.check_like(self.users[0], self.team)['liked'])
+
+        self.buffer.flush()
+
+        self.assertEqual(Like.objects.count(), 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_flush_command(self):
+        """Test flush_like_buffer drains the journals"""
+        LikeService.create_like(self.users[0], self.team)
+
+        out = StringIO()
+        call_command('flush_like_buffer', '--all', stdout=out)
+
+        self.assertIn('Likes written: 1', out.getvalue())
+        self.assertEqual(Like.objects.count(), 1)
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import Mock, patch
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
 
@@ -97,7 +99,7 @@ class LikeServiceTest(TestCase):
         self.assertFalse(result['success'])
         self.assertEqual(result['error'], 'You have already liked this team')
         
-    @patch('interactions.services.likes.like_service.Like.objects.create')
+    @patch('interactions.services.likes.like_service.insert_ignoring_conflicts')
     def test_create_like_database_error(self, mock_create):
         """Test create_like when database error occurs"""
         mock_create.side_effect = Exception('Database error')
@@ -107,6 +109,30 @@ class LikeServiceTest(TestCase):
         self.assertFalse(result['success'])
         self.assertEqual(result['error'], 'Database error')
         
+    def test_create_like_is_a_single_insert(self):
+        """Test create_like writes without reading the like table first, and repeats are no-ops"""
+        with CaptureQueriesContext(connection) as queries:
+            LikeService.create_like(self.user, self.test_team)
+            result = LikeService.create_like(self.user, self.test_team)
+        
+        like_queries = [q['sql'] for q in queries.captured_queries if '"interactions_like"' in q['sql']]
+        self.assertEqual(len(like_queries), 2)
+        self.assertTrue(all(sql.startswith('INSERT') for sql in like_queries))
+        self.assertFalse(result['success'])
+        self.assertEqual(Like.objects.count(), 1)
+        
+    def test_remove_like_is_a_single_delete(self):
+        """Test remove_like deletes without reading the like first"""
+        LikeService.create_like(self.user, self.test_team)
+        
+        with CaptureQueriesContext(connection) as queries:
+            result = LikeService.remove_like(self.user, self.test_team)
+        
+        like_queries = [q['sql'] for q in queries.captured_queries if '"interactions_like"' in q['sql']]
+        self.assertEqual(len(like_queries), 1)
+        self.assertTrue(like_queries[0].startswith('DELETE'))
+        self.assertTrue(result['success'])
+        
     def test_remove_like_unauthenticated_user(self):
         """Test remove_like with unauthenticated user"""
         result = LikeService.remove_like(self.anonymous_user, self.test_team)
@@ -145,7 +171,7 @@ class LikeServiceTest(TestCase):
         self.assertFalse(result['success'])
         self.assertEqual(result['error'], 'Like not found')
         
-    @patch('interactions.services.likes.like_service.Like.objects.get')
+    @patch('interactions.services.likes.like_service.Like.objects.filter')
     def test_remove_like_database_error(self, mock_get):
         """Test remove_like when database error occurs"""
         mock_get.side_effect = Exception('Database error')
@@ -0,0 +1,322 @@
+"""
+Write-behind buffer for likes and unlikes, on when LIKE_BUFFER_ENABLED is set.
+
+During a live race thousands of likes land on a handful of records within
+seconds. With the buffer on, LikeService validates a like or unlike, queues
+it here and answers straight away. Queued events are written in batches every
+LIKE_BUFFER_FLUSH_INTERVAL seconds, or as soon as LIKE_BUFFER_MAX_SIZE are
+waiting. Each batch costs one INSERT (conflicts ignored) and one DELETE per
+record, all in one transaction.
+
+Durability: every event is appended and fsynced to a journal file in
+LIKE_BUFFER_DIR before it is acknowledged. A flush renames the journals it
+takes and deletes them only after its transaction commits. The journals of a
+worker that died are taken over by the next flush of any worker once they
+have been idle for a while, or by ``manage.py flush_like_buffer``.
+
+A journal can be written twice, e.g. when a worker dies between committing a
+flush and deleting its journals. Conflicting inserts and missing deletes are
+no-ops, and the stats move by the rows actually written, but a replayed like
+could still undo an unlike flushed in between. So each flush also records in
+the cache the time of the last event it wrote per user and record, and events
+older than that are skipped. The marks are kept for WATERMARK_TIMEOUT; a
+journal replayed after they expire (or after the cache is cleared) can still
+undo a later unlike.
+
+A flush that fails hands its journals straight back and is retried, backing
+off up to MAX_RETRY_DELAY, until one succeeds.
+
+Read-your-writes: until it is flushed, each event is also kept in the cache
+under its user and record, and LikeService reads it before the database.
+Failed flushes refresh those entries so they outlive PENDING_TIMEOUT while
+their events wait. Use a shared cache backend when running more than one
+worker.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from formulated.lib.bulk import insert_ignoring_conflicts
+from interactions.models import Like
+from interactions.services.stats.stats_service import InteractionStatsService
+
+logger = logging.getLogger(__name__)
+
+LIKE = 'like'
+UNLIKE = 'unlike'
+
+# Queued events stay visible to their user at most this long if flushes fail
+PENDING_TIMEOUT = 3600
+
+# Longest wait between retries of a failing flush
+MAX_RETRY_DELAY = 300.0
+
+# How long a flush remembers the last event it wrote per user and record
+WATERMARK_TIMEOUT = 7 * 24 * 3600
+
+
+def pending_key(user_id, record_type_id, record_id):
+    return f'likes:pending:{user_id}:{record_type_id}:{record_id}'
+
+
+def watermark_key(user_id, record_type_id, record_id):
+    return f'likes:written:{user_id}:{record_type_id}:{record_id}'
+
+
+class LikeBuffer:
+    """An on-disk journal of like/unlike events, flushed in batches"""
+
+    def __init__(self, directory, flush_interval=1.0, max_size=500):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        # A journal untouched for this long belongs to a worker that is gone
+        self.stale_after = max(60.0, 10 * flush_interval)
+        self._lock = threading.Lock()
+        self._journal = None
+        self._journal_path = None
+        self._size = 0
+        self._timer = None
+        self._failures = 0
+
+    def add(self, user_id, record_type_id, record_id, action):
+        """Queue a like or unlike; it is on disk when this returns"""
+        event = {
+            'user_id': user_id,
+            'record_type_id': record_type_id,
+            'record_id': str(record_id),
+            'action': action,
+            'at': time.time(),
+        }
+        with self._lock:
+            journal = self._open_journal()
+            journal.write(json.dumps(event) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+            self._size += 1
+            full = self._size >= self.max_size
+
+        cache.set(pending_key(user_id, record_type_id, record_id), action, PENDING_TIMEOUT)
+
+        if full:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def pending_actions(self, user_id, record_type_id, record_ids):
+        """Return {record_id: action} for the user's queued, unflushed events"""
+        keys = {pending_key(user_id, record_type_id, record_id): record_id for record_id in record_ids}
+        found = cache.get_many(list(keys))
+        return {keys[key]: action for key, action in found.items()}
+
+    def flush(self, include_active=False):
+        """
+        Write every queued event of this worker, and of workers that are gone
+
+        ``include_active`` also takes other workers' open journals, which is
+        only safe while no other worker is running.
+        """
+        with self._lock:
+            self._close_journal()
+
+        paths = self._claim_journals(include_active)
+        if not paths:
+            return {'success': True, 'events': 0, 'liked': 0, 'unliked': 0, 'journals': 0}
+
+        events = []
+        for path in paths:
+            with open(path) as journal:
+                # A worker killed mid-write can leave a truncated last line
+                events.extend(json.loads(line) for line in journal if line.endswith('\n'))
+
+        try:
+            result = self.apply(events)
+        except Exception:
+            # Hand the journals back for the retry rather than waiting for them to go stale
+            for path in paths:
+                try:
+                    os.replace(path, path.with_suffix('.ready'))
+                except FileNotFoundError:
+                    pass
+            self._refresh_pending(events)
+            raise
+
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return {**result, 'journals': len(paths)}
+
+    @staticmethod
+    def apply(events):
+        """Write a batch of events, the latest one per user and record winning"""
+        latest = {}
+        for event in sorted(events, key=lambda event: event['at']):
+            latest[(event['user_id'], event['record_type_id'], event['record_id'])] = event
+
+        # Events older than one already written are replays and must not undo it
+        watermarks = cache.get_many([watermark_key(*key) for key in latest])
+        latest = {
+            key: event for key, event in latest.items()
+            if event['at'] >= watermarks.get(watermark_key(*key), 0)
+        }
+
+        # Users deleted since they liked something would fail the whole batch
+        user_ids = set(User.objects.filter(pk__in={key[0] for key in latest}).values_list('pk', flat=True))
+
+        by_record = defaultdict(lambda: {LIKE: [], UNLIKE: []})
+        for (user_id, record_type_id, record_id), event in latest.items():
+            if user_id in user_ids:
+                by_record[(record_type_id, record_id)][event['action']].append(user_id)
+
+        liked = unliked = 0
+        with transaction.atomic():
+            for (record_type_id, record_id), users in by_record.items():
+                inserted = insert_ignoring_conflicts(
+                    Like(user_id=user_id, record_type_id=record_type_id, record_id=record_id)
+                    for user_id in users[LIKE]
+                )
+                deleted = 0
+                if users[UNLIKE]:
+                    deleted, _ = Like.objects.filter(
+                        record_type_id=record_type_id,
+                        record_id=record_id,
+                        user_id__in=users[UNLIKE]
+                    ).delete()
+
+                if inserted != deleted:
+                    content_type = ContentType.objects.get_for_id(record_type_id)
+                    InteractionStatsService.record_like(content_type, record_id, inserted - deleted)
+                liked += inserted
+                unliked += deleted
+
+        cache.set_many({watermark_key(*key): event['at'] for key, event in latest.items()}, WATERMARK_TIMEOUT)
+
+        # Forget the flushed events, unless the user has queued a newer one since
+        keys = {pending_key(*key): event['action'] for key, event in latest.items()}
+        current = cache.get_many(list(keys))
+        cache.delete_many([key for key, action in current.items() if keys[key] == action])
+
+        return {'success': True, 'events': len(events), 'liked': liked, 'unliked': unliked}
+
+    @staticmethod
+    def _refresh_pending(events):
+        """Keep unwritten events visible to their users, unless a newer one replaced them"""
+        latest = {}
+        for event in sorted(events, key=lambda event: event['at']):
+            latest[pending_key(event['user_id'], event['record_type_id'], event['record_id'])] = event['action']
+        current = cache.get_many(list(latest))
+        cache.set_many(
+            {key: action for key, action in latest.items() if current.get(key, action) == action},
+            PENDING_TIMEOUT
+        )
+
+    def _open_journal(self):
+        if self._journal is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._journal_path = self.directory / f'journal-{os.getpid()}-{uuid.uuid4().hex}.jsonl'
+            self._journal = open(self._journal_path, 'a')
+            self._size = 0
+        return self._journal
+
+    def _close_journal(self):
+        """Hand the open journal over to the next flush"""
+        if self._journal is None:
+            return
+        self._journal.close()
+        try:
+            os.replace(self._journal_path, self._journal_path.with_suffix('.ready'))
+        except FileNotFoundError:
+            # Already taken over by a flush_like_buffer --all
+            pass
+        self._journal = self._journal_path = None
+        self._size = 0
+
+    def _claim_journals(self, include_active):
+        """Rename the journals to flush so that no other worker flushes them too"""
+        if not self.directory.exists():
+            return []
+
+        now = time.time()
+        claimed = []
+        for path in sorted(self.directory.iterdir()):
+            if path.suffix == '.ready':
+                pass
+            elif path.suffix in ('.jsonl', '.flushing'):
+                # Open journals of live workers and flushes in progress are left alone
+                try:
+                    idle = now - path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if idle < self.stale_after and not (include_active and path.suffix == '.jsonl'):
+                    continue
+            else:
+                continue
+
+            target = self.directory / f'{path.stem.split(".")[0]}.{uuid.uuid4().hex[:8]}.flushing'
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                continue
+            os.utime(target)
+            claimed.append(target)
+        return claimed
+
+    def _schedule_flush(self, delay=None):
+        with self._lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._timer = threading.Timer(delay or self.flush_interval, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self):
+        # Events queued while this flush runs schedule the next one
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+            self._failures = 0
+        except Exception:
+            self._failures += 1
+            delay = min(self.flush_interval * 2 ** self._failures, MAX_RETRY_DELAY)
+            logger.exception(f'Like buffer flush failed; the journals are kept and retried in {delay:.0f}s')
+            self._schedule_flush(delay)
+        finally:
+            connection.close()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_like_buffer(force=False):
+    """Return the process wide LikeBuffer, or None when buffering is off (unless forced)"""
+    global _buffer
+    if not (settings.LIKE_BUFFER_ENABLED or force):
+        return None
+
+    config = (str(settings.LIKE_BUFFER_DIR), settings.LIKE_BUFFER_FLUSH_INTERVAL, settings.LIKE_BUFFER_MAX_SIZE)
+    with _buffer_lock:
+        if _buffer is None or (str(_buffer.directory), _buffer.flush_interval, _buffer.max_size) != config:
+            _buffer = LikeBuffer(*config)
+            atexit.register(_flush_at_exit, _buffer)
+        return _buffer
+
+
+def _flush_at_exit(buffer):
+    try:
+        buffer.flush()
+    except Exception:
+        logger.exception('Like buffer flush at exit failed; the journals are kept for the next one')
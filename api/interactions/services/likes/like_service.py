@@ -1,6 +1,11 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from formulated.lib.bulk import insert_ignoring_conflicts
 from interactions.models import Like
 from interactions.serializers import LikeSerializer
+from interactions.services.likes.like_buffer import LIKE, UNLIKE, get_like_buffer
+from interactions.services.stats.stats_service import InteractionStatsService
 
 
 class LikeService:
@@ -12,13 +17,46 @@ class LikeService:
             return {'success': False, 'error': 'Authentication required'}
         
         content_type = ContentType.objects.get_for_model(obj)
-        liked = Like.objects.filter(
+        return {'success': True, 'liked': LikeService._is_liked(user, content_type, obj.id)}
+    
+    @staticmethod
+    def _is_liked(user, content_type, record_id):
+        """Whether the user likes the record, counting likes still in the write-behind buffer"""
+        buffer = get_like_buffer()
+        if buffer is not None:
+            pending = buffer.pending_actions(user.pk, content_type.pk, [record_id])
+            if pending:
+                return pending[record_id] == LIKE
+        
+        return Like.objects.filter(
             user=user,
             record_type=content_type,
-            record_id=obj.id
+            record_id=record_id
         ).exists()
-        
-        return {'success': True, 'liked': liked}
+    
+    @staticmethod
+    def get_liked_ids(user, model, ids):
+        """Return the subset of ids (records of model) the user has liked, in one query"""
+        if not user.is_authenticated:
+            return {'success': False, 'error': 'Authentication required'}
+
+        content_type = ContentType.objects.get_for_model(model)
+        liked = Like.objects.filter(
+            user=user,
+            record_type=content_type,
+            record_id__in=ids
+        ).values_list('record_id', flat=True)
+        liked = set(liked)
+
+        buffer = get_like_buffer()
+        if buffer is not None:
+            for record_id, action in buffer.pending_actions(user.pk, content_type.pk, ids).items():
+                if action == LIKE:
+                    liked.add(record_id)
+                else:
+                    liked.discard(record_id)
+
+        return {'success': True, 'ids': liked}
     
     @staticmethod
     def create_like(user, obj):
@@ -27,34 +65,34 @@ class LikeService:
             return {'success': False, 'error': 'Authentication required'}
         
         content_type = ContentType.objects.get_for_model(obj)
+        like = Like(user=user, record_type=content_type, record_id=obj.id)
         
-        # Check if already liked
-        if Like.objects.filter(
-            user=user,
-            record_type=content_type,
-            record_id=obj.id
-        ).exists():
+        buffer = get_like_buffer()
+        if buffer is not None:
+            return LikeService._queue_like(buffer, user, obj, like)
+        
+        try:
+            # One INSERT that the unique constraint turns into a no-op for a
+            # repeated like, so concurrent double clicks cannot race
+            with transaction.atomic():
+                created = insert_ignoring_conflicts([like])
+                if created:
+                    InteractionStatsService.record_like(content_type, obj.id, 1)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        
+        if not created:
             return {
                 'success': False, 
                 'error': f'You have already liked this {obj._meta.model_name}'
             }
         
-        try:
-            # Create the like
-            like = Like.objects.create(
-                user=user,
-                record_type=content_type,
-                record_id=obj.id
-            )
-            
-            serializer = LikeSerializer(like)
-            return {
-                'success': True, 
-                'like': serializer.data,
-                'message': f'{obj._meta.model_name.title()} liked successfully'
-            }
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        serializer = LikeSerializer(like)
+        return {
+            'success': True, 
+            'like': serializer.data,
+            'message': f'{obj._meta.model_name.title()} liked successfully'
+        }
     
     @staticmethod
     def remove_like(user, obj):
@@ -64,21 +102,71 @@ class LikeService:
         
         content_type = ContentType.objects.get_for_model(obj)
         
+        buffer = get_like_buffer()
+        if buffer is not None:
+            return LikeService._queue_unlike(buffer, user, obj, content_type)
+        
         try:
-            like = Like.objects.get(
-                user=user,
-                record_type=content_type,
-                record_id=obj.id
-            )
-            like.delete()
+            # A single filtered DELETE; its row count says whether there was a like
+            with transaction.atomic():
+                deleted, _ = Like.objects.filter(
+                    user=user,
+                    record_type=content_type,
+                    record_id=obj.id
+                ).delete()
+                if deleted:
+                    InteractionStatsService.record_like(content_type, obj.id, -1)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        
+        if not deleted:
+            return {'success': False, 'error': 'Like not found'}
+        
+        return {
+            'success': True,
+            'message': f'{obj._meta.model_name.title()} unliked successfully'
+        }
+    
+    @staticmethod
+    def _queue_like(buffer, user, obj, like):
+        """Validate a like and hand it to the write-behind buffer"""
+        if LikeService._is_liked(user, like.record_type, obj.id):
             return {
-                'success': True,
-                'message': f'{obj._meta.model_name.title()} unliked successfully'
+                'success': False, 
+                'error': f'You have already liked this {obj._meta.model_name}'
             }
-        except Like.DoesNotExist:
+        
+        try:
+            buffer.add(user.pk, like.record_type.pk, obj.id, LIKE)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        
+        # Saved with the next flush; its id and timestamp are provisional
+        like.created_at = timezone.now()
+        serializer = LikeSerializer(like)
+        return {
+            'success': True, 
+            'like': serializer.data,
+            'queued': True,
+            'message': f'{obj._meta.model_name.title()} liked successfully'
+        }
+    
+    @staticmethod
+    def _queue_unlike(buffer, user, obj, content_type):
+        """Validate an unlike and hand it to the write-behind buffer"""
+        if not LikeService._is_liked(user, content_type, obj.id):
             return {'success': False, 'error': 'Like not found'}
+        
+        try:
+            buffer.add(user.pk, content_type.pk, obj.id, UNLIKE)
         except Exception as e:
             return {'success': False, 'error': str(e)}
+        
+        return {
+            'success': True,
+            'queued': True,
+            'message': f'{obj._meta.model_name.title()} unliked successfully'
+        }
     
     @staticmethod
     def get_likes_for_object(obj):
@@ -87,7 +175,7 @@ class LikeService:
         likes = Like.objects.filter(
             record_type=content_type,
             record_id=obj.id
-        ).order_by('-created_at')
+        ).select_related('user', 'record_type').order_by('-created_at')
         
         serializer = LikeSerializer(likes, many=True)
         return {
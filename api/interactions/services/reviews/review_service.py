@@ -1,18 +1,26 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from interactions.models import Review
 from interactions.serializers import ReviewSerializer, ReviewCreateUpdateSerializer
+from interactions.services.stats.stats_service import InteractionStatsService
 
 
 class ReviewService:
     
     @staticmethod
-    def get_reviews_for_object(obj):
-        """Get all reviews for a given object"""
+    def get_reviews_queryset(obj):
+        """Get the queryset of reviews for a given object, newest first"""
         content_type = ContentType.objects.get_for_model(obj)
-        reviews = Review.objects.filter(
+        # The serializer renders the author and record type of every review
+        return Review.objects.filter(
             record_type=content_type,
             record_id=obj.id
-        ).order_by('-created_at')
+        ).select_related('user', 'record_type').order_by('-created_at')
+    
+    @staticmethod
+    def get_reviews_for_object(obj):
+        """Get all reviews for a given object"""
+        reviews = ReviewService.get_reviews_queryset(obj)
         
         serializer = ReviewSerializer(reviews, many=True)
         return {
@@ -21,6 +29,34 @@ class ReviewService:
             'count': reviews.count()
         }
     
+    @staticmethod
+    def get_review_summary(obj, has_reviews=False):
+        """
+        Get the review count, mean rating and rating histogram for a given object
+
+        ``has_reviews`` tells that the caller has seen reviews of the object, so
+        a zero count means its stats were never written and the reviews are
+        counted instead.
+        """
+        stats = InteractionStatsService.get_stats(obj)['stats']
+        if has_reviews and not stats['review_count']:
+            content_type = ContentType.objects.get_for_model(obj)
+            rows = InteractionStatsService.aggregate(record_type=content_type, record_id=obj.id)
+            if rows:
+                stats = {
+                    'review_count': rows[0].review_count,
+                    'average_rating': rows[0].average_rating,
+                    'rating_histogram': rows[0].rating_histogram,
+                }
+        return {
+            'success': True,
+            'summary': {
+                'count': stats['review_count'],
+                'average_rating': stats['average_rating'],
+                'histogram': stats['rating_histogram'],
+            }
+        }
+    
     @staticmethod
     def get_user_review(user, obj):
         """Get user's review for a given object"""
@@ -30,7 +66,7 @@ class ReviewService:
         content_type = ContentType.objects.get_for_model(obj)
         
         try:
-            review = Review.objects.get(
+            review = Review.objects.select_related('user', 'record_type').get(
                 user=user,
                 record_type=content_type,
                 record_id=obj.id
@@ -40,6 +76,21 @@ class ReviewService:
         except Review.DoesNotExist:
             return {'success': False, 'error': 'Review not found'}
     
+    @staticmethod
+    def get_reviewed_ids(user, model, ids):
+        """Return the subset of ids (records of model) the user has reviewed, in one query"""
+        if not user.is_authenticated:
+            return {'success': False, 'error': 'Authentication required'}
+
+        content_type = ContentType.objects.get_for_model(model)
+        reviewed = Review.objects.filter(
+            user=user,
+            record_type=content_type,
+            record_id__in=ids
+        ).values_list('record_id', flat=True)
+
+        return {'success': True, 'ids': set(reviewed)}
+    
     @staticmethod
     def create_review(user, obj, data):
         """Create a review for the given object"""
@@ -65,13 +116,15 @@ class ReviewService:
             return {'success': False, 'error': serializer.errors}
         
         try:
-            # Create the review
-            review = Review.objects.create(
-                user=user,
-                record_type=content_type,
-                record_id=obj.id,
-                **serializer.validated_data
-            )
+            # Create the review and count it atomically
+            with transaction.atomic():
+                review = Review.objects.create(
+                    user=user,
+                    record_type=content_type,
+                    record_id=obj.id,
+                    **serializer.validated_data
+                )
+                InteractionStatsService.record_review(content_type, obj.id, new_rating=review.rating)
             
             response_serializer = ReviewSerializer(review)
             return {
@@ -105,7 +158,12 @@ class ReviewService:
             return {'success': False, 'error': serializer.errors}
         
         try:
-            serializer.save()
+            old_rating = review.rating
+            with transaction.atomic():
+                serializer.save()
+                InteractionStatsService.record_review(
+                    content_type, obj.id, old_rating=old_rating, new_rating=review.rating
+                )
             response_serializer = ReviewSerializer(review)
             return {
                 'success': True,
@@ -129,7 +187,9 @@ class ReviewService:
                 record_type=content_type,
                 record_id=obj.id
             )
-            review.delete()
+            with transaction.atomic():
+                review.delete()
+                InteractionStatsService.record_review(content_type, obj.id, old_rating=review.rating)
             return {
                 'success': True,
                 'message': f'{obj._meta.model_name.title()} review deleted successfully'
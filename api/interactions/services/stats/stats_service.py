@@ -0,0 +1,109 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
+
+from interactions.models import InteractionStats, Like, Review
+
+
+class InteractionStatsService:
+
+    @staticmethod
+    def _apply(content_type, record_id, **deltas):
+        """Add the given deltas to a record's counters, creating its row if needed"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        stats, _ = InteractionStats.objects.get_or_create(record_type=content_type, record_id=record_id)
+        # Rows written behind the services' back can leave a counter short,
+        # so decrements stop at zero until the next rebuild
+        InteractionStats.objects.filter(pk=stats.pk).update(**{
+            field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items()
+        })
+
+    @staticmethod
+    def record_like(content_type, record_id, delta):
+        """Count a like (delta=1) or an unlike (delta=-1)"""
+        InteractionStatsService._apply(content_type, record_id, like_count=delta)
+
+    @staticmethod
+    def record_review(content_type, record_id, old_rating=None, new_rating=None):
+        """Count a review being created (no old rating), updated or deleted (no new rating)"""
+        deltas = {'review_count': (new_rating is not None) - (old_rating is not None)}
+        deltas['rating_sum'] = (new_rating or 0) - (old_rating or 0)
+        if old_rating != new_rating:
+            if old_rating is not None:
+                deltas[InteractionStats.rating_field(old_rating)] = -1
+            if new_rating is not None:
+                deltas[InteractionStats.rating_field(new_rating)] = 1
+        InteractionStatsService._apply(content_type, record_id, **deltas)
+
+    @staticmethod
+    def get_stats(obj):
+        """Get like and review stats for a given object"""
+        content_type = ContentType.objects.get_for_model(obj)
+        stats = InteractionStats.objects.filter(record_type=content_type, record_id=obj.id).first()
+        if stats is None:
+            stats = InteractionStats(record_type=content_type, record_id=obj.id)
+
+        return {
+            'success': True,
+            'stats': {
+                'like_count': stats.like_count,
+                'review_count': stats.review_count,
+                'average_rating': stats.average_rating,
+                'rating_histogram': stats.rating_histogram,
+            }
+        }
+
+    @staticmethod
+    def aggregate(like_model=Like, review_model=Review, stats_model=InteractionStats, **filters):
+        """
+        Build the stats of every record (or those matching ``filters``) from the Like and Review tables, unsaved
+
+        The models can be passed in so that migrations can use their
+        historical versions.
+        """
+        rows = {}
+
+        likes = like_model.objects.filter(**filters).order_by().values('record_type_id', 'record_id').annotate(count=Count('id'))
+        for row in likes:
+            key = (row['record_type_id'], row['record_id'])
+            rows[key] = stats_model(record_type_id=key[0], record_id=key[1], like_count=row['count'])
+
+        reviews = review_model.objects.filter(**filters).order_by().values('record_type_id', 'record_id').annotate(
+            count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{
+                InteractionStats.rating_field(rating): Count('id', filter=Q(rating=rating))
+                for rating in InteractionStats.RATINGS
+            }
+        )
+        for row in reviews:
+            key = (row['record_type_id'], row['record_id'])
+            stats = rows.setdefault(key, stats_model(record_type_id=key[0], record_id=key[1]))
+            stats.review_count = row['count']
+            stats.rating_sum = row['rating_sum']
+            for rating in InteractionStats.RATINGS:
+                field = InteractionStats.rating_field(rating)
+                setattr(stats, field, row[field])
+
+        return list(rows.values())
+
+    @staticmethod
+    def rebuild():
+        """Recompute every record's stats from the Like and Review tables"""
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Likes and reviews written between the reads and the swap
+                # would be counted by neither, so they wait for it instead
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'LOCK TABLE {Like._meta.db_table}, {Review._meta.db_table} IN SHARE MODE'
+                    )
+            rows = InteractionStatsService.aggregate()
+            deleted, _ = InteractionStats.objects.all().delete()
+            InteractionStats.objects.bulk_create(rows, batch_size=1000)
+
+        return {'success': True, 'records': len(rows), 'replaced': deleted}
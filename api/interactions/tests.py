@@ -1,3 +1,214 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import viewsets
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from interactions.models import InteractionStats, Like, Review
+from interactions.recordMixins import RecordMixin, ReviewPagination
+from interactions.services.likes.like_service import LikeService
+from interactions.services.reviews.review_service import ReviewService
+from interactions.services.stats.stats_service import InteractionStatsService
+from teams.models import Team, TeamStatus
+from teams.serializers import TeamSummarySerializer
+
+
+class RecordReviewsTest(APITestCase):
+    """Tests for the reviews action shared by record viewsets"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Test Team', status=TeamStatus.ACTIVE)
+        content_type = ContentType.objects.get_for_model(self.team)
+        for i in range(5):
+            user = User.objects.create_user(username=f'user{i}', password='testpass123')
+            Review.objects.create(
+                user=user,
+                record_type=content_type,
+                record_id=self.team.id,
+                rating=i + 1,
+                description=f'Review {i}'
+            )
+
+    def test_reviews_are_cursor_paginated(self):
+        """Test review pages walk newest first without a count"""
+        url = f'/api/teams/{self.team.id}/reviews/'
+        seen = []
+
+        with patch.object(ReviewPagination, 'page_size', 2):
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('count', response.data)
+                seen.extend(review['id'] for review in response.data['results'])
+                url = response.data['next']
+
+        expected = [str(review.id) for review in Review.objects.order_by('-created_at', 'id')]
+        self.assertEqual(seen, expected)
+
+
+
+class RecordReviewSummaryTest(APITestCase):
+    """Tests for the summary and own review returned with each reviews page"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Test Team', status=TeamStatus.ACTIVE)
+        self.users = [User.objects.create_user(username=f'user{i}', password='testpass123') for i in range(4)]
+        for user, rating in zip(self.users[:3], [5, 4, 4]):
+            ReviewService.create_review(user, self.team, {'rating': rating, 'description': 'Review'})
+        self.url = f'/api/teams/{self.team.id}/reviews/'
+
+    def test_summary_covers_every_page(self):
+        """Test the summary describes all reviews, not just the page"""
+        with patch.object(ReviewPagination, 'page_size', 1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['summary'], {
+            'count': 3,
+            'average_rating': 4.33,
+            'histogram': {1: 0, 2: 0, 3: 0, 4: 2, 5: 1},
+        })
+
+    def test_summary_without_stats_row(self):
+        """Test a record whose reviews predate its stats row still gets a full summary"""
+        InteractionStats.objects.filter(record_id=self.team.id).delete()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['summary']['count'], 3)
+        self.assertEqual(response.data['summary']['histogram'], {1: 0, 2: 0, 3: 0, 4: 2, 5: 1})
+
+    def test_my_review(self):
+        """Test the current user's review is included, when there is one"""
+        response = self.client.get(self.url)
+        self.assertIsNone(response.data['my_review'])
+
+        self.client.force_authenticate(self.users[0])
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['my_review']['rating'], 5)
+
+        self.client.force_authenticate(self.users[3])
+        response = self.client.get(self.url)
+        self.assertIsNone(response.data['my_review'])
+
+
+class InteractionQueriesTest(APITestCase):
+    """Review and like authors are joined, not loaded one query per row"""
+
+    def create_reviews(self, team, count):
+        users = User.objects.bulk_create([
+            User(username=f'{team.name}-user{i}') for i in range(count)
+        ])
+        content_type = ContentType.objects.get_for_model(Team)
+        Review.objects.bulk_create([
+            Review(user=user, record_type=content_type, record_id=team.id, rating=5, description='Review')
+            for user in users
+        ])
+        Like.objects.bulk_create([
+            Like(user=user, record_type=content_type, record_id=team.id) for user in users
+        ])
+        # Bulk writes skip the services, so count them the way the stats migration does
+        InteractionStatsService.rebuild()
+
+    def test_reviews_page_queries_do_not_grow(self):
+        """Test the reviews endpoint costs the same for 1, 10 and 1000 reviews"""
+        reader = User.objects.create_user(username='reader', password='testpass123')
+        self.client.force_authenticate(reader)
+
+        for count in (1, 10, 1000):
+            team = Team.objects.create(name=f'Team {count}', status=TeamStatus.ACTIVE)
+            self.create_reviews(team, count)
+
+            # Record, page, summary and the reader's own review
+            with self.assertNumQueries(4):
+                response = self.client.get(f'/api/teams/{team.id}/reviews/')
+            self.assertEqual(len(response.data['results']), min(count, ReviewPagination.page_size))
+            self.assertEqual(response.data['results'][0]['user'], f'Team {count}-user{count - 1}')
+
+    def test_service_listings_queries_do_not_grow(self):
+        """Test the service listings run one query for every review or like"""
+        for count in (1, 10, 1000):
+            team = Team.objects.create(name=f'Team {count}', status=TeamStatus.ACTIVE)
+            self.create_reviews(team, count)
+
+            with self.assertNumQueries(1):
+                result = ReviewService.get_reviews_for_object(team)
+            self.assertEqual(result['count'], count)
+
+            with self.assertNumQueries(1):
+                result = LikeService.get_likes_for_object(team)
+            self.assertEqual(result['count'], count)
+
+
+class RecordInteractionsTest(APITestCase):
+    """Tests for the bulk liked/reviewed by me lookup"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='fan', password='testpass123')
+        self.teams = [Team.objects.create(name=f'Team {i}', status=TeamStatus.ACTIVE) for i in range(4)]
+        content_type = ContentType.objects.get_for_model(Team)
+        for team in self.teams[:2]:
+            Like.objects.create(user=self.user, record_type=content_type, record_id=team.id)
+        Review.objects.create(
+            user=self.user, record_type=content_type, record_id=self.teams[1].id, rating=4, description='Fast'
+        )
+        # Another user's interactions do not count
+        other = User.objects.create_user(username='other', password='testpass123')
+        Like.objects.create(user=other, record_type=content_type, record_id=self.teams[3].id)
+
+    def test_requires_authentication(self):
+        """Test anonymous users get a 401"""
+        response = self.client.get('/api/teams/interactions/', {'ids': str(self.teams[0].id)})
+        self.assertEqual(response.status_code, 401)
+
+    def test_lookup_by_ids_in_fixed_queries(self):
+        """Test the lookup costs one query per interaction type, whatever the number of ids"""
+        self.client.force_authenticate(self.user)
+        ids = ','.join(str(team.id) for team in self.teams)
+
+        # One IN query for likes and one for reviews
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/teams/interactions/', {'ids': ids})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['liked'], [str(self.teams[0].id), str(self.teams[1].id)])
+        self.assertEqual(response.data['reviewed'], [str(self.teams[1].id)])
+
+    def test_lookup_by_posted_ids(self):
+        """Test ids can be POSTed"""
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            '/api/teams/interactions/', {'ids': [str(self.teams[1].id), str(self.teams[3].id)]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'liked': [str(self.teams[1].id)], 'reviewed': [str(self.teams[1].id)]})
+
+    def test_lookup_for_list_page(self):
+        """Test without ids the lookup answers for the list page"""
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/teams/interactions/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(response.data['liked'], [str(self.teams[0].id), str(self.teams[1].id)])
+        self.assertEqual(response.data['reviewed'], [str(self.teams[1].id)])
+
+    def test_invalid_ids(self):
+        """Test malformed ids are rejected"""
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/teams/interactions/', {'ids': 'not-a-uuid'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_record_mixin_alone(self):
+        """Test the lookup works on a viewset without /batch"""
+        class TeamRecordViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
+            queryset = Team.objects.all()
+            serializer_class = TeamSummarySerializer
+
+        request = APIRequestFactory().get('/teams/interactions/', {'ids': str(self.teams[0].id)})
+        force_authenticate(request, self.user)
+        response = TeamRecordViewSet.as_view({'get': 'interactions'})(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['liked'], [str(self.teams[0].id)])
@@ -2,12 +2,13 @@ from django.contrib import admin
 from django.urls import path
 from django.shortcuts import redirect
 from django.contrib import messages
+from formulated.lib.response_cache import InvalidateApiCacheAdminMixin
 from datetime import datetime
 from races.models import Circuit, Race, Position
 from data_loader.services.races_puller import RacesPuller
 
 @admin.register(Circuit)
-class CircuitAdmin(admin.ModelAdmin):
+class CircuitAdmin(InvalidateApiCacheAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'location', 'races_count', 'created_at', 'updated_at')
     search_fields = ('name', 'location')
     list_filter = ('created_at', 'updated_at')
@@ -18,10 +19,10 @@ class CircuitAdmin(admin.ModelAdmin):
     races_count.short_description = 'Races'
 
 @admin.register(Race)
-class RaceAdmin(admin.ModelAdmin):
-    list_display = ('name', 'circuit', 'status', 'start_at', 'created_at', 'updated_at')
+class RaceAdmin(InvalidateApiCacheAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'circuit', 'season', 'status', 'start_at', 'created_at', 'updated_at')
     search_fields = ('name', 'circuit__name', 'description')
-    list_filter = ('status', 'start_at', 'circuit', 'created_at', 'updated_at')
+    list_filter = ('season', 'status', 'start_at', 'circuit', 'created_at', 'updated_at')
     list_select_related = ('circuit',)
     ordering = ('-start_at',)
     
@@ -60,7 +61,7 @@ class RaceAdmin(admin.ModelAdmin):
         return redirect('admin:races_race_changelist')
 
 @admin.register(Position)
-class PositionAdmin(admin.ModelAdmin):
+class PositionAdmin(InvalidateApiCacheAdminMixin, admin.ModelAdmin):
     list_display = ('race', 'driver', 'position', 'points', 'created_at', 'updated_at')
     search_fields = ('race__name', 'driver__name')
     list_filter = ('race', 'position', 'points', 'created_at', 'updated_at')
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class RacesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'races'
+
+    def ready(self):
+        from formulated.lib.response_cache import invalidate_api_cache_on_change
+        from races.models import Circuit, Race, Position
+
+        # Every API response that renders these rows is cached per generation
+        invalidate_api_cache_on_change(Circuit, Race, Position)
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.21 on 2026-10-17 22:09
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractYear
+
+
+def backfill_season(apps, schema_editor):
+    """Fill season from start_at for existing races, in a single UPDATE"""
+    Race = apps.get_model('races', 'Race')
+    Race.objects.filter(season__isnull=True).update(season=ExtractYear('start_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('races', '0005_add_apisports_id_to_race'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='race',
+            name='season',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_season, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['season', 'status', 'start_at'], name='race_season_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['status', 'start_at'], name='race_status_start_idx'),
+        ),
+    ]
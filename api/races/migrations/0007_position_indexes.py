@@ -0,0 +1,25 @@
+# Generated by Django 4.2.21 on 2026-10-17 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('races', '0006_race_season'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['race', 'driver'], name='position_race_driver_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['driver', 'race'], name='position_driver_race_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['position', 'race'], name='position_position_race_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.21 on 2026-10-17 22:48
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import ExtractYear
+
+
+def resync_season(apps, schema_editor):
+    """Set season from start_at wherever it was stored with another year, in a single UPDATE"""
+    Race = apps.get_model('races', 'Race')
+    Race.objects.annotate(start_year=ExtractYear('start_at')).exclude(season=F('start_year')).update(
+        season=ExtractYear('start_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('races', '0007_position_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='race',
+            name='season',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(resync_season, migrations.RunPython.noop),
+    ]
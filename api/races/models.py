@@ -1,10 +1,30 @@
 from django.db import models
+from django.db.models import Count, Q
 from django.utils import timezone
 import uuid
 
 
 # Circuit
 
+class CircuitQuerySet(models.QuerySet):
+
+    def with_race_counts(self):
+        """Annotate total, upcoming and completed race counts in a single query"""
+        return self.annotate(
+            races_count=Count('races', distinct=True),
+            upcoming_races_count=Count(
+                'races',
+                filter=Q(races__status__in=[RaceStatus.SCHEDULED, RaceStatus.ONGOING]),
+                distinct=True
+            ),
+            completed_races_count=Count(
+                'races',
+                filter=Q(races__status=RaceStatus.COMPLETED),
+                distinct=True
+            ),
+        )
+
+
 class Circuit(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
@@ -12,6 +32,8 @@ class Circuit(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CircuitQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} - {self.location}"
 
@@ -31,10 +53,29 @@ class Race(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
     start_at = models.DateTimeField()
+    # Denormalized from start_at on every save so season filters can use an index
+    season = models.PositiveIntegerField(null=True, blank=True, editable=False)
     status = models.CharField(max_length=255, choices=RaceStatus.choices, default=RaceStatus.SCHEDULED)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Season pages, filtered by status and ordered by start
+            models.Index(fields=['season', 'status', 'start_at'], name='race_season_status_start_idx'),
+            # Upcoming/completed lists across seasons
+            models.Index(fields=['status', 'start_at'], name='race_status_start_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Kept in step with start_at, including when a race moves to another year
+        if self.start_at:
+            self.season = self.start_at.year
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'start_at' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'season'}
+        super().save(*args, **kwargs)
+
     @property
     def is_finished(self):
         """Check if the race is finished - used for review validation"""
@@ -62,6 +103,14 @@ class Position(models.Model):
     class Meta:
         unique_together = ['race', 'position']  # Ensure unique position per race
         ordering = ['race', 'position']
+        indexes = [
+            # A race's result for a driver
+            models.Index(fields=['race', 'driver'], name='position_race_driver_idx'),
+            # A driver's results (?driver_id=)
+            models.Index(fields=['driver', 'race'], name='position_driver_race_idx'),
+            # Results at a given place across races (?position=1)
+            models.Index(fields=['position', 'race'], name='position_position_race_idx'),
+        ]
 
     def __str__(self):
         return f"{self.driver.name} - Position {self.position} in {self.race.name}"
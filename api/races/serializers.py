@@ -1,10 +1,12 @@
 from rest_framework import serializers
-from races.models import Circuit, Race, Position
+from races.models import Circuit, Race, Position, RaceStatus
+from formulated.lib.expandable import ExpandableFieldsMixin
+from formulated.lib.hyperlinks import CachedHyperlinkedIdentityField, CachedHyperlinkedRelatedField
 
 
 class CircuitRaceSerializer(serializers.ModelSerializer):
     """Simplified race serializer for use within circuit details"""
-    url = serializers.HyperlinkedIdentityField(view_name='race-detail')
+    url = CachedHyperlinkedIdentityField(view_name='race-detail')
     
     class Meta:
         model = Race
@@ -13,10 +15,9 @@ class CircuitRaceSerializer(serializers.ModelSerializer):
         ]
 
 
-class CircuitSerializer(serializers.HyperlinkedModelSerializer):
-    """Circuit serializer with associated races"""
-    url = serializers.HyperlinkedIdentityField(view_name='circuit-detail')
-    races = CircuitRaceSerializer(many=True, read_only=True)
+class CircuitSerializer(ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer):
+    """Circuit serializer with associated races (expandable)"""
+    url = CachedHyperlinkedIdentityField(view_name='circuit-detail')
     races_count = serializers.SerializerMethodField()
     upcoming_races_count = serializers.SerializerMethodField()
     completed_races_count = serializers.SerializerMethodField()
@@ -28,28 +29,38 @@ class CircuitSerializer(serializers.HyperlinkedModelSerializer):
             'races', 'races_count', 'upcoming_races_count', 'completed_races_count',
             'created_at', 'updated_at'
         ]
+        expandable_fields = {
+            'races': (CircuitRaceSerializer, {'many': True, 'read_only': True}),
+        }
     
+    # Counts are annotated by CircuitQuerySet.with_race_counts(); fall back to
+    # querying only when the serializer is given an unannotated instance.
+
     def get_races_count(self, obj):
+        if hasattr(obj, 'races_count'):
+            return obj.races_count
         return obj.races.count()
     
     def get_upcoming_races_count(self, obj):
-        from races.models import RaceStatus
+        if hasattr(obj, 'upcoming_races_count'):
+            return obj.upcoming_races_count
         return obj.races.filter(status__in=[RaceStatus.SCHEDULED, RaceStatus.ONGOING]).count()
     
     def get_completed_races_count(self, obj):
-        from races.models import RaceStatus
+        if hasattr(obj, 'completed_races_count'):
+            return obj.completed_races_count
         return obj.races.filter(status=RaceStatus.COMPLETED).count()
 
 
 class RacePositionSerializer(serializers.ModelSerializer):
     """Simplified position serializer for use within race details"""
-    url = serializers.HyperlinkedIdentityField(view_name='position-detail')
-    driver_url = serializers.HyperlinkedRelatedField(view_name='member-detail', source='driver', read_only=True)
+    url = CachedHyperlinkedIdentityField(view_name='position-detail')
+    driver_url = CachedHyperlinkedRelatedField(view_name='member-detail', source='driver', read_only=True)
     driver_name = serializers.CharField(source='driver.name', read_only=True)
     driver_number = serializers.CharField(source='driver.driver_number', read_only=True)
     driver_acronym = serializers.CharField(source='driver.name_acronym', read_only=True)
     team_name = serializers.CharField(source='driver.team.name', read_only=True)
-    team_url = serializers.HyperlinkedRelatedField(view_name='team-detail', source='driver.team', read_only=True)
+    team_url = CachedHyperlinkedRelatedField(view_name='team-detail', source='driver.team', read_only=True)
     
     class Meta:
         model = Position
@@ -61,38 +72,41 @@ class RacePositionSerializer(serializers.ModelSerializer):
         ]
 
 
-class RaceSerializer(serializers.HyperlinkedModelSerializer):
-    """Race serializer with circuit and position details"""
-    url = serializers.HyperlinkedIdentityField(view_name='race-detail')
-    circuit = CircuitSerializer(read_only=True)
-    circuit_url = serializers.HyperlinkedRelatedField(view_name='circuit-detail', source='circuit', read_only=True)
-    positions = RacePositionSerializer(many=True, read_only=True)
+class RaceSerializer(ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer):
+    """Race serializer with circuit and position details (expandable)"""
+    url = CachedHyperlinkedIdentityField(view_name='race-detail')
+    circuit_url = CachedHyperlinkedRelatedField(view_name='circuit-detail', source='circuit', read_only=True)
     positions_count = serializers.SerializerMethodField()
     is_finished = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Race
         fields = [
-            'url', 'id', 'name', 'description', 'start_at', 'status', 'is_finished',
+            'url', 'id', 'name', 'description', 'season', 'start_at', 'status', 'is_finished',
             'circuit', 'circuit_url', 
             'positions', 'positions_count',
             'created_at', 'updated_at'
         ]
+        expandable_fields = {
+            'circuit': (CircuitSerializer, {'read_only': True}),
+            'positions': (RacePositionSerializer, {'many': True, 'read_only': True}),
+        }
     
     def get_positions_count(self, obj):
+        if hasattr(obj, 'positions_count'):
+            return obj.positions_count
         return obj.positions.count()
 
-class PositionSerializer(serializers.HyperlinkedModelSerializer):
-    """Full position serializer with race and driver details"""
-    url = serializers.HyperlinkedIdentityField(view_name='position-detail')
-    race = RaceSerializer(read_only=True)
-    race_url = serializers.HyperlinkedRelatedField(view_name='race-detail', source='race', read_only=True)
-    driver_url = serializers.HyperlinkedRelatedField(view_name='member-detail', source='driver', read_only=True)
+class PositionSerializer(ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer):
+    """Full position serializer with race (expandable) and driver details"""
+    url = CachedHyperlinkedIdentityField(view_name='position-detail')
+    race_url = CachedHyperlinkedRelatedField(view_name='race-detail', source='race', read_only=True)
+    driver_url = CachedHyperlinkedRelatedField(view_name='member-detail', source='driver', read_only=True)
     driver_name = serializers.CharField(source='driver.name', read_only=True)
     driver_number = serializers.CharField(source='driver.driver_number', read_only=True)
     driver_acronym = serializers.CharField(source='driver.name_acronym', read_only=True)
     team_name = serializers.CharField(source='driver.team.name', read_only=True)
-    team_url = serializers.HyperlinkedRelatedField(view_name='team-detail', source='driver.team', read_only=True)
+    team_url = CachedHyperlinkedRelatedField(view_name='team-detail', source='driver.team', read_only=True)
     
     class Meta:
         model = Position
@@ -102,4 +116,14 @@ class PositionSerializer(serializers.HyperlinkedModelSerializer):
             'driver_url', 'driver_name', 'driver_number', 'driver_acronym',
             'team_name', 'team_url',
             'created_at', 'updated_at'
-        ] 
\ No newline at end of file
+        ]
+        expandable_fields = {
+            'race': (RaceSerializer, {'read_only': True}),
+        }
+
+
+class FlatPositionSerializer(serializers.BaseSerializer):
+    """Pass-through for the flat position rows built by PositionViewSet (?flat=true)"""
+
+    def to_representation(self, instance):
+        return instance
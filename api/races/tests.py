@@ -1,3 +1,504 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
+from uuid import uuid4
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from formulated.lib import hyperlinks, renderers
+from formulated.management.commands.explain_queries import hot_queries, sequential_scans
+from formulated.lib.renderers import FastJSONRenderer
+
+from races.models import Circuit, Race, RaceStatus, Position
+from races.views import RacePagination, PositionPagination
+from teams.models import Team, Member, MemberRole, TeamStatus
+
+
+class CircuitRaceCountsTest(APITestCase):
+    """Race counts on circuits are annotated instead of queried per circuit"""
+
+    def _create_circuits(self, circuits, races_per_circuit):
+        now = timezone.now()
+        for i in range(circuits):
+            circuit = Circuit.objects.create(name=f'Circuit {i}', location=f'Location {i}')
+            for j in range(races_per_circuit):
+                Race.objects.create(
+                    circuit=circuit,
+                    name=f'Race {i}-{j}',
+                    description='Test race',
+                    start_at=now + timedelta(days=j - 1),
+                    status=RaceStatus.COMPLETED if j == 0 else RaceStatus.SCHEDULED
+                )
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_circuit_counts(self):
+        """Test annotated counts match the circuit's races"""
+        self._create_circuits(circuits=1, races_per_circuit=3)
+
+        response = self.client.get('/api/circuits/')
+        circuit = response.data['results'][0]
+
+        self.assertEqual(circuit['races_count'], 3)
+        self.assertEqual(circuit['completed_races_count'], 1)
+        self.assertEqual(circuit['upcoming_races_count'], 2)
+
+    def test_nested_circuit_counts(self):
+        """Test annotated counts on the circuit nested in a race"""
+        self._create_circuits(circuits=1, races_per_circuit=3)
+
+        response = self.client.get('/api/races/?expand=circuit')
+        circuit = response.data['results'][0]['circuit']
+
+        self.assertEqual(circuit['races_count'], 3)
+        self.assertEqual(circuit['completed_races_count'], 1)
+        self.assertEqual(circuit['upcoming_races_count'], 2)
+
+    def test_circuit_list_query_count_is_flat(self):
+        """Test the circuit list query count does not grow with circuits or races"""
+        self._create_circuits(circuits=1, races_per_circuit=1)
+        url = '/api/circuits/?expand=races'
+        baseline = self._count_queries(url)
+
+        self._create_circuits(circuits=10, races_per_circuit=5)
+        self.assertEqual(self._count_queries(url), baseline)
+
+    def test_race_list_query_count_is_flat(self):
+        """Test the race list query count does not grow with circuits or races"""
+        self._create_circuits(circuits=1, races_per_circuit=1)
+        url = '/api/races/?expand=circuit,circuit.races,positions'
+        baseline = self._count_queries(url)
+
+        self._create_circuits(circuits=10, races_per_circuit=5)
+        self.assertEqual(self._count_queries(url), baseline)
+
+
+class ExpandableFieldsTest(APITestCase):
+    """Nested serializers are opt-in through ?expand= and trimmed by ?fields="""
+
+    def setUp(self):
+        self.circuit = Circuit.objects.create(name='Circuit de Monaco', location='Monaco')
+        self.race = Race.objects.create(
+            circuit=self.circuit,
+            name='Monaco Grand Prix',
+            description='Test race',
+            start_at=timezone.now(),
+            status=RaceStatus.COMPLETED
+        )
+        team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        driver = Member.objects.create(name='Max Verstappen', role=MemberRole.DRIVER, team=team)
+        self.position = Position.objects.create(race=self.race, driver=driver, position=1, points=25)
+
+    def test_list_does_not_nest_by_default(self):
+        """Test list endpoints leave nested serializers out unless expanded"""
+        race = self.client.get('/api/races/').data['results'][0]
+
+        self.assertNotIn('circuit', race)
+        self.assertNotIn('positions', race)
+        self.assertIn('circuit_url', race)
+        self.assertEqual(race['positions_count'], 1)
+
+    def test_list_expand(self):
+        """Test ?expand= opts into nested serializers, including dotted paths"""
+        position = self.client.get('/api/positions/?expand=race.circuit').data['results'][0]
+
+        self.assertEqual(position['race']['circuit']['name'], 'Circuit de Monaco')
+        self.assertNotIn('positions', position['race'])
+        self.assertNotIn('races', position['race']['circuit'])
+
+    def test_detail_expands_by_default(self):
+        """Test detail endpoints keep their nested payload unless ?expand= overrides it"""
+        race = self.client.get(f'/api/races/{self.race.id}/').data
+
+        self.assertEqual(race['circuit']['races'][0]['name'], 'Monaco Grand Prix')
+        self.assertEqual(len(race['positions']), 1)
+
+        race = self.client.get(f'/api/races/{self.race.id}/?expand=').data
+        self.assertNotIn('circuit', race)
+
+    def test_batch_expands_like_detail(self):
+        """Test /batch serves races with the detail payload"""
+        response = self.client.get(f'/api/races/batch/?ids={self.race.id}')
+        race = response.data['results'][0]
+
+        self.assertEqual(race['circuit']['races'][0]['name'], 'Monaco Grand Prix')
+        self.assertEqual(len(race['positions']), 1)
+        self.assertEqual(race['positions_count'], 1)
+
+    def test_sparse_fields(self):
+        """Test ?fields= limits the payload, including inside expanded serializers"""
+        response = self.client.get('/api/races/?expand=circuit&fields=id,name,circuit.name')
+        race = response.data['results'][0]
+
+        self.assertEqual(set(race), {'id', 'name', 'circuit'})
+        self.assertEqual(race['circuit'], {'name': 'Circuit de Monaco'})
+
+
+class FlatPositionsTest(APITestCase):
+    """?flat=true serves positions as scalar rows from one joined query"""
+
+    def setUp(self):
+        circuit = Circuit.objects.create(name='Circuit de Monaco', location='Monaco')
+        self.race = Race.objects.create(
+            circuit=circuit,
+            name='Monaco Grand Prix',
+            description='Test race',
+            start_at=timezone.now(),
+            status=RaceStatus.COMPLETED
+        )
+        self.team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        for i in range(1, 4):
+            driver = Member.objects.create(
+                name=f'Driver {i}', role=MemberRole.DRIVER, team=self.team, driver_number=i
+            )
+            Position.objects.create(race=self.race, driver=driver, position=i, points=10 - i)
+
+    def test_flat_rows(self):
+        """Test flat rows carry race, circuit, driver and team as scalar columns"""
+        response = self.client.get('/api/positions/?flat=true')
+        row = response.data['results'][0]
+
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(row['position'], 1)
+        self.assertEqual(row['race_id'], self.race.id)
+        self.assertEqual(row['race_name'], 'Monaco Grand Prix')
+        self.assertEqual(row['circuit_name'], 'Circuit de Monaco')
+        self.assertEqual(row['driver_name'], 'Driver 1')
+        self.assertEqual(row['team_id'], self.team.id)
+        self.assertEqual(row['team_name'], 'Red Bull Racing')
+
+    def test_flat_rows_apply_filters(self):
+        """Test flat rows honour the regular position filters"""
+        response = self.client.get('/api/positions/?flat=true&position=2')
+
+        self.assertEqual([row['driver_name'] for row in response.data['results']], ['Driver 2'])
+
+    def test_flat_rows_single_query(self):
+        """Test flat rows are read with a single query besides the two validator queries"""
+        with self.assertNumQueries(3):
+            self.client.get('/api/positions/?flat=true')
+
+
+class KeysetPaginationTest(APITestCase):
+    """Positions and races are cursor paginated on stable orderings"""
+
+    def setUp(self):
+        now = timezone.now()
+        team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        drivers = [
+            Member.objects.create(name=f'Driver {i}', role=MemberRole.DRIVER, team=team, driver_number=i)
+            for i in range(1, 6)
+        ]
+        circuit = Circuit.objects.create(name='Circuit de Monaco', location='Monaco')
+        for i in range(4):
+            race = Race.objects.create(
+                circuit=circuit,
+                name=f'Race {i}',
+                description='Test race',
+                start_at=now + timedelta(days=i - 2),
+                status=RaceStatus.COMPLETED if i < 2 else RaceStatus.SCHEDULED
+            )
+            for p, driver in enumerate(drivers, start=1):
+                # Leave one classification empty to exercise NULL handling
+                Position.objects.create(race=race, driver=driver, position=None if p == 5 else p)
+
+    def _walk(self, url, key):
+        """Follow next links to the end, then previous links back to the start"""
+        forward, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            pages.append([row[key] for row in response.data['results']])
+            forward.extend(pages[-1])
+            url = response.data['next']
+
+        url, backward = response.data['previous'], []
+        while url:
+            response = self.client.get(url)
+            backward = [row[key] for row in response.data['results']] + backward
+            url = response.data['previous']
+        return forward, backward, pages
+
+    def test_positions_pages(self):
+        """Test position pages follow (race start, position, id) forwards and backwards"""
+        expected = [
+            str(position.id) for position in Position.objects.order_by(
+                'race__start_at', F('position').asc(nulls_last=True), 'id'
+            )
+        ]
+
+        with patch.object(PositionPagination, 'page_size', 3):
+            forward, backward, pages = self._walk('/api/positions/', 'id')
+            flat, _, _ = self._walk('/api/positions/?flat=true', 'id')
+
+        self.assertEqual(forward, expected)
+        self.assertEqual([str(row_id) for row_id in flat], expected)
+        self.assertEqual(backward + pages[-1], expected)
+
+    def test_races_pages(self):
+        """Test race pages keep completed races first, then upcoming ones"""
+        with patch.object(RacePagination, 'page_size', 1):
+            forward, _, _ = self._walk('/api/races/', 'name')
+
+        self.assertEqual(forward, ['Race 0', 'Race 1', 'Race 2', 'Race 3'])
+
+    def test_deep_page_costs_the_same(self):
+        """Test a page behind a cursor runs the same queries as the first page"""
+        cache.clear()
+        with patch.object(PositionPagination, 'page_size', 2):
+            with CaptureQueriesContext(connection) as first:
+                response = self.client.get('/api/positions/')
+            while response.data['next']:
+                url = response.data['next']
+                response = self.client.get(url)
+            # Served cold, like the first page
+            cache.clear()
+            with CaptureQueriesContext(connection) as deep:
+                self.client.get(url)
+
+        self.assertEqual(len(deep.captured_queries), len(first.captured_queries))
+        self.assertNotIn('OFFSET', deep.captured_queries[-1]['sql'])
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is rejected"""
+        response = self.client.get('/api/positions/?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class FastJSONRendererTest(APITestCase):
+    """FastJSONRenderer produces the same bytes as DRF's JSONRenderer"""
+
+    def setUp(self):
+        circuit = Circuit.objects.create(name='Autódromo José Carlos Pace', location='São Paulo')
+        race = Race.objects.create(
+            circuit=circuit,
+            name='São Paulo Grand Prix',
+            description='Line\u2028separator',
+            start_at=timezone.now(),
+            status=RaceStatus.COMPLETED
+        )
+        team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        driver = Member.objects.create(name='Max Verstappen', role=MemberRole.DRIVER, team=team)
+        Position.objects.create(race=race, driver=driver, position=1, points=25)
+
+    def test_api_payload_matches(self):
+        """Test a nested API payload renders identically"""
+        data = self.client.get('/api/races/?expand=circuit,positions').data
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_native_types_match(self):
+        """Test UUIDs, datetimes, Decimals and non-str keys render like the stdlib encoder"""
+        data = {
+            'id': uuid4(),
+            'start_at': datetime(2024, 3, 2, 15, 0, tzinfo=dt_timezone.utc),
+            'rating': Decimal('4.5'),
+            'histogram': {1: 0, 5: 2},
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_and_fallback(self):
+        """Test indented output and a missing orjson both fall back to the stdlib"""
+        data = self.client.get('/api/races/').data
+
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4')
+        )
+        with patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class CachedHyperlinksTest(APITestCase):
+    """Hyperlink fields reverse each route once per request"""
+
+    def setUp(self):
+        cache.clear()
+        circuit = Circuit.objects.create(name='Circuit de Monaco', location='Monaco')
+        self.race = Race.objects.create(
+            circuit=circuit,
+            name='Monaco Grand Prix',
+            description='Test race',
+            start_at=timezone.now(),
+            status=RaceStatus.COMPLETED
+        )
+        team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        for i in range(1, 4):
+            driver = Member.objects.create(name=f'Driver {i}', role=MemberRole.DRIVER, team=team)
+            Position.objects.create(race=self.race, driver=driver, position=i, points=25 - i)
+
+    def test_urls_match_reverse(self):
+        """Test built URLs are identical to DRF's per object reverse()"""
+        url = '/api/positions/?expand=race,race.circuit'
+        cached = self.client.get(url).content
+
+        cache.clear()
+        with patch.object(hyperlinks, 'get_url_template', return_value=None):
+            uncached = self.client.get(url).content
+
+        self.assertEqual(cached, uncached)
+        self.assertIn(f'"http://testserver/api/races/{self.race.id}/"'.encode(), cached)
+
+    def test_reverse_once_per_route(self):
+        """Test a list reverses each view name once, whatever the number of rows"""
+        with patch('rest_framework.relations.reverse', wraps=reverse) as mock_reverse:
+            self.client.get('/api/positions/')
+
+        view_names = sorted(call.args[0] for call in mock_reverse.call_args_list)
+        self.assertEqual(view_names, ['member-detail', 'position-detail', 'race-detail', 'team-detail'])
+
+
+class StreamingExportTest(APITestCase):
+    """/export streams flat rows as NDJSON or CSV with the list filters"""
+
+    def setUp(self):
+        circuit = Circuit.objects.create(name='Circuit de Monaco', location='Monaco')
+        team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        drivers = [
+            Member.objects.create(name=f'Driver {i}', role=MemberRole.DRIVER, team=team, driver_number=i)
+            for i in range(1, 4)
+        ]
+        for year in (2023, 2024):
+            race = Race.objects.create(
+                circuit=circuit,
+                name=f'Monaco Grand Prix {year}',
+                description='Test race',
+                start_at=timezone.now().replace(year=year),
+                status=RaceStatus.COMPLETED
+            )
+            for i, driver in enumerate(drivers, 1):
+                Position.objects.create(race=race, driver=driver, position=i, points=10 - i)
+
+    def test_positions_ndjson(self):
+        """Test positions stream as one JSON object per line, filtered by season"""
+        response = self.client.get('/api/positions/export/?season=2024')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('positions-2024.ndjson', response['Content-Disposition'])
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['driver_name'] for row in rows], ['Driver 1', 'Driver 2', 'Driver 3'])
+        self.assertEqual({row['race_name'] for row in rows}, {'Monaco Grand Prix 2024'})
+
+    def test_positions_csv(self):
+        """Test ?format=csv streams a header and one line per position"""
+        response = self.client.get('/api/positions/export/?format=csv&position=1')
+
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['driver_name'], 'Driver 1')
+        self.assertEqual(rows[0]['position'], '1')
+
+    def test_races_csv_by_accept_header(self):
+        """Test races export negotiates CSV from the Accept header"""
+        response = self.client.get('/api/races/export/?season=2023', HTTP_ACCEPT='text/csv')
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['name'] for row in rows], ['Monaco Grand Prix 2023'])
+        self.assertEqual(rows[0]['circuit_name'], 'Circuit de Monaco')
+        self.assertEqual(rows[0]['positions_count'], '3')
+
+    def test_empty_csv_has_header(self):
+        """Test an export with no rows still carries the CSV header"""
+        response = self.client.get('/api/positions/export/?format=csv&season=1950')
+
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'id,position,points'))
+
+    def test_rows_are_read_in_chunks(self):
+        """Test rows are fetched with a chunked iterator rather than loaded at once"""
+        with patch('django.db.models.query.QuerySet.iterator', autospec=True, side_effect=lambda qs, chunk_size: iter(())) as iterator:
+            b''.join(self.client.get('/api/positions/export/').streaming_content)
+
+        self.assertEqual(iterator.call_args.kwargs['chunk_size'], 2000)
+
+
+class RaceSeasonTest(APITestCase):
+    """Season filters read the indexed Race.season column"""
+
+    def setUp(self):
+        cache.clear()
+        circuit = Circuit.objects.create(name='Circuit de Monaco', location='Monaco')
+        team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        self.driver = Member.objects.create(name='Max Verstappen', role=MemberRole.DRIVER, team=team)
+        self.race = Race.objects.create(
+            circuit=circuit,
+            name='Abu Dhabi Grand Prix',
+            description='Test race',
+            start_at=datetime(2024, 12, 8, 13, 0, tzinfo=dt_timezone.utc),
+            status=RaceStatus.COMPLETED
+        )
+        Position.objects.create(race=self.race, driver=self.driver, position=1, points=25)
+
+    def test_season_follows_start_year(self):
+        """Test season is the year the race starts in, and follows start_at when it moves"""
+        self.assertEqual(self.race.season, 2024)
+
+        self.race.start_at = datetime(2025, 3, 16, 5, 0, tzinfo=dt_timezone.utc)
+        self.race.season = 2024
+        self.race.save(update_fields=['start_at'])
+
+        self.race.refresh_from_db()
+        self.assertEqual(self.race.season, 2025)
+        self.assertEqual(self.client.get('/api/races/?season=2024').data['results'], [])
+
+    def test_filters_use_season_column(self):
+        """Test ?season= and ?year= filter races and positions on the column, not on start_at"""
+        for url in ('/api/races/?season=2024', '/api/races/?year=2024'):
+            with CaptureQueriesContext(connection) as context:
+                races = self.client.get(url).data['results']
+            self.assertEqual([race['id'] for race in races], [str(self.race.id)])
+            self.assertEqual(races[0]['season'], 2024)
+            self.assertFalse(any('django_datetime_extract' in query['sql'] for query in context.captured_queries))
+
+        self.assertEqual(len(self.client.get('/api/positions/?season=2024').data['results']), 1)
+        self.assertEqual(self.client.get('/api/positions/?season=2025').data['results'], [])
+
+
+class ExplainQueriesTest(APITestCase):
+    """explain_queries reports hot queries that scan whole tables"""
+
+    def test_hot_queries_use_indexes(self):
+        """Test every hot query is served by an index"""
+        out = io.StringIO()
+        call_command('explain_queries', fail_on_seqscan=True, stdout=out)
+
+        self.assertIn('0 of', out.getvalue())
+
+    def test_position_queries_match_the_list_endpoint(self):
+        """Test the position entries are the page queries PositionViewSet runs, joins and ordering included"""
+        queries = dict(hot_queries())
+        for name in ('Positions: by driver', 'Positions: winners', 'Positions: by season'):
+            sql = str(queries[name].query)
+            self.assertIn('JOIN "races_race"', sql)
+            self.assertIn(
+                'ORDER BY "races_race"."start_at" ASC NULLS LAST, "races_position"."position" ASC NULLS LAST, '
+                '"races_position"."id" ASC NULLS LAST',
+                sql
+            )
+            self.assertEqual(queries[name].query.high_mark, PositionPagination.page_size + 1)
+
+    def test_sequential_scan_detection(self):
+        """Test table scans are told apart from index scans in both plan formats"""
+        self.assertEqual(sequential_scans('Seq Scan on races_race  (cost=0.00..1.01)', 'postgresql'), ['races_race'])
+        self.assertEqual(sequential_scans('Index Scan using race_status_start_idx on races_race', 'postgresql'), [])
+        self.assertEqual(sequential_scans('2 0 0 SCAN races_position', 'sqlite'), ['races_position'])
+        self.assertEqual(sequential_scans('2 0 0 SCAN races_position USING INDEX position_driver_race_idx', 'sqlite'), [])
@@ -1,20 +1,69 @@
 from rest_framework import viewsets
-from django.db.models import Prefetch, Case, When, Value, IntegerField
+from django.db.models import Prefetch, Case, When, Value, IntegerField, Count, F
 from django.db.models import Q
 
 from races.models import Circuit, Race, Position, RaceStatus
-from races.serializers import CircuitSerializer, RaceSerializer, PositionSerializer
+from teams.models import Team, Member
+from races.serializers import CircuitSerializer, RaceSerializer, PositionSerializer, FlatPositionSerializer
 from interactions.recordMixins import RecordMixin
+from formulated.lib.expandable import ExpandableViewSetMixin
+from formulated.lib.pagination import KeysetPagination
+from formulated.lib.conditional import ConditionalGetMixin
+from formulated.lib.response_cache import CachedResponseMixin
+from formulated.lib.batch import BatchLookupMixin
+from formulated.lib.export import StreamingExportMixin
 
 
-class CircuitViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
+class RacePagination(KeysetPagination):
+    # Completed races first, then upcoming ones, matching RaceViewSet ordering
+    ordering = ('order_priority', 'start_at', 'id')
+
+
+class PositionPagination(KeysetPagination):
+    ordering = ('race__start_at', 'position', 'id')
+
+
+# Querysets matching what the expandable serializers render, so that nothing
+# is fetched for nested data the client did not ask for
+
+def expand_circuit_queryset(queryset, expand):
+    """Prefetch the relations an expanded CircuitSerializer renders"""
+    if 'races' in expand:
+        queryset = queryset.prefetch_related('races')
+    return queryset
+
+
+def expand_race_queryset(queryset, expand):
+    """Prefetch the relations an expanded RaceSerializer renders"""
+    if 'circuit' in expand:
+        queryset = queryset.prefetch_related(
+            # The nested circuit carries its race counts, so load it through
+            # an annotated prefetch rather than a plain join
+            Prefetch(
+                'circuit',
+                queryset=expand_circuit_queryset(Circuit.objects.with_race_counts(), expand['circuit'])
+            )
+        )
+    if 'positions' in expand:
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                'positions',
+                queryset=Position.objects.select_related('driver', 'driver__team').order_by('position')
+            )
+        )
+    return queryset
+
+
+class CircuitViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, ExpandableViewSetMixin, RecordMixin, viewsets.ReadOnlyModelViewSet):
     """Circuit viewset with optimized queries and filtering"""
-    queryset = Circuit.objects.prefetch_related('races').order_by('name')
+    queryset = Circuit.objects.with_race_counts().order_by('name')
     serializer_class = CircuitSerializer
+    detail_expand = ('races',)
+    conditional_dependencies = (Race,)
     
     def get_queryset(self):
         # Start with the base queryset
-        queryset = self.queryset
+        queryset = expand_circuit_queryset(self.queryset, self.get_expand())
         
         # Filter by location if provided
         location = self.request.query_params.get('location')
@@ -24,19 +73,29 @@ class CircuitViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class RaceViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
+class RaceViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, ExpandableViewSetMixin, StreamingExportMixin, RecordMixin, viewsets.ReadOnlyModelViewSet):
     """Race viewset with optimized queries and comprehensive filtering"""
-    queryset = Race.objects.select_related('circuit').prefetch_related(
-        Prefetch(
-            'positions',
-            queryset=Position.objects.select_related('driver', 'driver__team').order_by('position')
-        )
-    )
+    queryset = Race.objects.annotate(positions_count=Count('positions'))
     serializer_class = RaceSerializer
+    pagination_class = RacePagination
+    detail_expand = ('circuit', 'circuit.races', 'positions')
+    conditional_dependencies = (Race, Circuit, Position, Member, Team)
+
+    # Columns streamed by /api/races/export
+    export_name = 'races'
+    export_fields = ('id', 'name', 'description', 'season', 'start_at', 'status', 'circuit_id', 'positions_count',
+                     'created_at', 'updated_at')
+    export_expressions = {
+        'circuit_name': F('circuit__name'),
+    }
+
+    def get_export_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.prefetch_related(None).values(*self.export_fields, **self.export_expressions)
 
     def get_queryset(self):
         # Start with the base queryset
-        queryset = self.queryset
+        queryset = expand_race_queryset(self.queryset, self.get_expand())
         
         # Filter by circuit
         circuit_id = self.request.query_params.get('circuit_id')
@@ -51,12 +110,12 @@ class RaceViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
         # Filter by year
         year = self.request.query_params.get('year')
         if year:
-            queryset = queryset.filter(start_at__year=year)
+            queryset = queryset.filter(season=year)
         
         # Filter by season (alias for year)
         season = self.request.query_params.get('season')
         if season:
-            queryset = queryset.filter(start_at__year=season)
+            queryset = queryset.filter(season=season)
         
         # Filter upcoming races
         upcoming = self.request.query_params.get('upcoming')
@@ -83,16 +142,64 @@ class RaceViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class PositionViewSet(viewsets.ReadOnlyModelViewSet):
+class PositionViewSet(ConditionalGetMixin, CachedResponseMixin, ExpandableViewSetMixin, StreamingExportMixin, viewsets.ReadOnlyModelViewSet):
     """Position viewset with optimized queries and filtering"""
     queryset = Position.objects.select_related(
-        'race', 'race__circuit', 'driver', 'driver__team'
+        'driver', 'driver__team'
     ).order_by('race__start_at', 'position')
     serializer_class = PositionSerializer
-    
+    pagination_class = PositionPagination
+    detail_expand = ('race', 'race.circuit', 'race.circuit.races', 'race.positions')
+    conditional_dependencies = (Race, Circuit, Position, Member, Team)
+
+    # Scalar columns served by ?flat=true, read from a single joined query
+    flat_fields = ('id', 'position', 'points', 'race_id', 'driver_id')
+    flat_expressions = {
+        'race_name': F('race__name'),
+        'race_start_at': F('race__start_at'),
+        'circuit_id': F('race__circuit_id'),
+        'circuit_name': F('race__circuit__name'),
+        'driver_name': F('driver__name'),
+        'driver_number': F('driver__driver_number'),
+        'driver_acronym': F('driver__name_acronym'),
+        'team_id': F('driver__team_id'),
+        'team_name': F('driver__team__name'),
+    }
+
+    export_name = 'positions'
+
+    def is_flat(self):
+        """Whether the request asked for flat rows (?flat=true); exports always are"""
+        if self.action == 'export':
+            return True
+        flat = self.request.query_params.get('flat')
+        return bool(flat) and flat.lower() in ['true', '1']
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_serializer_class(self):
+        if self.is_flat():
+            return FlatPositionSerializer
+        return super().get_serializer_class()
+
     def get_queryset(self):
         # Start with the base queryset
         queryset = self.queryset
+
+        expand = self.get_expand()
+        if 'race' in expand:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'race',
+                    queryset=expand_race_queryset(
+                        Race.objects.annotate(positions_count=Count('positions')), expand['race']
+                    )
+                )
+            )
+        else:
+            # The race is still needed for the pagination cursor (race__start_at)
+            queryset = queryset.select_related('race')
         
         # Filter by race
         race_id = self.request.query_params.get('race_id')
@@ -117,15 +224,20 @@ class PositionViewSet(viewsets.ReadOnlyModelViewSet):
         # Filter by year/season
         year = self.request.query_params.get('year')
         if year:
-            queryset = queryset.filter(race__start_at__year=year)
+            queryset = queryset.filter(race__season=year)
         
         season = self.request.query_params.get('season')
         if season:
-            queryset = queryset.filter(race__start_at__year=season)
+            queryset = queryset.filter(race__season=season)
         
         # Filter by points threshold
         min_points = self.request.query_params.get('min_points')
         if min_points:
             queryset = queryset.filter(points__gte=min_points)
+
+        if self.is_flat():
+            # Flat rows come straight from .values(), skipping model
+            # instantiation and the nested serializers entirely
+            queryset = queryset.prefetch_related(None).values(*self.flat_fields, **self.flat_expressions)
         
         return queryset
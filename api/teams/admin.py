@@ -3,11 +3,12 @@ from teams.models import Team, Member
 from django.urls import path
 from django.shortcuts import redirect
 from django.contrib import messages
+from formulated.lib.response_cache import InvalidateApiCacheAdminMixin
 from data_loader.services.drivers_puller import DriversPuller
 from data_loader.services.teams_puller import TeamsPuller
 
 @admin.register(Team)
-class TeamAdmin(admin.ModelAdmin):
+class TeamAdmin(InvalidateApiCacheAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'status', 'created_at', 'updated_at')
     search_fields = ('name', 'description')
     list_filter = ('status', 'created_at', 'updated_at')
@@ -43,7 +44,7 @@ class TeamAdmin(admin.ModelAdmin):
         return redirect('admin:teams_team_changelist')
 
 @admin.register(Member)
-class MemberAdmin(admin.ModelAdmin):
+class MemberAdmin(InvalidateApiCacheAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'team', 'role', 'driver_number', 'name_acronym', 'created_at', 'updated_at')
     search_fields = ('name', 'team__name', 'description', 'name_acronym')
     list_filter = ('role', 'team', 'created_at', 'updated_at')
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TeamsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'teams'
+
+    def ready(self):
+        from formulated.lib.response_cache import invalidate_api_cache_on_change
+        from teams.models import Team, Member
+
+        # Every API response that renders these rows is cached per generation
+        invalidate_api_cache_on_change(Team, Member)
@@ -1,8 +1,13 @@
+from urllib.parse import urlencode
+
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from teams.models import Team, Member
+from formulated.lib.expandable import ExpandableFieldsMixin
+from formulated.lib.hyperlinks import CachedHyperlinkedIdentityField, CachedHyperlinkedRelatedField
 
 class TeamMemberSerializer(serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='member-detail')
+    url = CachedHyperlinkedIdentityField(view_name='member-detail')
     
     class Meta:
         model = Member
@@ -12,14 +17,16 @@ class TeamMemberSerializer(serializers.ModelSerializer):
             'driver_number', 'name_acronym', 'country_code', 'headshot_url'
         ]
 
-class TeamSerializer(serializers.HyperlinkedModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='team-detail')
-    members = TeamMemberSerializer(many=True, read_only=True)
+class TeamSerializer(ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer):
+    url = CachedHyperlinkedIdentityField(view_name='team-detail')
+    members_count = serializers.SerializerMethodField()
+    members_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Team
         fields = [
-            'url', 'id', 'name', 'description', 'status', 'members', 'created_at', 'updated_at',
+            'url', 'id', 'name', 'description', 'status', 'members', 'members_count', 'members_url',
+            'created_at', 'updated_at',
             # Basic team information
             'logo_url', 'base', 'first_team_entry',
             # Performance statistics
@@ -29,16 +36,55 @@ class TeamSerializer(serializers.HyperlinkedModelSerializer):
             # Technical specifications
             'chassis', 'engine', 'tyres'
         ]
+        expandable_fields = {
+            # Prefetched by NestedMembersMixin.expand_team_queryset
+            'members': (TeamMemberSerializer, {'many': True, 'read_only': True, 'source': 'nested_members'}),
+        }
+
+    # The nested member list is bounded (see NestedMembersMixin); its total
+    # and a link to the full list only come along with it
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'members' not in fields:
+            fields.pop('members_count', None)
+            fields.pop('members_url', None)
+        return fields
+
+    def get_members_count(self, obj):
+        if hasattr(obj, 'members_count'):
+            return obj.members_count
+        roles = self.context.get('members_roles')
+        members = obj.members.all() if roles is None else obj.members.filter(role__in=roles)
+        return members.count()
+
+    def get_members_url(self, obj):
+        query = {'team_id': obj.pk}
+        roles = self.context.get('members_roles')
+        if roles is not None:
+            query['role'] = ','.join(roles)
+        return f"{reverse('member-list', request=self.context.get('request'))}?{urlencode(query)}"
+
+class TeamSummarySerializer(serializers.ModelSerializer):
+    """Compact team for embedding in member payloads, without the roster"""
+    url = CachedHyperlinkedIdentityField(view_name='team-detail')
+
+    class Meta:
+        model = Team
+        fields = ['url', 'id', 'name', 'status', 'logo_url']
 
-class MemberSerializer(serializers.HyperlinkedModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='member-detail')
-    team = TeamSerializer(read_only=True)
-    team_url = serializers.HyperlinkedRelatedField(view_name='team-detail', source='team', read_only=True)
+class MemberSerializer(ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer):
+    url = CachedHyperlinkedIdentityField(view_name='member-detail')
+    team_url = CachedHyperlinkedRelatedField(view_name='team-detail', source='team', read_only=True)
         
     class Meta:
         model = Member
         fields = [
-            'url', 'id', 'name', 'role', 'description', 'team', 'team_url', 'created_at', 'updated_at',
+            'url', 'id', 'name', 'role', 'description', 'team', 'team_summary', 'team_url', 'created_at', 'updated_at',
             # Driver-specific fields
             'driver_number', 'name_acronym', 'country_code', 'headshot_url'
         ]
+        expandable_fields = {
+            'team': (TeamSerializer, {'read_only': True}),
+            'team_summary': (TeamSummarySerializer, {'source': 'team', 'read_only': True}),
+        }
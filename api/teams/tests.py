@@ -1,3 +1,349 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+
+from data_loader.services.teams_puller import TeamsPuller
+from formulated.lib.response_cache import get_cache_stats, get_generation, invalidate_api_cache
+from teams.models import Team, Member, MemberRole, TeamStatus
+from teams.views import MemberViewSet
+
+
+class ConditionalGetTest(APITestCase):
+    """Read-only endpoints answer conditional GETs with 304"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        self.driver = Member.objects.create(name='Max Verstappen', role=MemberRole.DRIVER, team=self.team)
+
+    def test_list_not_modified(self):
+        """Test a matching If-None-Match gets an empty 304"""
+        response = self.client.get('/api/teams/')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get('/api/teams/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since(self):
+        """Test If-Modified-Since at or after the last change gets a 304"""
+        response = self.client.get('/api/teams/', HTTP_IF_MODIFIED_SINCE=http_date())
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_varies_with_query(self):
+        """Test different query strings get different validators"""
+        etag = self.client.get('/api/teams/')['ETag']
+
+        self.assertNotEqual(self.client.get('/api/teams/?expand=members')['ETag'], etag)
+
+    @override_settings(ALLOWED_HOSTS=['a.example.com', 'b.example.com'])
+    def test_etag_varies_with_host(self):
+        """Test the same path on two hosts gets different validators, since payloads carry absolute links"""
+        etag = self.client.get('/api/teams/', HTTP_HOST='a.example.com')['ETag']
+
+        response = self.client.get('/api/teams/', HTTP_HOST='b.example.com', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_validators_are_cached_per_generation(self):
+        """Test a repeated conditional GET reads no tables until the data changes"""
+        etag = self.client.get('/api/members/')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/members/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.team.name = 'Oracle Red Bull Racing'
+        self.team.save()
+
+        response = self.client.get('/api/members/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_nested_change_invalidates(self):
+        """Test a change to a nested model invalidates the parent's ETag"""
+        etag = self.client.get(f'/api/teams/{self.team.id}/')['ETag']
+
+        self.driver.name = 'Max Emilian Verstappen'
+        self.driver.save()
+
+        response = self.client.get(f'/api/teams/{self.team.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_deletion_invalidates(self):
+        """Test deleting a row invalidates the ETag even though no timestamp moved"""
+        Member.objects.create(name='Sergio Perez', role=MemberRole.DRIVER, team=self.team)
+        etag = self.client.get('/api/members/')['ETag']
+
+        self.driver.delete()
+
+        response = self.client.get('/api/members/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ResponseCacheTest(APITestCase):
+    """Read-only endpoints serve repeated requests from the response cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        self.driver = Member.objects.create(name='Max Verstappen', role=MemberRole.DRIVER, team=self.team)
+
+    def test_repeated_request_hits(self):
+        """Test the second identical request is a hit with the same payload"""
+        first = self.client.get('/api/teams/?expand=members')
+        second = self.client.get('/api/teams/?expand=members')
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(get_cache_stats()['hits'], 1)
+        self.assertEqual(get_cache_stats()['misses'], 1)
+
+    def test_query_params_are_part_of_the_key(self):
+        """Test different query strings are cached separately"""
+        self.client.get('/api/teams/')
+
+        self.assertEqual(self.client.get('/api/teams/?expand=members')['X-Cache'], 'MISS')
+
+    @override_settings(ALLOWED_HOSTS=['a.example.com', 'b.example.com'])
+    def test_host_is_part_of_the_key(self):
+        """Test the same path on two hosts is cached separately, with each host's links"""
+        self.client.get('/api/teams/', HTTP_HOST='a.example.com')
+        response = self.client.get('/api/teams/', HTTP_HOST='b.example.com')
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('http://b.example.com/', response.content.decode())
+        self.assertNotIn('a.example.com', response.content.decode())
+        self.assertEqual(self.client.get('/api/teams/', HTTP_HOST='a.example.com')['X-Cache'], 'HIT')
+
+    def test_invalidate(self):
+        """Test invalidating after commit drops cached responses"""
+        self.client.get('/api/teams/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_api_cache('test')
+
+        self.assertEqual(self.client.get('/api/teams/')['X-Cache'], 'MISS')
+
+    def test_sync_invalidates(self):
+        """Test a finished puller sync drops cached responses, even with nothing to write"""
+        self.client.get('/api/teams/')
+
+        puller = TeamsPuller()
+        with patch.object(puller.client, 'get_teams', return_value=[]), \
+                self.captureOnCommitCallbacks(execute=True):
+            puller.pull_and_sync_teams()
+
+        self.assertEqual(self.client.get('/api/teams/')['X-Cache'], 'MISS')
+
+    def test_admin_save_invalidates(self):
+        """Test saving a model in the admin bumps the generation"""
+        generation = get_generation()
+        request = RequestFactory().post('/admin/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            site._registry[Team].save_model(request, self.team, None, True)
+
+        self.assertGreater(get_generation(), generation)
+
+    def test_change_outside_sync_is_not_served_stale(self):
+        """Test rows changed without an invalidation still miss the cache"""
+        self.client.get(f'/api/members/{self.driver.id}/')
+
+        self.driver.name = 'Max Emilian Verstappen'
+        self.driver.save()
+
+        response = self.client.get(f'/api/members/{self.driver.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['name'], 'Max Emilian Verstappen')
+
+
+class TransactionInvalidationTest(TransactionTestCase):
+    """Writes inside a transaction invalidate the API cache once, on commit"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_one_bump_per_transaction(self):
+        """Test many saves in one transaction bump the generation once, after the commit"""
+        generation = get_generation()
+
+        with self.assertLogs('formulated.lib.response_cache', 'INFO') as logs:
+            with transaction.atomic():
+                team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+                for number in range(3):
+                    Member.objects.create(name=f'Driver {number}', role=MemberRole.DRIVER, team=team)
+                self.assertEqual(cache.get('api:generation'), generation)
+
+        self.assertEqual(cache.get('api:generation'), generation + 1)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('teams.Team changed, teams.Member changed', logs.output[0])
+
+    def test_rolled_back_savepoint_does_not_swallow_the_bump(self):
+        """Test a write after a rolled back savepoint still bumps on commit"""
+        generation = get_generation()
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Team.objects.create(name='Ferrari', status=TeamStatus.ACTIVE)
+                    raise ValueError
+            except ValueError:
+                pass
+            Team.objects.create(name='McLaren', status=TeamStatus.ACTIVE)
+
+        self.assertEqual(cache.get('api:generation'), generation + 1)
+
+
+class BatchLookupTest(APITestCase):
+    """/batch returns many records by id from one queryset"""
+
+    def setUp(self):
+        cache.clear()
+        self.team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        self.drivers = [
+            Member.objects.create(name=f'Driver {i}', role=MemberRole.DRIVER, team=self.team, driver_number=i)
+            for i in range(1, 6)
+        ]
+
+    def test_get_in_requested_order(self):
+        """Test records come back in the order asked for, expanded like the detail view"""
+        ids = [self.drivers[2].id, self.drivers[0].id]
+        response = self.client.get(f'/api/members/batch/?ids={ids[0]},{ids[1]}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([member['id'] for member in response.data['results']], [str(pk) for pk in ids])
+        self.assertEqual(response.data['results'][0]['team']['name'], 'Red Bull Racing')
+        self.assertEqual(response.data['missing'], [])
+
+    def test_post_body_and_missing_ids(self):
+        """Test ids can be POSTed without logging in, and unknown ids are reported"""
+        unknown = '00000000-0000-0000-0000-000000000000'
+        response = self.client.post(
+            '/api/teams/batch/', {'ids': [str(self.team.id), unknown]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([team['name'] for team in response.data['results']], ['Red Bull Racing'])
+        self.assertEqual(len(response.data['results'][0]['members']), 5)
+        self.assertEqual(response.data['missing'], [unknown])
+
+    def test_invalid_requests(self):
+        """Test missing, malformed and oversized batches are rejected"""
+        ids = ','.join(str(driver.id) for driver in self.drivers)
+
+        self.assertEqual(self.client.get('/api/members/batch/').status_code, 400)
+        self.assertEqual(self.client.get('/api/members/batch/?ids=not-a-uuid').status_code, 400)
+        with patch.object(MemberViewSet, 'batch_max_size', 4):
+            self.assertEqual(self.client.get(f'/api/members/batch/?ids={ids}').status_code, 400)
+
+    def test_query_count_independent_of_batch_size(self):
+        """Test one id and many ids cost the same number of queries"""
+        counts = []
+        for drivers in (self.drivers[:1], self.drivers):
+            ids = ','.join(str(driver.id) for driver in drivers)
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(f'/api/members/batch/?ids={ids}')
+            counts.append(len(context.captured_queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+
+class MemberQueriesTest(APITestCase):
+    """Member endpoints embed their team in a fixed number of queries"""
+
+    def setUp(self):
+        cache.clear()
+
+    def create_grid(self, teams, drivers_per_team):
+        start = Team.objects.count()
+        for i in range(start, start + teams):
+            team = Team.objects.create(name=f'Team {i}', status=TeamStatus.ACTIVE)
+            for j in range(drivers_per_team):
+                Member.objects.create(name=f'Driver {i}-{j}', role=MemberRole.DRIVER, team=team)
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return len(context.captured_queries)
+
+    def test_team_and_teammates_constant_queries(self):
+        """Test the page costs the same number of queries for 4 or 20 members"""
+        url = '/api/members/?expand=team,team.members'
+        self.create_grid(teams=2, drivers_per_team=2)
+        small = self.count_queries(url)
+
+        self.create_grid(teams=8, drivers_per_team=2)
+        self.assertEqual(self.count_queries(url), small)
+
+    def test_team_summary(self):
+        """Test ?expand=team_summary embeds a compact team without its roster"""
+        self.create_grid(teams=1, drivers_per_team=2)
+
+        member = self.client.get('/api/members/?expand=team_summary').data['results'][0]
+
+        self.assertEqual(set(member['team_summary']), {'url', 'id', 'name', 'status', 'logo_url'})
+        self.assertEqual(member['team_summary']['name'], 'Team 0')
+        self.assertNotIn('team', member)
+
+
+class NestedMembersTest(APITestCase):
+    """Member lists nested in teams are prefetched once, filtered by role and capped"""
+
+    def setUp(self):
+        cache.clear()
+        self.team = Team.objects.create(name='Red Bull Racing', status=TeamStatus.ACTIVE)
+        for i in range(1, 5):
+            Member.objects.create(name=f'Driver {i}', role=MemberRole.DRIVER, team=self.team, driver_number=i)
+        Member.objects.create(name='Engineer', role=MemberRole.ENGINEER, team=self.team)
+
+    def test_drivers_only_by_default(self):
+        """Test nested members default to drivers, with their count and a link to the full list"""
+        team = self.client.get(f'/api/teams/{self.team.id}/').data
+
+        self.assertEqual([member['name'] for member in team['members']], [f'Driver {i}' for i in range(1, 5)])
+        self.assertEqual(team['members_count'], 4)
+
+        members = self.client.get(team['members_url']).data['results']
+        self.assertEqual(len(members), 4)
+
+    def test_role_and_limit(self):
+        """Test ?members_role= and ?members_limit= widen the roles and cap the list"""
+        team = self.client.get('/api/teams/?expand=members&members_role=all&members_limit=2').data['results'][0]
+
+        self.assertEqual([member['name'] for member in team['members']], ['Driver 1', 'Driver 2'])
+        self.assertEqual(team['members_count'], 5)
+        self.assertEqual(len(self.client.get(team['members_url']).data['results']), 5)
+
+        response = self.client.get('/api/teams/?expand=members&members_role=mechanic')
+        self.assertEqual(response.status_code, 400)
+
+    def test_count_and_url_come_with_members(self):
+        """Test teams without expanded members do not carry the members summary"""
+        team = self.client.get('/api/teams/').data['results'][0]
+
+        self.assertNotIn('members_count', team)
+        self.assertNotIn('members_url', team)
+
+    def test_team_list_constant_queries(self):
+        """Test the team list costs the same number of queries for 1 or 6 teams"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/teams/?expand=members')
+        one_team = len(context.captured_queries)
+
+        cache.clear()
+        for i in range(5):
+            team = Team.objects.create(name=f'Team {i}', status=TeamStatus.ACTIVE)
+            Member.objects.create(name=f'Team {i} driver', role=MemberRole.DRIVER, team=team)
+        with self.assertNumQueries(one_team):
+            self.client.get('/api/teams/?expand=members')
@@ -1,16 +1,116 @@
 from rest_framework import viewsets
-from django.db.models import F
+from rest_framework.exceptions import ValidationError
+from django.db.models import F, Q, Count, Prefetch
 
-from teams.models import Team, Member
+from teams.models import Team, Member, MemberRole
 from teams.serializers import TeamSerializer, MemberSerializer
 from interactions.recordMixins import RecordMixin
+from formulated.lib.expandable import ExpandableViewSetMixin
+from formulated.lib.conditional import ConditionalGetMixin
+from formulated.lib.response_cache import CachedResponseMixin
+from formulated.lib.batch import BatchLookupMixin
 
-class TeamViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
+
+class NestedMembersMixin:
+    """
+    Bounds the member lists nested inside teams
+
+    Nested lists only hold ``nested_members_roles`` (``?members_role=`` takes
+    a comma separated list of roles, or ``all``) and at most
+    ``nested_members_limit`` members (``?members_limit=``, up to
+    ``max_nested_members_limit``). Teams carry ``members_count`` and a
+    ``members_url`` to the full list.
+    """
+    nested_members_roles = (MemberRole.DRIVER,)
+    nested_members_limit = 10
+    max_nested_members_limit = 100
+
+    def get_nested_members_roles(self):
+        """Return the roles nested member lists are filtered by, or None for every role"""
+        value = self.request.query_params.get('members_role')
+        if value is None:
+            return list(self.nested_members_roles)
+        if value == 'all':
+            return None
+
+        roles = [role.strip() for role in value.split(',') if role.strip()]
+        invalid = [role for role in roles if role not in MemberRole.values]
+        if invalid:
+            raise ValidationError({'members_role': f"Unknown role(s): {', '.join(invalid)}"})
+        return roles
+
+    def get_nested_members_limit(self):
+        value = self.request.query_params.get('members_limit')
+        if value is None:
+            return self.nested_members_limit
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValidationError({'members_limit': 'Expected an integer'})
+        return max(1, min(limit, self.max_nested_members_limit))
+
+    def expand_team_queryset(self, queryset, expand):
+        """Annotate and prefetch the bounded member list an expanded TeamSerializer renders"""
+        if 'members' not in expand:
+            return queryset
+
+        roles = self.get_nested_members_roles()
+        members = Member.objects.order_by(F('driver_number').asc(nulls_last=True), 'name')
+        if roles is not None:
+            members = members.filter(role__in=roles)
+
+        return queryset.annotate(
+            members_count=Count('members', filter=Q(members__role__in=roles) if roles is not None else None)
+        ).prefetch_related(
+            # Sliced prefetches are limited per team in the database; Django
+            # only supports them with a to_attr
+            Prefetch('members', queryset=members[:self.get_nested_members_limit()], to_attr='nested_members')
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['members_roles'] = self.get_nested_members_roles()
+        return context
+
+
+class TeamViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, ExpandableViewSetMixin, NestedMembersMixin, RecordMixin, viewsets.ReadOnlyModelViewSet):
     # Order by world championships descending, nulls last
     queryset = Team.objects.all().order_by(F('world_championships').desc(nulls_last=True), 'name')
     serializer_class = TeamSerializer
+    detail_expand = ('members',)
+    conditional_dependencies = (Member,)
 
+    def get_queryset(self):
+        return self.expand_team_queryset(self.queryset, self.get_expand())
 
-class MemberViewSet(RecordMixin, viewsets.ReadOnlyModelViewSet):
+
+class MemberViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, ExpandableViewSetMixin, NestedMembersMixin, RecordMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Member.objects.all().order_by('driver_number', 'team__name', 'name')
     serializer_class = MemberSerializer
+    detail_expand = ('team', 'team.members')
+    conditional_dependencies = (Team, Member)
+
+    def get_queryset(self):
+        queryset = self.queryset
+
+        # One join (or prefetch) for the team, one prefetch for the
+        # teammates, however many members are on the page
+        expand = self.get_expand()
+        if 'members' in expand.get('team', {}):
+            queryset = queryset.prefetch_related(
+                Prefetch('team', queryset=self.expand_team_queryset(Team.objects.all(), expand['team']))
+            )
+        elif 'team' in expand or 'team_summary' in expand:
+            queryset = queryset.select_related('team')
+
+        # Filter by team
+        team_id = self.request.query_params.get('team_id')
+        if team_id:
+            queryset = queryset.filter(team_id=team_id)
+
+        # Filter by role, e.g. ?role=driver,engineer
+        role = self.request.query_params.get('role')
+        if role:
+            queryset = queryset.filter(role__in=role.split(','))
+
+        return queryset
@@ -19,6 +19,9 @@ export const TeamCard = ({ team }: TeamCardProps) => {
         }
     };
 
+    // Nested members are capped by the API; members_count is the full total
+    const membersCount = team.members_count ?? team.members?.length ?? 0;
+
     return (
         <Card className="p-6 hover:shadow-lg transition-all duration-200 hover:scale-[1.02] h-full flex flex-col">
             {/* Header with logo and team name - Fixed height */}
@@ -133,8 +136,8 @@ export const TeamCard = ({ team }: TeamCardProps) => {
             {/* Members - Always present with fixed height */}
             <div className="mb-4 min-h-[60px]">
                 <p className="text-sm text-gray-500 dark:text-gray-400 mb-2">
-                    {team.members && team.members.length > 0 
-                        ? `${team.members.length} member${team.members.length !== 1 ? 's' : ''}`
+                    {membersCount > 0
+                        ? `${membersCount} member${membersCount !== 1 ? 's' : ''}`
                         : '0 members'
                     }
                 </p>
@@ -149,9 +152,9 @@ export const TeamCard = ({ team }: TeamCardProps) => {
                                     {member.name_acronym || member.name.split(' ').map(n => n[0]).join('')}
                                 </span>
                             ))}
-                            {team.members.length > 3 && (
+                            {membersCount > 3 && (
                                 <span className="inline-flex items-center px-2 py-1 rounded-md text-xs font-medium bg-gray-100 text-gray-600 dark:bg-gray-900/20 dark:text-gray-400">
-                                    +{team.members.length - 3} more
+                                    +{membersCount - 3} more
                                 </span>
                             )}
                         </>
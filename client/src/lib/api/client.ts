@@ -8,6 +8,13 @@ export type PaginatedResponse<T> = {
   results: T[];
 }
 
+// Cursor paginated endpoints (races, positions, reviews) skip the count
+export type CursorPaginatedResponse<T> = {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 // Base URL for the API - adjust this based on your backend configuration
 const BASE_URL = import.meta.env.API_URL || 'http://localhost:8000/api';
 
@@ -1,11 +1,13 @@
-import { api, type PaginatedResponse } from "./client";
+import { api, type PaginatedResponse, type CursorPaginatedResponse } from "./client";
 import type { Member } from "../types/teams";
 import type { Like, Review, ReviewFormData, LikeResponse } from "../types/interactions";
 
 export const membersApi = {
     // Member operations
     getMembers: async (): Promise<PaginatedResponse<Member>> => {
-        const response = await api.get<PaginatedResponse<Member>>('/members/');
+        const response = await api.get<PaginatedResponse<Member>>('/members/', {
+            params: { expand: 'team' }
+        });
         return response.data;
     },
 
@@ -31,8 +33,8 @@ export const membersApi = {
 
     // Review operations
     getReviews: async (memberId: string): Promise<Review[]> => {
-        const response = await api.get<Review[]>(`/members/${memberId}/reviews/`);
-        return response.data;
+        const response = await api.get<CursorPaginatedResponse<Review>>(`/members/${memberId}/reviews/`);
+        return response.data.results;
     },
 
     createReview: async (memberId: string, reviewData: ReviewFormData): Promise<Review> => {
@@ -1,4 +1,4 @@
-import { api, type PaginatedResponse } from "./client";
+import { api, type PaginatedResponse, type CursorPaginatedResponse } from "./client";
 import type { Race, Circuit, Position, RaceStatus } from "../types/races";
 import type { Like, Review, ReviewFormData, LikeResponse } from "../types/interactions";
 
@@ -27,8 +27,9 @@ export interface PositionFilters {
 
 export const racesApi = {
     // Race operations
-    getRaces: async (filters?: RaceFilters): Promise<PaginatedResponse<Race>> => {
-        const params: Record<string, string> = {};
+    getRaces: async (filters?: RaceFilters): Promise<CursorPaginatedResponse<Race>> => {
+        // Race cards render the circuit and the podium
+        const params: Record<string, string> = { expand: 'circuit,positions' };
         
         if (filters) {
             Object.entries(filters).forEach(([key, value]) => {
@@ -38,7 +39,7 @@ export const racesApi = {
             });
         }
         
-        const response = await api.get<PaginatedResponse<Race>>('/races/', { params });
+        const response = await api.get<CursorPaginatedResponse<Race>>('/races/', { params });
         return response.data;
     },
 
@@ -48,25 +49,26 @@ export const racesApi = {
     },
 
     // Convenience methods for common race queries
-    getUpcomingRaces: async (): Promise<PaginatedResponse<Race>> => {
+    getUpcomingRaces: async (): Promise<CursorPaginatedResponse<Race>> => {
         return racesApi.getRaces({ upcoming: true });
     },
 
-    getCompletedRaces: async (year?: number): Promise<PaginatedResponse<Race>> => {
+    getCompletedRaces: async (year?: number): Promise<CursorPaginatedResponse<Race>> => {
         return racesApi.getRaces({ completed: true, year });
     },
 
-    getRacesByCircuit: async (circuitId: string): Promise<PaginatedResponse<Race>> => {
+    getRacesByCircuit: async (circuitId: string): Promise<CursorPaginatedResponse<Race>> => {
         return racesApi.getRaces({ circuit_id: circuitId });
     },
 
-    getRacesBySeason: async (season: number): Promise<PaginatedResponse<Race>> => {
+    getRacesBySeason: async (season: number): Promise<CursorPaginatedResponse<Race>> => {
         return racesApi.getRaces({ season });
     },
 
     // Circuit operations
     getCircuits: async (filters?: CircuitFilters): Promise<PaginatedResponse<Circuit>> => {
-        const params: Record<string, string> = {};
+        // Circuit cards list the circuit's races
+        const params: Record<string, string> = { expand: 'races' };
         
         if (filters) {
             Object.entries(filters).forEach(([key, value]) => {
@@ -86,7 +88,7 @@ export const racesApi = {
     },
 
     // Position operations
-    getPositions: async (filters?: PositionFilters): Promise<PaginatedResponse<Position>> => {
+    getPositions: async (filters?: PositionFilters): Promise<CursorPaginatedResponse<Position>> => {
         const params: Record<string, string> = {};
         
         if (filters) {
@@ -97,24 +99,24 @@ export const racesApi = {
             });
         }
         
-        const response = await api.get<PaginatedResponse<Position>>('/positions/', { params });
+        const response = await api.get<CursorPaginatedResponse<Position>>('/positions/', { params });
         return response.data;
     },
 
     // Convenience methods for positions
-    getRaceResults: async (raceId: string): Promise<PaginatedResponse<Position>> => {
+    getRaceResults: async (raceId: string): Promise<CursorPaginatedResponse<Position>> => {
         return racesApi.getPositions({ race_id: raceId });
     },
 
-    getDriverResults: async (driverId: string, season?: number): Promise<PaginatedResponse<Position>> => {
+    getDriverResults: async (driverId: string, season?: number): Promise<CursorPaginatedResponse<Position>> => {
         return racesApi.getPositions({ driver_id: driverId, season });
     },
 
-    getTeamResults: async (teamId: string, season?: number): Promise<PaginatedResponse<Position>> => {
+    getTeamResults: async (teamId: string, season?: number): Promise<CursorPaginatedResponse<Position>> => {
         return racesApi.getPositions({ team_id: teamId, season });
     },
 
-    getRaceWinners: async (season?: number): Promise<PaginatedResponse<Position>> => {
+    getRaceWinners: async (season?: number): Promise<CursorPaginatedResponse<Position>> => {
         return racesApi.getPositions({ position: 1, season });
     },
 
@@ -135,8 +137,8 @@ export const racesApi = {
 
     // Review operations for races
     getReviews: async (raceId: string): Promise<Review[]> => {
-        const response = await api.get<Review[]>(`/races/${raceId}/reviews/`);
-        return response.data;
+        const response = await api.get<CursorPaginatedResponse<Review>>(`/races/${raceId}/reviews/`);
+        return response.data.results;
     },
 
     createReview: async (raceId: string, reviewData: ReviewFormData): Promise<Review> => {
@@ -170,8 +172,8 @@ export const racesApi = {
 
     // Review operations for circuits
     getCircuitReviews: async (circuitId: string): Promise<Review[]> => {
-        const response = await api.get<Review[]>(`/circuits/${circuitId}/reviews/`);
-        return response.data;
+        const response = await api.get<CursorPaginatedResponse<Review>>(`/circuits/${circuitId}/reviews/`);
+        return response.data.results;
     },
 
     createCircuitReview: async (circuitId: string, reviewData: ReviewFormData): Promise<Review> => {
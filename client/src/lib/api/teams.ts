@@ -1,16 +1,20 @@
-import { api, type PaginatedResponse } from "./client";
+import { api, type PaginatedResponse, type CursorPaginatedResponse } from "./client";
 import type { Team } from "../types/teams";
 import type { Like, Review, ReviewFormData, LikeResponse } from "../types/interactions";
 
 export const teamsApi = {
     // Team operations
     getTeams: async (): Promise<PaginatedResponse<Team>> => {
-        const response = await api.get<PaginatedResponse<Team>>('/teams/');
+        const response = await api.get<PaginatedResponse<Team>>('/teams/', {
+            params: { expand: 'members' }
+        });
         return response.data;
     },
 
     getTeam: async (id: string): Promise<Team> => {
-        const response = await api.get<Team>(`/teams/${id}/`);
+        const response = await api.get<Team>(`/teams/${id}/`, {
+            params: { members_role: 'all', members_limit: 100 }
+        });
         return response.data;
     },
 
@@ -31,8 +35,8 @@ export const teamsApi = {
 
     // Review operations
     getReviews: async (teamId: string): Promise<Review[]> => {
-        const response = await api.get<Review[]>(`/teams/${teamId}/reviews/`);
-        return response.data;
+        const response = await api.get<CursorPaginatedResponse<Review>>(`/teams/${teamId}/reviews/`);
+        return response.data.results;
     },
 
     createReview: async (teamId: string, reviewData: ReviewFormData): Promise<Review> => {
@@ -26,7 +26,17 @@ export type LikeResponse = {
     liked: boolean;
 };
 
-export type ReviewsResponse = {
-    reviews: Review[];
+export type ReviewSummary = {
     count: number;
+    average_rating: number | null;
+    histogram: Record<string, number>;
+};
+
+// GET /{records}/{id}/reviews/: one cursor page plus the record's summary
+export type ReviewsResponse = {
+    next: string | null;
+    previous: string | null;
+    results: Review[];
+    summary: ReviewSummary;
+    my_review: Review | null;
 }; 
\ No newline at end of file
@@ -44,6 +44,7 @@ export type Race = {
     id: string;
     name: string;
     description: string;
+    season: number | null;
     start_at: string;
     status: RaceStatus;
     is_finished: boolean;
@@ -40,6 +40,8 @@ export type Team = {
     description: string;
     status: TeamStatus;
     members?: TeamMember[];
+    members_count?: number;
+    members_url?: string;
     created_at: string;
     updated_at: string;
     logo_url?: string;
@@ -5,11 +5,11 @@ import { Card } from '../components/Card';
 import { ReviewsList } from '../components/ReviewsList';
 import { CircuitLikeButton } from '../components/circuits';
 import { useReviews } from '../lib/hooks/useReviews';
-import type { PaginatedResponse } from '../lib/api/client';
+import type { CursorPaginatedResponse } from '../lib/api/client';
 
 interface LoaderData {
     circuit: Circuit
-    races: PaginatedResponse<Race>
+    races: CursorPaginatedResponse<Race>
 }
 
 export const CircuitDetailPage = () => {